@@ -37,10 +37,63 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "change-this-secret-key-in-production"
+    ADMIN_TOKEN: Optional[str] = None  # Заголовок X-Admin-Token для /api/admin/*; пусто — выключено
     
     # Performance
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
+    SQLITE_READ_POOL_SIZE: int = 4  # Постоянные соединения-читатели (WAL)
+    WRITE_BATCH_MAX_SIZE: int = 50  # Group commit: записей в одной транзакции
+    WRITE_BATCH_MAX_DELAY_MS: int = 5  # Group commit: сколько ждать добора пачки
+
+    # Archive
+    ARCHIVE_AFTER_DAYS: int = 30  # DONE-задачи старше — в tasks_archive
+    ARCHIVE_INTERVAL_MINUTES: int = 60  # Как часто запускать архивацию
+    ARCHIVE_BATCH_SIZE: int = 500  # Задач в одной транзакции
+
+    # Delta sync (GET /api/tasks/changes)
+    CHANGES_GRACE_SECONDS: int = 2  # Отставание ленты от текущего времени
+    TOMBSTONE_RETENTION_DAYS: int = 30  # Дольше токены не живут
+
+    # Server-sent events (GET /api/events)
+    SSE_CLIENT_BUFFER: int = 100  # Событий в очереди клиента, дальше — отключение
+    SSE_MAX_SUBSCRIBERS: int = 1000
+    SSE_HEARTBEAT_SECONDS: int = 15
+
+    # Transactional outbox: события между процессами бота и API
+    OUTBOX_POLL_INTERVAL_MS: int = 500  # Как часто процесс читает event_outbox
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RETENTION_HOURS: int = 24  # Дольше не храним, даже если кто-то не дочитал
+    OUTBOX_GAP_TIMEOUT_SECONDS: int = 60  # Сколько ждать пропущенный id (коммит не по порядку)
+
+    # Read-through кэш списков задач, проектов, пользователей и счётчиков
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300  # Сброс — по событиям, TTL на случай изменений мимо шины
+
+    # Трекинг пользователей бота (UserTrackingMiddleware)
+    USER_TRACKING_CACHE_SIZE: int = 10000  # Отпечатков имён в памяти
+    USER_TRACKING_TTL_SECONDS: int = 3600  # Через столько отпечаток сверяется с базой заново
+    LAST_SEEN_FLUSH_SECONDS: int = 60  # Как часто писать last_seen_at пачкой
+
+    # Предложения создать задачу из сообщений чата (кнопки «Создать» / «Отмена»)
+    PENDING_SUGGESTION_TTL_HOURS: int = 24  # Дольше кнопки не работают
+    PENDING_SUGGESTIONS_MAX: int = 1000  # В памяти бота, лишние вытесняются
+    PENDING_SUGGESTIONS_PERSIST: bool = True  # Копия в таблице pending_suggestions
+    PENDING_SUGGESTIONS_SWEEP_MINUTES: int = 10  # Как часто удалять просроченные
+
+    # Export (GET /api/export/...)
+    EXPORT_CHUNK_SIZE: int = 1000  # Строк в одной пачке курсора и куске ответа
+
+    # Import (import_tasks.py, POST /api/import)
+    IMPORT_BATCH_SIZE: int = 1000  # Задач в одном executemany и одной транзакции
+    IMPORT_MAX_REJECTS_IN_RESPONSE: int = 1000  # Отклонённых строк в ответе API
+
+    # Backup (SQLite online backup API)
+    BACKUP_DIR: str = "data/backups"
+    BACKUP_INTERVAL_HOURS: int = 24  # Снимок по расписанию в процессе бота; 0 — выключено
+    BACKUP_KEEP: int = 7  # Сколько последних снимков хранить
+    BACKUP_PAGES_PER_STEP: int = 256  # Страниц за шаг копирования
+    BACKUP_MAX_MB_PER_SEC: float = 20  # Ограничение скорости чтения; 0 — без ограничения
     
     @property
     def web_url(self) -> str:
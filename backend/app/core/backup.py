@@ -0,0 +1,196 @@
+"""Online-бэкап SQLite: снимок базы без остановки бота и API.
+
+Копирование — через SQLite online backup API по BACKUP_PAGES_PER_STEP
+страниц за шаг, между шагами — пауза, чтобы не превышать
+BACKUP_MAX_MB_PER_SEC и не забирать диск у писателя.
+
+Перед копированием исходное соединение открывает транзакцию чтения:
+в WAL это фиксирует согласованный снимок, писатели продолжают работать,
+а backup не начинается заново после каждой чужой записи (без этого
+пошаговое копирование под нагрузкой может не закончиться никогда).
+Пока идёт копирование, checkpoint не может пройти дальше снимка —
+WAL временно растёт.
+
+Снимок пишется во временный файл, проверяется PRAGMA integrity_check
+и только потом переименовывается в teamflow-YYYYmmdd-HHMMSS.db.
+"""
+import asyncio
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_PREFIX = "teamflow-"
+_SUFFIX = ".db"
+_PARTIAL = ".partial"
+# Временный файл без изменений дольше этого — брошен (процесс упал посреди бэкапа)
+_STALE_PARTIAL_SECONDS = 60 * 60
+
+# Один бэкап за раз в процессе
+_lock = asyncio.Lock()
+
+
+class BackupError(Exception):
+    """Бэкап не удался или недоступен."""
+
+
+class BackupInProgress(BackupError):
+    """В этом процессе уже идёт бэкап."""
+
+
+class BackupUnavailable(BackupError):
+    """База не файл SQLite — online backup неприменим."""
+
+
+@dataclass(frozen=True)
+class BackupInfo:
+    """Файл снимка."""
+    path: Path
+    size: int
+    created_at: datetime
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def database_path() -> Path:
+    """Файл SQLite из DATABASE_URL. BackupUnavailable — база не SQLite."""
+    url = make_url(settings.DATABASE_URL)
+    if not url.get_backend_name().startswith("sqlite"):
+        raise BackupUnavailable("Online backup is available only for SQLite, use pg_dump for PostgreSQL")
+    if not url.database or url.database == ":memory:":
+        raise BackupUnavailable("In-memory database can not be backed up")
+    return Path(url.database).resolve()
+
+
+def backup_dir() -> Path:
+    return Path(settings.BACKUP_DIR).resolve()
+
+
+def _info(path: Path) -> BackupInfo:
+    stat = path.stat()
+    return BackupInfo(path=path, size=stat.st_size, created_at=datetime.utcfromtimestamp(stat.st_mtime))
+
+
+def list_backups() -> List[BackupInfo]:
+    """Готовые снимки, новые первыми."""
+    directory = backup_dir()
+    if not directory.exists():
+        return []
+    paths = directory.glob(f"{_PREFIX}*{_SUFFIX}")
+    return sorted((_info(path) for path in paths), key=lambda info: info.name, reverse=True)
+
+
+def verify_backup(path: Path) -> None:
+    """PRAGMA integrity_check снимка. BackupError — файл повреждён."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        problems = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"{path.name}: {e}")
+    finally:
+        connection.close()
+    if problems != ["ok"]:
+        raise BackupError(f"{path.name}: integrity check failed: {'; '.join(problems[:5])}")
+
+
+def _copy(source_path: Path, target_path: Path, pages_per_step: int, max_bytes_per_sec: int) -> None:
+    """Пошаговое копирование с ограничением скорости (выполняется в потоке)."""
+    source = sqlite3.connect(source_path, isolation_level=None)
+    target = sqlite3.connect(target_path)
+    try:
+        source.execute("PRAGMA busy_timeout=5000")
+        source.execute("PRAGMA query_only=ON")
+        page_size = source.execute("PRAGMA page_size").fetchone()[0]
+        # Транзакция чтения — снимок, который не сбрасывается чужими записями
+        source.execute("BEGIN")
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        started, copied = time.monotonic(), 0
+
+        def throttle(status, remaining, total):
+            nonlocal copied
+            copied = total - remaining
+            if max_bytes_per_sec > 0:
+                ahead = copied * page_size / max_bytes_per_sec - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        source.backup(target, pages=pages_per_step, progress=throttle)
+        source.execute("COMMIT")
+        # Снимок — самостоятельный файл, без -wal/-shm рядом
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+        source.close()
+
+
+def prune_backups(keep: Optional[int] = None) -> List[BackupInfo]:
+    """Удалить снимки сверх keep последних (и брошенные временные файлы)."""
+    keep = settings.BACKUP_KEEP if keep is None else keep
+    removed = list_backups()[keep:]
+    for info in removed:
+        info.path.unlink(missing_ok=True)
+    directory = backup_dir()
+    if directory.exists():
+        for partial in directory.glob(f"*{_PARTIAL}"):
+            if time.time() - partial.stat().st_mtime > _STALE_PARTIAL_SECONDS:
+                partial.unlink(missing_ok=True)
+    if removed:
+        logger.info("backups_pruned", removed=[info.name for info in removed])
+    return removed
+
+
+async def create_backup(
+    pages_per_step: Optional[int] = None,
+    max_mb_per_sec: Optional[float] = None,
+) -> BackupInfo:
+    """Снять, проверить и сохранить снимок базы; затем применить BACKUP_KEEP."""
+    if _lock.locked():
+        raise BackupInProgress("Backup is already running")
+    async with _lock:
+        source_path = database_path()
+        directory = backup_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{_PREFIX}{datetime.utcnow():%Y%m%d-%H%M%S}{_SUFFIX}"
+        target_path = directory / name
+        partial_path = directory / (name + _PARTIAL)
+
+        pages = pages_per_step or settings.BACKUP_PAGES_PER_STEP
+        rate = settings.BACKUP_MAX_MB_PER_SEC if max_mb_per_sec is None else max_mb_per_sec
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(_copy, source_path, partial_path, pages, int(rate * 1024 * 1024))
+            await asyncio.to_thread(verify_backup, partial_path)
+        except (sqlite3.Error, BackupError) as e:
+            partial_path.unlink(missing_ok=True)
+            logger.error("backup_failed", error=str(e))
+            raise BackupError(str(e)) from e
+        os.replace(partial_path, target_path)
+
+        info = _info(target_path)
+        logger.info(
+            "backup_created",
+            file=info.name,
+            size=info.size,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+    prune_backups()
+    return info
+
+
+async def scheduled_backup() -> None:
+    """Задача планировщика: снимок по расписанию, если база — SQLite."""
+    try:
+        database_path()
+    except BackupUnavailable:
+        return
+    await create_backup()
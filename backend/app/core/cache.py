@@ -0,0 +1,177 @@
+"""Read-through кэш горячих запросов (aiocache, в памяти процесса).
+
+Значение ищется по пространству имён (tasks, projects, users, stats) и
+ключу из параметров запроса; промах — загрузка из БД и запись на
+CACHE_TTL_SECONDS. Сбрасывает кэш шина событий: каждое событие очищает
+только те пространства, данные которых оно меняет (namespaces_for).
+Свои события сбрасывают кэш синхронно, в after_commit — запрос,
+прочитавший данные сразу после своей записи, видит их свежими. События
+другого процесса приходят через event_outbox (с задержкой опроса), так
+что бот и API сбрасывают свои кэши одинаково. TTL — страховка для
+изменений мимо шины (rebuild_counters.py, правка базы руками).
+
+У каждого пространства есть номер поколения, он входит в ключ. Сброс
+увеличивает номер — старые записи сразу становятся невидимы, а удаляются
+фоном. Загрузка, начатая до сброса, свой результат не сохраняет.
+
+В кэше лежат объекты, отвязанные от сессии (detached) — их не меняют.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Set
+from aiocache import SimpleMemoryCache
+from app.config import settings
+from app.core.event_bus import EventBus, Subscription
+from app.domain.events import (
+    DomainEvent, TaskCreated, TaskStatusChanged, TaskBlocked, TaskUnblocked, TaskAssigned,
+    TaskMoved, TaskUpdated, TaskDeleted, TasksBulkChanged, TasksArchived, TasksImported,
+    ProjectChanged, UsersChanged,
+)
+
+TASKS = "tasks"
+PROJECTS = "projects"
+USERS = "users"
+STATS = "stats"
+
+# Меняют счётчики task_counters (статус, проект, исполнитель, число задач)
+_COUNTED = (TaskCreated, TaskStatusChanged, TaskBlocked, TaskUnblocked, TaskAssigned,
+            TaskMoved, TaskDeleted, TasksImported)
+# Поля bulk-операций, от которых зависят счётчики
+_COUNTED_FIELDS = {"status", "project_id", "assignee_id"}
+
+
+def namespaces_for(event: DomainEvent) -> Set[str]:
+    """Какие пространства устаревают после события."""
+    if isinstance(event, _COUNTED):
+        return {TASKS, STATS}
+    if isinstance(event, TasksBulkChanged):
+        return {TASKS, STATS} if _COUNTED_FIELDS & set(event.changes) else {TASKS}
+    # Архивные задачи остаются в счётчиках, текстовые поля на них не влияют
+    if isinstance(event, (TaskUpdated, TasksArchived)):
+        return {TASKS}
+    if isinstance(event, ProjectChanged):
+        return {PROJECTS}
+    # Имя исполнителя входит в ответ списка задач
+    if isinstance(event, UsersChanged):
+        return {USERS, TASKS}
+    return set()
+
+
+def _namespaces(events: List[DomainEvent]) -> Set[str]:
+    namespaces: Set[str] = set()
+    for event in events:
+        namespaces |= namespaces_for(event)
+    return namespaces
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 3) if total else 0.0
+
+
+class QueryCache:
+    """Кэш результатов запросов с поколениями и счётчиками попаданий."""
+
+    def __init__(self, ttl: int, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self._cache = SimpleMemoryCache()
+        self._generations: Dict[str, int] = {}
+        self.stats: Dict[str, CacheStats] = {}
+
+    def _stats(self, namespace: str) -> CacheStats:
+        return self.stats.setdefault(namespace, CacheStats())
+
+    async def get_or_load(self, namespace: str, params: tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Значение по (namespace, params) из кэша или load() с записью в кэш.
+
+        load не должен возвращать None — для aiocache это «нет значения».
+        """
+        if not self.enabled:
+            return await load()
+        generation = self._generations.get(namespace, 0)
+        key = f"{namespace}:{generation}:{params!r}"
+        stats = self._stats(namespace)
+        value = await self._cache.get(key)
+        if value is not None:
+            stats.hits += 1
+            return value
+        stats.misses += 1
+        value = await load()
+        if self._generations.get(namespace, 0) == generation:
+            await self._cache.set(key, value, ttl=self.ttl)
+        return value
+
+    def invalidate_now(self, namespaces: Iterable[str]) -> List[str]:
+        """Сделать записи пространств невидимыми (без await).
+
+        Возвращает префиксы устаревших записей для _clear.
+        """
+        stale = []
+        for namespace in namespaces:
+            generation = self._generations.get(namespace, 0)
+            self._generations[namespace] = generation + 1
+            self._stats(namespace).invalidations += 1
+            stale.append(f"{namespace}:{generation}:")
+        return stale
+
+    async def invalidate(self, namespaces: Iterable[str]) -> None:
+        await self._clear(self.invalidate_now(namespaces))
+
+    async def _clear(self, prefixes: List[str]) -> None:
+        for prefix in prefixes:
+            await self._cache.clear(namespace=prefix)
+
+    def subscribe(self, bus: EventBus) -> Subscription:
+        """Сбрасывать кэш по событиям шины: своим — сразу после COMMIT, чужим — из outbox."""
+        def invalidate_local(events: List[DomainEvent]) -> None:
+            stale = self.invalidate_now(sorted(_namespaces(events)))
+            if stale:
+                # Поколение уже сменилось; память старых записей освобождаем фоном
+                asyncio.get_running_loop().create_task(self._clear(stale))
+
+        async def on_foreign(events: List[DomainEvent]) -> None:
+            namespaces = _namespaces(events)
+            if namespaces:
+                await self.invalidate(sorted(namespaces))
+
+        return bus.subscribe(
+            DomainEvent, on_foreign, name="query_cache", max_delay=0, local_handler=invalidate_local,
+        )
+
+    def report(self) -> Dict[str, dict]:
+        return {
+            namespace: {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "invalidations": stats.invalidations,
+                "hit_ratio": stats.hit_ratio,
+            }
+            for namespace, stats in sorted(self.stats.items())
+        }
+
+
+def detached(session, objects: list, *related: str) -> list:
+    """Отвязать объекты и их загруженные связи related от сессии перед кэшированием.
+
+    Иначе откат или правка в сессии вызывающего изменили бы объекты,
+    которые уже отдаются другим запросам.
+    """
+    for obj in objects:
+        for name in related:
+            other = getattr(obj, name)
+            if other is not None and other in session:
+                session.expunge(other)
+        if obj in session:
+            session.expunge(obj)
+    return objects
+
+
+query_cache = QueryCache(settings.CACHE_TTL_SECONDS, settings.CACHE_ENABLED)
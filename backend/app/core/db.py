@@ -1,28 +1,128 @@
 """Database connection and session management."""
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy import event, Select, TextualSelect
 from app.config import settings
 
 Base = declarative_base()
 
 
+IS_SQLITE = "sqlite" in settings.DATABASE_URL
+
+# PRAGMA применяются один раз на соединение — соединения в пуле живут долго
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _setup_sqlite_connection(engine, readonly: bool):
+    """Подключить PRAGMA и управление транзакциями к SQLite-движку.
+
+    Драйвер сам не шлёт BEGIN (isolation_level=None), транзакцию открываем
+    явно: писатель — BEGIN IMMEDIATE, чтобы взять блокировку записи сразу,
+    а не ловить SQLITE_BUSY при повышении блокировки; читатели — обычный
+    BEGIN, в WAL они не мешают писателю.
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        if not readonly:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        if readonly:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+
 def _make_engine():
+    """Основной движок. Для SQLite — единственное долгоживущее соединение-писатель."""
     kwargs = {"echo": settings.DEBUG, "future": True}
-    if "sqlite" in settings.DATABASE_URL:
-        from sqlalchemy.pool import NullPool
-        kwargs["poolclass"] = NullPool
+    if IS_SQLITE:
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        kwargs["poolclass"] = AsyncAdaptedQueuePool
+        kwargs["pool_size"] = 1
+        kwargs["max_overflow"] = 0
         kwargs["connect_args"] = {"check_same_thread": False, "timeout": 10}
     else:
         kwargs["pool_size"] = settings.DB_POOL_SIZE
         kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
         kwargs["pool_pre_ping"] = True
-    return create_async_engine(settings.DATABASE_URL, **kwargs)
+    engine = create_async_engine(settings.DATABASE_URL, **kwargs)
+    if IS_SQLITE:
+        _setup_sqlite_connection(engine, readonly=False)
+    return engine
+
+
+def _make_read_engine():
+    """Пул постоянных соединений-читателей (только SQLite)."""
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        connect_args={"check_same_thread": False, "timeout": 10},
+    )
+    _setup_sqlite_connection(engine, readonly=True)
+    return engine
 
 
 engine = _make_engine()
+read_engine = _make_read_engine() if IS_SQLITE else None
+
+_USES_WRITER = "uses_writer"
+
+
+class RoutingSession(Session):
+    """Session, разводящая SQLite-запросы между читателями и писателем.
+
+    SELECT (в том числе text(...).columns()) идут в пул читателей, всё
+    остальное (flush, INSERT/UPDATE/DELETE, прочий текстовый SQL) — в
+    соединение-писатель. После первой записи сессия
+    до конца транзакции читает тоже через писателя, чтобы видеть свои
+    незакоммиченные изменения.
+
+    Чтения до первой записи идут из снимка читателя, поэтому такие сессии
+    (AsyncSessionLocal, get_db) — только для чтения. Read-modify-write
+    выполняется целиком на писателе: через run_write (WriterSessionLocal),
+    иначе запись по устаревшему снимку молча затирает чужие изменения.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self._flushing and isinstance(clause, (Select, TextualSelect)) and not self.info.get(_USES_WRITER):
+            return read_engine.sync_engine
+        self.info[_USES_WRITER] = True
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_USES_WRITER, None)
+
 
 AsyncSessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession if IS_SQLITE else Session,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Сессии только на писателе — для фоновых пакетных записей (group commit),
+# которым не нужно занимать соединения из пула читателей
+WriterSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
@@ -31,6 +131,17 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+async def dispose_engines():
+    """Закрыть пулы соединений.
+
+    Нужно перед fork (main.py запускает API отдельным процессом) и перед
+    сменой event loop: соединения aiosqlite привязаны к своему потоку и loop.
+    """
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         try:
@@ -40,60 +151,13 @@ async def get_db() -> AsyncSession:
             raise
 
 
-async def _run_migrations():
-    """Add missing columns to existing databases (safe to run multiple times)."""
-    if "sqlite" not in settings.DATABASE_URL:
-        return
-
-    import aiosqlite
-    db_file = settings.DATABASE_URL.replace("sqlite+aiosqlite:///", "")
-
-    async with aiosqlite.connect(db_file) as db:
-        # Проверяем есть ли таблица projects
-        async with db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='projects'") as cur:
-            projects_exists = await cur.fetchone()
-
-        if not projects_exists:
-            await db.execute("""
-                CREATE TABLE projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name VARCHAR(100) NOT NULL UNIQUE,
-                    description TEXT,
-                    emoji VARCHAR(10) DEFAULT '📁',
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            print("[migrate] Created table: projects")
-
-        # Получаем текущие колонки tasks
-        async with db.execute("PRAGMA table_info(tasks)") as cur:
-            cols = {row[1] async for row in cur}
-
-        # Добавляем отсутствующие колонки
-        migrations = [
-            ("assignee_id", "ALTER TABLE tasks ADD COLUMN assignee_id INTEGER"),
-            ("source_chat_id", "ALTER TABLE tasks ADD COLUMN source_chat_id BIGINT"),
-            ("project_id", "ALTER TABLE tasks ADD COLUMN project_id INTEGER REFERENCES projects(id)"),
-        ]
-        for col, sql in migrations:
-            if col not in cols:
-                await db.execute(sql)
-                print(f"[migrate] Added column tasks.{col}")
-
-        await db.commit()
-
-
 async def init_db():
-    """Initialize database — create all tables + run migrations."""
-    from app.domain.models import Task, Blocker, Meeting, TelegramUser  # noqa
+    """Initialize database — create all tables + run versioned migrations."""
+    from app.domain.models import Task, Blocker, Meeting, TelegramUser, TaskCounter, TaskArchive, BlockerArchive, TaskTombstone, TaskEvent, FlowDaily, BoardSnapshot, EventOutbox, OutboxOffset, PendingSuggestion  # noqa
     from app.domain.user import User  # noqa
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-        if "sqlite" in settings.DATABASE_URL:
-            await conn.execute(text("PRAGMA journal_mode=WAL"))
-            await conn.execute(text("PRAGMA synchronous=NORMAL"))
-            await conn.execute(text("PRAGMA busy_timeout=5000"))
 
-    await _run_migrations()
+    from app.core.migrations import run_migrations
+    await run_migrations(engine)
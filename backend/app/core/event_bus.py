@@ -0,0 +1,266 @@
+"""In-process async event bus for domain events.
+
+Сервисы не публикуют события сразу: record_event кладёт событие в
+session.info, а после COMMIT сессии шина раздаёт их подписчикам.
+Откат транзакции (или SAVEPOINT, в котором событие записано)
+выбрасывает события — подписчики видят только зафиксированные изменения.
+
+Подписка типизированная: обработчик получает события указанных классов
+(и их подклассов) пачками — до batch_size штук или max_delay секунд.
+У каждой подписки своя ограниченная очередь и свой воркер, так что
+обработчики работают параллельно и медленный не тормозит остальных.
+При переполнении очереди новые события для этой подписки отбрасываются
+с предупреждением в логе — публикация никогда не ждёт.
+
+Подписке с local_handler свои события отдаются сразу, синхронно в
+publish — то есть ещё в after_commit, до возврата из COMMIT. Очередь
+такой подписки получает только чужие события (publish(foreign=True)
+из OutboxRelay). Так кэш сбрасывается до того, как писатель прочитает
+свою же запись.
+
+Перед COMMIT те же события пишутся в event_outbox в этой же транзакции —
+так о них узнают другие процессы (см. app.core.outbox).
+"""
+import asyncio
+import os
+import socket
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, Type, Union
+from datetime import datetime
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from app.domain.events import DomainEvent, event_to_payload
+from app.domain.models import EventOutbox
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Handler = Callable[[List[DomainEvent]], Awaitable[None]]
+LocalHandler = Callable[[List[DomainEvent]], None]
+
+_STOP = object()
+_PENDING = "pending_domain_events"
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Подписчик шины."""
+    event_types: Tuple[Type[DomainEvent], ...]
+    handler: Handler
+    name: str
+    batch_size: int = 100
+    max_delay: float = 0.05
+    queue_size: int = 1000
+    local_handler: Optional[LocalHandler] = None
+    dropped: int = 0
+    _queue: Optional[asyncio.Queue] = field(default=None, repr=False)
+    _worker: Optional[asyncio.Task] = field(default=None, repr=False)
+    _loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
+
+    def accepts(self, domain_event: DomainEvent) -> bool:
+        return isinstance(domain_event, self.event_types)
+
+
+class EventBus:
+    """Pub/sub для доменных событий внутри процесса."""
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(
+        self,
+        event_types: Union[Type[DomainEvent], Tuple[Type[DomainEvent], ...]],
+        handler: Handler,
+        name: Optional[str] = None,
+        batch_size: int = 100,
+        max_delay: float = 0.05,
+        queue_size: int = 1000,
+        local_handler: Optional[LocalHandler] = None,
+    ) -> Subscription:
+        """Подписать handler на события этих типов. Handler получает список событий.
+
+        local_handler — синхронный обработчик своих событий; тогда handler
+        получает только чужие.
+        """
+        if not isinstance(event_types, tuple):
+            event_types = (event_types,)
+        subscription = Subscription(
+            event_types=event_types,
+            handler=handler,
+            name=name or getattr(handler, "__qualname__", repr(handler)),
+            batch_size=batch_size,
+            max_delay=max_delay,
+            queue_size=queue_size,
+            local_handler=local_handler,
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if subscription._worker is not None and not subscription._worker.done():
+            subscription._worker.cancel()
+
+    def publish(self, events: Iterable[DomainEvent], foreign: bool = False) -> None:
+        """Раздать события подписчикам (без ожидания).
+
+        foreign — события другого процесса из event_outbox.
+        """
+        events = list(events)
+        if not events or not self._subscriptions:
+            return
+        loop = asyncio.get_running_loop()
+        for subscription in self._subscriptions:
+            if subscription.local_handler is not None and not foreign:
+                self._call_local(subscription, [e for e in events if subscription.accepts(e)])
+                continue
+            for domain_event in events:
+                if not subscription.accepts(domain_event):
+                    continue
+                self._ensure_worker(subscription, loop)
+                try:
+                    subscription._queue.put_nowait(domain_event)
+                except asyncio.QueueFull:
+                    subscription.dropped += 1
+                    logger.warning(
+                        "event_dropped",
+                        subscription=subscription.name,
+                        event=type(domain_event).__name__,
+                        dropped=subscription.dropped,
+                    )
+
+    @staticmethod
+    def _call_local(subscription: Subscription, events: List[DomainEvent]) -> None:
+        if not events:
+            return
+        try:
+            subscription.local_handler(events)
+        except Exception as e:
+            # Публикация идёт из after_commit — ошибка обработчика не должна дойти до писателя
+            logger.error("event_handler_failed", subscription=subscription.name, size=len(events), error=str(e))
+
+    async def close(self) -> None:
+        """Доставить уже поставленные события и остановить воркеры."""
+        workers = []
+        for subscription in self._subscriptions:
+            if subscription._worker is None or subscription._worker.done():
+                continue
+            # Маркер остановки кладём даже в полную очередь
+            while True:
+                try:
+                    subscription._queue.put_nowait(_STOP)
+                    break
+                except asyncio.QueueFull:
+                    await asyncio.sleep(0.01)
+            workers.append(subscription._worker)
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def _ensure_worker(self, subscription: Subscription, loop: asyncio.AbstractEventLoop) -> None:
+        # Очередь и воркер привязаны к event loop — при новом loop создаём заново
+        if subscription._loop is not loop or subscription._worker is None or subscription._worker.done():
+            subscription._loop = loop
+            subscription._queue = asyncio.Queue(subscription.queue_size)
+            subscription._worker = loop.create_task(self._run(subscription))
+
+    async def _run(self, subscription: Subscription) -> None:
+        queue = subscription._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+            batch, stop = [item], False
+            deadline = loop.time() + subscription.max_delay
+            while len(batch) < subscription.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                await subscription.handler(batch)
+            except Exception as e:
+                logger.error("event_handler_failed", subscription=subscription.name, size=len(batch), error=str(e))
+            if stop:
+                return
+
+
+event_bus = EventBus()
+
+
+# ============= SESSION INTEGRATION =============
+
+def record_event(session, domain_event: DomainEvent) -> None:
+    """Запомнить событие в текущей транзакции сессии (AsyncSession или Session).
+
+    Событие будет опубликовано после COMMIT и выброшено при откате
+    транзакции или SAVEPOINT, в котором оно записано.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    transaction = sync_session.get_nested_transaction() or sync_session.get_transaction()
+    sync_session.info.setdefault(_PENDING, []).append((transaction, domain_event))
+
+
+def _inside(transaction, rolled_back) -> bool:
+    while transaction is not None:
+        if transaction is rolled_back:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session, previous_transaction):
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING, None)
+        return
+    session.info[_PENDING] = [
+        (transaction, domain_event)
+        for transaction, domain_event in pending
+        if not _inside(transaction, previous_transaction)
+    ]
+
+
+def process_origin() -> str:
+    """Идентификатор процесса для event_outbox.origin."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@event.listens_for(Session, "before_commit")
+def _write_outbox(session):
+    if session.in_nested_transaction():
+        return
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+    origin, now = process_origin(), datetime.utcnow()
+    session.execute(insert(EventOutbox), [
+        {
+            "origin": origin,
+            "event_type": type(domain_event).__name__,
+            "payload": event_to_payload(domain_event),
+            "created_at": now,
+        }
+        for _, domain_event in pending
+    ])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    # after_commit срабатывает и на RELEASE SAVEPOINT — ждём внешний COMMIT
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        event_bus.publish(domain_event for _, domain_event in pending)
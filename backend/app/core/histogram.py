@@ -0,0 +1,72 @@
+"""Sparse log-bucket histograms for durations.
+
+Медиану и перцентили нельзя сложить из дневных значений, поэтому
+дневные роллапы хранят гистограмму: номер корзины -> количество.
+Корзины растут в 2^(1/4) раза (~19%), начиная с минуты, так что
+перцентиль по сумме гистограмм за любой период считается с такой же
+относительной погрешностью, как по сырым данным.
+"""
+import json
+import math
+from typing import Dict, Iterable, Optional
+
+BUCKET_START = 60.0  # секунд — всё короче попадает в корзину 0
+BUCKET_GROWTH = 2 ** 0.25
+
+Histogram = Dict[int, int]
+
+
+def bucket_of(seconds: float) -> int:
+    """Корзина i покрывает [START * GROWTH^(i-1), START * GROWTH^i)."""
+    if seconds < BUCKET_START:
+        return 0
+    return int(math.log(seconds / BUCKET_START, BUCKET_GROWTH)) + 1
+
+
+def _bounds(bucket: int):
+    if bucket == 0:
+        return 0.0, BUCKET_START
+    return BUCKET_START * BUCKET_GROWTH ** (bucket - 1), BUCKET_START * BUCKET_GROWTH ** bucket
+
+
+def add(histogram: Histogram, values: Iterable[float], sign: int = 1) -> Histogram:
+    """Добавить (sign=-1 — убрать) значения. Пустые корзины удаляются."""
+    for value in values:
+        bucket = bucket_of(value)
+        count = histogram.get(bucket, 0) + sign
+        if count > 0:
+            histogram[bucket] = count
+        else:
+            histogram.pop(bucket, None)
+    return histogram
+
+
+def merge(target: Histogram, other: Histogram) -> Histogram:
+    for bucket, count in other.items():
+        target[bucket] = target.get(bucket, 0) + count
+    return target
+
+
+def percentile(histogram: Histogram, q: float) -> Optional[int]:
+    """q-перцентиль (0..1) в секундах; интерполяция внутри корзины."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for bucket in sorted(histogram):
+        count = histogram[bucket]
+        if seen + count >= rank:
+            low, high = _bounds(bucket)
+            fraction = (rank - seen) / count
+            return int(low + (high - low) * fraction)
+        seen += count
+    return int(_bounds(max(histogram))[1])
+
+
+def dumps(histogram: Histogram) -> str:
+    return json.dumps({str(bucket): count for bucket, count in sorted(histogram.items())})
+
+
+def loads(raw: Optional[str]) -> Histogram:
+    return {int(bucket): count for bucket, count in json.loads(raw).items()} if raw else {}
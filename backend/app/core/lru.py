@@ -0,0 +1,77 @@
+"""Bounded in-memory LRU with per-entry TTL.
+
+Для состояния процесса, которое не должно расти без предела: не больше
+maxsize записей (при переполнении вытесняется давно не читанная),
+каждая живёт ttl секунд с последней записи. Просроченные записи
+удаляются при чтении и методом purge() — его вызывает периодическая
+задача, чтобы память освобождалась и без обращений.
+
+Не потокобезопасен — рассчитан на один event loop.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """LRU-словарь с ограничением размера и временем жизни записей."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.evicted = 0  # вытеснено по размеру с создания
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evicted += 1
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.pop(key, _MISSING)
+        if item is _MISSING or item[0] <= self._clock():
+            return default
+        return item[1]
+
+    def purge(self) -> int:
+        """Удалить просроченные записи. Возвращает, сколько удалено."""
+        now = self._clock()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        """Живые записи, от давно не читанных к свежим (порядок LRU не меняется)."""
+        now = self._clock()
+        for key, (expires_at, value) in list(self._data.items()):
+            if expires_at > now:
+                yield key, value
+
+    def __contains__(self, key: K) -> bool:
+        item = self._data.get(key, _MISSING)
+        return item is not _MISSING and item[0] > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,284 @@
+"""Versioned schema migrations.
+
+Новые таблицы создаёт Base.metadata.create_all, а здесь живут изменения
+существующей схемы: новые колонки, индексы, триггеры. Каждая миграция
+получает номер версии, применяется один раз в своей транзакции и
+записывается в таблицу schema_version. Шаги идемпотентны — повторный
+запуск на уже обновлённой базе ничего не ломает.
+
+Чтобы добавить миграцию — допишите функцию и строку в MIGRATIONS
+со следующим номером. Уже выпущенные миграции не редактируются.
+"""
+import time
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Один шаг схемы."""
+    version: int
+    description: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+async def _columns(conn: AsyncConnection, table: str) -> set:
+    return await conn.run_sync(
+        lambda sync_conn: {col["name"] for col in inspect(sync_conn).get_columns(table)}
+    )
+
+
+async def _add_column(conn: AsyncConnection, table: str, column: str, ddl: str) -> None:
+    """ALTER TABLE ADD COLUMN, если колонки ещё нет."""
+    if column not in await _columns(conn, table):
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+# ============= MIGRATIONS =============
+
+async def _v1_task_columns(conn: AsyncConnection) -> None:
+    # Колонки, которые раньше добавляли _run_migrations и migrate.py
+    await _add_column(conn, "tasks", "assignee_id", "INTEGER")
+    await _add_column(conn, "tasks", "source_chat_id", "BIGINT")
+    await _add_column(conn, "tasks", "project_id", "INTEGER REFERENCES projects(id)")
+    await _add_column(conn, "tasks", "started_at", "TIMESTAMP")
+    await _add_column(conn, "tasks", "completed_at", "TIMESTAMP")
+
+
+async def _v2_task_indexes(conn: AsyncConnection) -> None:
+    for sql in (
+        # Фильтр по статусу + сортировка списка
+        "CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at ON tasks (status, created_at)",
+        # «Мои задачи»
+        "CREATE INDEX IF NOT EXISTS ix_tasks_assignee_status ON tasks (assignee_telegram_id, status)",
+        # Задачи проекта
+        "CREATE INDEX IF NOT EXISTS ix_tasks_project_status ON tasks (project_id, status)",
+        # Keyset-пагинация по (created_at, id)
+        "CREATE INDEX IF NOT EXISTS ix_tasks_created_at_id ON tasks (created_at, id)",
+        # Просроченные — только незакрытые задачи со сроком
+        "CREATE INDEX IF NOT EXISTS ix_tasks_open_due_date ON tasks (due_date) "
+        "WHERE status != 'DONE' AND due_date IS NOT NULL",
+        # selectinload(Task.blockers)
+        "CREATE INDEX IF NOT EXISTS ix_blockers_task_id ON blockers (task_id)",
+    ):
+        await conn.execute(text(sql))
+
+
+async def _v3_fill_task_counters(conn: AsyncConnection) -> None:
+    # Таблицу создал create_all; для существующих задач считаем счётчики один раз
+    await conn.execute(text("DELETE FROM task_counters"))
+    await conn.execute(text(
+        "INSERT INTO task_counters (project_id, assignee_id, status, count) "
+        "SELECT COALESCE(project_id, 0), COALESCE(assignee_id, 0), status, COUNT(*) "
+        "FROM tasks GROUP BY COALESCE(project_id, 0), COALESCE(assignee_id, 0), status"
+    ))
+
+
+# rowid в search_index = id * 4 + код сущности — у каждой строки свой ключ
+_SEARCH_SOURCES = (
+    # (kind, код, таблица, task_id, title, body, колонки для триггера UPDATE)
+    ("task", 1, "tasks", "id", "title", "description", "title, description"),
+    ("blocker", 2, "blockers", "task_id", None, "text", "text, task_id"),
+    ("meeting", 3, "meetings", None, None, "summary", "summary"),
+)
+
+
+def _search_text(column: str) -> str:
+    # unicode61 не сводит «ё» к «е» — делаем это сами (и в запросе тоже)
+    return f"REPLACE(REPLACE(COALESCE({column}, ''), 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _search_insert(row: str, kind: str, code: int, task_id, title, body) -> str:
+    task_id_sql = f"{row}.{task_id}" if task_id else "NULL"
+    title_sql = _search_text(f"{row}.{title}") if title else "''"
+    return (
+        "INSERT INTO search_index (rowid, kind, ref_id, task_id, title, body) "
+        f"SELECT {row}.id * 4 + {code}, '{kind}', {row}.id, {task_id_sql}, "
+        f"{title_sql}, {_search_text(f'{row}.{body}')}"
+    )
+
+
+async def _v4_search_index(conn: AsyncConnection) -> None:
+    # FTS5 есть только в SQLite; на других СУБД поиск идёт через LIKE
+    if conn.dialect.name != "sqlite":
+        return
+
+    await conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, task_id UNINDEXED, title, body, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ))
+    await conn.execute(text("DELETE FROM search_index"))
+
+    for kind, code, table, task_id, title, body, columns in _SEARCH_SOURCES:
+        delete = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code};"
+        for sql in (
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_ai AFTER INSERT ON {table} BEGIN "
+            f"{_search_insert('new', kind, code, task_id, title, body)}; END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"{delete} {_search_insert('new', kind, code, task_id, title, body)}; END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_ad AFTER DELETE ON {table} BEGIN "
+            f"{delete} END",
+            # Заполнить индекс существующими строками
+            f"{_search_insert(table, kind, code, task_id, title, body)} FROM {table}",
+        ):
+            await conn.execute(text(sql))
+
+
+async def _v5_task_updated_at_index(conn: AsyncConnection) -> None:
+    # Delta sync: GET /api/tasks/changes идёт по (updated_at, id)
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tasks_updated_at_id ON tasks (updated_at, id)"))
+
+
+async def _v6_seed_task_events(conn: AsyncConnection) -> None:
+    # История до появления task_events восстанавливается по датам задачи
+    if (await conn.execute(text("SELECT 1 FROM task_events LIMIT 1"))).first():
+        return
+    for table in ("tasks", "tasks_archive"):
+        for sql in (
+            f"SELECT id, 'CREATED', NULL, 'TODO', created_at FROM {table}",
+            f"SELECT id, 'STATUS_CHANGED', 'TODO', 'DOING', started_at FROM {table} "
+            f"WHERE started_at IS NOT NULL",
+            f"SELECT id, 'STATUS_CHANGED', CASE WHEN started_at IS NULL THEN 'TODO' ELSE 'DOING' END, "
+            f"'DONE', completed_at FROM {table} WHERE status = 'DONE' AND completed_at IS NOT NULL",
+            f"SELECT id, 'STATUS_CHANGED', CASE WHEN started_at IS NULL THEN 'TODO' ELSE 'DOING' END, "
+            f"'BLOCKED', updated_at FROM {table} WHERE status = 'BLOCKED'",
+        ):
+            await conn.execute(text(
+                "INSERT INTO task_events (task_id, event_type, old_value, new_value, occurred_at) " + sql
+            ))
+
+
+async def _v7_fill_flow_daily(conn: AsyncConnection) -> None:
+    # Роллапы считаются в Python (гистограммы) — сессия в транзакции миграции
+    from app.repositories.flow_repository import FlowRepository
+    async with AsyncSession(bind=conn) as session:
+        await FlowRepository(session).rebuild()
+
+
+async def _v8_backfill_board_snapshots(conn: AsyncConnection) -> None:
+    from app.services.analytics_service import AnalyticsService
+    async with AsyncSession(bind=conn) as session:
+        await AnalyticsService(session).backfill_snapshots(datetime.utcnow().date())
+
+
+async def _v9_user_last_seen(conn: AsyncConnection) -> None:
+    await _add_column(conn, "telegram_users", "last_seen_at", "TIMESTAMP")
+
+
+async def _v10_tombstone_feed_index(conn: AsyncConnection) -> None:
+    # Лента сортирует tombstones по (deleted_at, task_id): индекс только по
+    # deleted_at заставлял досортировывать каждую группу одного времени
+    await conn.execute(text("DROP INDEX IF EXISTS ix_task_tombstones_deleted_at"))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_task_tombstones_deleted_at_task_id "
+        "ON task_tombstones (deleted_at, task_id)"
+    ))
+
+
+async def _v11_task_id_autoincrement(conn: AsyncConnection) -> None:
+    # id задач не должны переиспользоваться: у ушедшего id остаются архивная
+    # копия, tombstone и история. Нужен AUTOINCREMENT, а добавить его можно
+    # только пересозданием таблицы.
+    if conn.dialect.name != "sqlite":
+        return
+    from app.domain.models import Task
+
+    table_sql = (await conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+    ))).scalar()
+    if "AUTOINCREMENT" not in table_sql.upper():
+        # Индексы и триггеры поиска исчезнут вместе со старой таблицей
+        dependents = (await conn.execute(text(
+            "SELECT sql FROM sqlite_master "
+            "WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ))).scalars().all()
+        columns = [name for name in Task.__table__.c.keys() if name in await _columns(conn, "tasks")]
+        column_list = ", ".join(columns)
+
+        # Копия схемы из моделей — с AUTOINCREMENT; внешним ключам нужны projects и telegram_users
+        metadata = MetaData()
+        for table in Task.metadata.sorted_tables:
+            if table is not Task.__table__:
+                table.to_metadata(metadata)
+        rebuilt = Task.__table__.to_metadata(metadata, name="tasks_rebuilt")
+        await conn.execute(CreateTable(rebuilt))
+        await conn.execute(text(f"INSERT INTO tasks_rebuilt ({column_list}) SELECT {column_list} FROM tasks"))
+        await conn.execute(text("DROP TABLE tasks"))
+        await conn.execute(text("ALTER TABLE tasks_rebuilt RENAME TO tasks"))
+        for sql in dependents:
+            await conn.execute(text(sql))
+
+    # Счётчик начинается после всех id, что уже где-то встречались
+    await conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+    await conn.execute(text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', MAX("
+        "(SELECT COALESCE(MAX(id), 0) FROM tasks), "
+        "(SELECT COALESCE(MAX(id), 0) FROM tasks_archive), "
+        "(SELECT COALESCE(MAX(task_id), 0) FROM task_tombstones), "
+        "(SELECT COALESCE(MAX(task_id), 0) FROM task_events))"
+    ))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "tasks: assignee, source chat, project and timing columns", _v1_task_columns),
+    Migration(2, "tasks: indexes for filters, pagination and overdue lookup", _v2_task_indexes),
+    Migration(3, "task_counters: initial fill from tasks", _v3_fill_task_counters),
+    Migration(4, "search_index: FTS5 over tasks, blockers and meetings", _v4_search_index),
+    Migration(5, "tasks: index on (updated_at, id) for delta sync", _v5_task_updated_at_index),
+    Migration(6, "task_events: seed history from task dates", _v6_seed_task_events),
+    Migration(7, "flow_daily: initial fill from completed tasks", _v7_fill_flow_daily),
+    Migration(8, "board_snapshots: backfill from task history", _v8_backfill_board_snapshots),
+    Migration(9, "telegram_users: last_seen_at", _v9_user_last_seen),
+    Migration(10, "task_tombstones: index on (deleted_at, task_id) for delta sync", _v10_tombstone_feed_index),
+    Migration(11, "tasks: AUTOINCREMENT ids, never reuse archived or deleted ids", _v11_task_id_autoincrement),
+]
+
+
+# ============= RUNNER =============
+
+async def get_schema_version(conn: AsyncConnection) -> int:
+    """Текущая версия схемы (0 — миграции ещё не применялись)."""
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ))
+    result = await conn.execute(text("SELECT MAX(version) FROM schema_version"))
+    return result.scalar() or 0
+
+
+async def run_migrations(engine: AsyncEngine) -> List[int]:
+    """Применить все миграции новее текущей версии. Возвращает их номера."""
+    async with engine.begin() as conn:
+        current = await get_schema_version(conn)
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            await migration.upgrade(conn)
+            await conn.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+        logger.info(
+            "migration_applied",
+            version=migration.version,
+            description=migration.description,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        applied.append(migration.version)
+
+    return applied
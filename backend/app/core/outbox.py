@@ -0,0 +1,163 @@
+"""Transactional outbox relay — доменные события между процессами.
+
+Бот и API работают в разных процессах (app.main запускает API через
+multiprocessing). Шина событий живёт внутри процесса, поэтому перед
+COMMIT каждое событие ещё и пишется в event_outbox той же транзакцией
+(app.core.event_bus) — событие есть в таблице тогда и только тогда,
+когда закоммичено изменение.
+
+OutboxRelay в каждом процессе читает event_outbox по возрастанию id и
+публикует в локальную шину чужие события (свои шина уже получила после
+COMMIT). Позиция потребителя сохраняется в outbox_offsets, по минимальной
+позиции фоновая задача prune_outbox удаляет прочитанные строки.
+
+После перезапуска relay начинает с конца таблицы: состояние, которое
+строится по событиям (SSE-клиенты, кэши), создаётся процессом заново.
+
+Порядок id совпадает с порядком коммитов, пока запись одна (SQLite —
+единственный писатель). На PostgreSQL параллельные транзакции могут
+закоммитить меньший id позже, поэтому relay запоминает пропуски в
+последовательности id и перечитывает их при каждом опросе, пока строка
+не появится или не пройдёт OUTBOX_GAP_TIMEOUT_SECONDS (откатанная
+транзакция оставляет пропуск навсегда). Сохранённая позиция не уходит
+дальше самого раннего пропуска — prune_outbox не удалит строку, которую
+ещё ждут. Опоздавшее событие публикуется позже более новых.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from app.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.event_bus import EventBus, event_bus, process_origin
+from app.core.logging import get_logger
+from app.core.write_queue import run_write
+from app.domain.events import event_from_payload
+from app.repositories.outbox_repository import OutboxRepository
+
+logger = get_logger(__name__)
+
+
+@dataclass(eq=False)
+class OutboxRelay:
+    """Доставляет события других процессов из event_outbox в шину."""
+    consumer: str
+    bus: EventBus
+    interval: float = 0.5
+    batch_size: int = 500
+    gap_timeout: float = 60.0
+    _last_id: Optional[int] = None
+    _saved_id: Optional[int] = None
+    # Пропущенные id выше сохранённой позиции -> когда замечены (loop.time())
+    _gaps: Dict[int, float] = field(default_factory=dict)
+    _task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"outbox_relay:{self.consumer}")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._last_id is None:
+                    await self._start_position()
+                else:
+                    await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("outbox_relay_failed", consumer=self.consumer, error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def _start_position(self) -> None:
+        async with AsyncSessionLocal() as session:
+            last_id = await OutboxRepository(session).get_last_id()
+        await self._save_offset(last_id)
+        self._last_id = last_id
+
+    async def poll(self) -> int:
+        """Один проход до конца таблицы. Возвращает число опубликованных событий."""
+        now = asyncio.get_running_loop().time()
+        published = 0
+        async with AsyncSessionLocal() as session:
+            repository = OutboxRepository(session)
+            if self._gaps:
+                published += await self._fill_gaps(repository, now)
+            while True:
+                rows = await repository.get_after(self._last_id, self.batch_size)
+                if not rows:
+                    break
+                expected = self._last_id + 1
+                for row in rows:
+                    for gap_id in range(expected, row.id):
+                        self._gaps[gap_id] = now
+                    expected = row.id + 1
+                published += self._publish(rows)
+                self._last_id = rows[-1].id
+                if len(rows) < self.batch_size:
+                    break
+        # Позиция — до самого раннего пропуска, иначе prune удалит строку,
+        # которая ещё может закоммититься
+        offset = min(self._gaps) - 1 if self._gaps else self._last_id
+        if offset != self._saved_id:
+            await self._save_offset(offset)
+        return published
+
+    async def _fill_gaps(self, repository: OutboxRepository, now: float) -> int:
+        """Опубликовать закоммиченные с опозданием строки, забыть старые пропуски.
+
+        Окно от первого до последнего пропуска перечитывается целиком —
+        после отката большой транзакции пропусков могут быть тысячи.
+        """
+        window = await repository.get_between(min(self._gaps), max(self._gaps))
+        rows = [row for row in window if row.id in self._gaps]
+        for row in rows:
+            del self._gaps[row.id]
+        expired = [gap_id for gap_id, since in self._gaps.items() if now - since >= self.gap_timeout]
+        for gap_id in expired:
+            del self._gaps[gap_id]
+        if expired:
+            logger.debug("outbox_gaps_expired", consumer=self.consumer, count=len(expired))
+        return self._publish(rows)
+
+    def _publish(self, rows: List) -> int:
+        origin = process_origin()
+        events = []
+        for row in rows:
+            if row.origin == origin:
+                continue
+            try:
+                events.append(event_from_payload(row.event_type, row.payload))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("outbox_event_skipped", id=row.id, event=row.event_type, error=str(e))
+        self.bus.publish(events, foreign=True)
+        return len(events)
+
+    async def _save_offset(self, last_id: int) -> None:
+        await run_write(lambda session: OutboxRepository(session).save_offset(self.consumer, last_id))
+        self._saved_id = last_id
+
+
+def outbox_relay(consumer: str) -> OutboxRelay:
+    """Relay процесса consumer («bot», «api») для общей шины."""
+    return OutboxRelay(
+        consumer=consumer,
+        bus=event_bus,
+        interval=settings.OUTBOX_POLL_INTERVAL_MS / 1000,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        gap_timeout=settings.OUTBOX_GAP_TIMEOUT_SECONDS,
+    )
+
+
+async def prune_outbox() -> int:
+    """Фоновая задача: удалить прочитанные всеми события и старше OUTBOX_RETENTION_HOURS."""
+    before = datetime.utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+    pruned = await run_write(lambda session: OutboxRepository(session).prune(before))
+    if pruned:
+        logger.info("outbox_pruned", count=pruned)
+    return pruned
@@ -0,0 +1,52 @@
+"""Opaque keyset cursors for paginated queries."""
+import base64
+import json
+import string
+from datetime import datetime, timedelta
+from typing import Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+_DIGITS = string.digits + string.ascii_lowercase
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Упаковать позицию (created_at, id) в непрозрачную строку."""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Распаковать курсор. ValueError если строка повреждена."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _base36(number: int) -> str:
+    digits = ""
+    while True:
+        number, rest = divmod(number, 36)
+        digits = _DIGITS[rest] + digits
+        if not number:
+            return digits
+
+
+def encode_short_cursor(created_at: datetime, item_id: int) -> str:
+    """Та же позиция (created_at, id) коротко — для callback_data (лимит 64 байта).
+
+    created_at — микросекунды от эпохи в base36, точно (без float).
+    """
+    micros = (created_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{_base36(micros)}.{_base36(item_id)}"
+
+
+def decode_short_cursor(cursor: str) -> Tuple[datetime, int]:
+    """ValueError если строка повреждена."""
+    try:
+        micros, item_id = cursor.split(".")
+        return _EPOCH + timedelta(microseconds=int(micros, 36)), int(item_id, 36)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
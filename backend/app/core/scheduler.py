@@ -0,0 +1,61 @@
+"""Periodic background jobs.
+
+Минимальный планировщик на asyncio: каждая задача — корутина без
+аргументов, которая запускается раз в interval секунд. Ошибка одного
+запуска логируется и не останавливает расписание. Запускается в
+процессе бота (один экземпляр на инсталляцию), чтобы задачи не
+выполнялись параллельно в API-процессе.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    """Задача по расписанию."""
+    name: str
+    interval: float
+    run: Callable[[], Awaitable[object]]
+    initial_delay: float = 0.0
+
+
+class Scheduler:
+    """Запускает PeriodicJob в фоновых asyncio-задачах."""
+
+    def __init__(self):
+        self._jobs: List[PeriodicJob] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def add(self, job: PeriodicJob) -> None:
+        self._jobs.append(job)
+
+    def start(self) -> None:
+        """Запустить все задачи в текущем event loop."""
+        for job in self._jobs:
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+        logger.info("scheduler_started", jobs=[job.name for job in self._jobs])
+
+    async def stop(self) -> None:
+        """Отменить задачи и дождаться их завершения."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        await asyncio.sleep(job.initial_delay)
+        while True:
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("job_failed", job=job.name, error=str(e))
+            await asyncio.sleep(job.interval)
+
+
+scheduler = Scheduler()
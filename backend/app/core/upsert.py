@@ -0,0 +1,72 @@
+"""Dialect-aware INSERT ... ON CONFLICT for SQLite and PostgreSQL.
+
+Оба диалекта поддерживают одинаковую конструкцию ON CONFLICT (...)
+DO UPDATE / DO NOTHING, отличаются только модулем insert в SQLAlchemy.
+Диалект берётся у движка-писателя — upsert всегда идёт в него.
+"""
+from typing import Dict, Iterable, List, Sequence
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import engine
+
+# Строк в одном INSERT: параметров меньше лимита SQLite (32766) и PostgreSQL (32767)
+UPSERT_BATCH_SIZE = 500
+
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert_statement(
+    model,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    update_columns: Iterable[str] = (),
+    increment_columns: Iterable[str] = (),
+    dialect: str = None,
+):
+    """INSERT строк rows; при конфликте по index_elements:
+
+    update_columns — взять значение из новой строки,
+    increment_columns — прибавить новое значение к старому,
+    ни того ни другого — оставить строку как есть (DO NOTHING).
+    """
+    dialect = dialect or engine.dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f"Upsert is not supported for dialect {dialect!r}")
+    stmt = _INSERTS[dialect](model).values(rows)
+
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    for column in increment_columns:
+        set_[column] = getattr(model, column) + stmt.excluded[column]
+    if not set_:
+        return stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+    return stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+
+
+async def upsert(
+    session: AsyncSession,
+    model,
+    rows: Iterable[dict],
+    index_elements: Sequence[str],
+    update_columns: Iterable[str] = (),
+    increment_columns: Iterable[str] = (),
+) -> int:
+    """Выполнить upsert пачками по UPSERT_BATCH_SIZE — один statement на пачку.
+
+    Повторы ключа внутри rows схлопываются (остаётся последняя строка):
+    PostgreSQL не даёт одному INSERT задеть строку дважды. Для
+    increment_columns повторы ключа передавайте уже просуммированными.
+    Возвращает число переданных строк после схлопывания.
+    """
+    unique: Dict[tuple, dict] = {}
+    for row in rows:
+        unique[tuple(row[name] for name in index_elements)] = row
+    rows = list(unique.values())
+    update_columns, increment_columns = list(update_columns), list(increment_columns)
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        await session.execute(upsert_statement(
+            model, rows[i:i + UPSERT_BATCH_SIZE], index_elements, update_columns, increment_columns,
+        ))
+    return len(rows)
@@ -0,0 +1,136 @@
+"""Group commit — очередь мелких записей с пакетной фиксацией.
+
+Вместо того чтобы каждый обработчик открывал свою транзакцию и делал
+commit(), он отдаёт в очередь «единицу записи» — корутину, которая
+принимает сессию и меняет данные через сервисы/репозитории. Один
+фоновый писатель на процесс забирает из очереди пачку единиц, выполняет
+каждую в своём SAVEPOINT и фиксирует всю пачку одним COMMIT. Вызывающий
+ждёт future своей операции и получает её результат (или исключение).
+
+Единицы не должны сами вызывать commit()/rollback() — этим управляет
+координатор. Ошибка одной единицы откатывает только её savepoint.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.config import settings
+from app.core.db import WriterSessionLocal
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+WriteUnit = Callable[[AsyncSession], Awaitable[T]]
+
+_STOP = object()
+
+
+class WriteCoordinator:
+    """Очередь записей с одним писателем и пакетным commit."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        max_batch: int = 50,
+        max_delay: float = 0.005,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, unit: WriteUnit) -> T:
+        """Поставить единицу записи в очередь и дождаться её фиксации."""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        await self._queue.put((unit, future))
+        return await future
+
+    async def close(self) -> None:
+        """Дописать всё, что уже в очереди, и остановить писателя."""
+        if self._worker is None or self._worker.done():
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Очередь и писатель привязаны к event loop — при новом loop создаём заново
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch, stop = await self._collect([item])
+            await self._commit_batch(batch)
+            if stop:
+                return
+
+    async def _collect(self, batch: List[Tuple[WriteUnit, asyncio.Future]]) -> Tuple[list, bool]:
+        """Добрать пачку: до max_batch единиц или max_delay секунд ожидания."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _commit_batch(self, batch: List[Tuple[WriteUnit, asyncio.Future]]) -> None:
+        outcomes: List[Tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+        try:
+            async with self.session_factory() as session:
+                for unit, future in batch:
+                    if future.done():  # вызывающий уже отменил ожидание
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            result = await unit(session)
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                await session.commit()
+        except Exception as e:
+            logger.error("write_batch_failed", size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        logger.debug("write_batch_committed", size=len(batch))
+
+
+write_coordinator = WriteCoordinator(
+    WriterSessionLocal,
+    max_batch=settings.WRITE_BATCH_MAX_SIZE,
+    max_delay=settings.WRITE_BATCH_MAX_DELAY_MS / 1000,
+)
+
+
+async def run_write(unit: WriteUnit) -> T:
+    """Выполнить единицу записи через общий координатор процесса."""
+    return await write_coordinator.submit(unit)
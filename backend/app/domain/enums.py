@@ -14,3 +14,13 @@ class TaskSource(str, Enum):
     """Task creation source."""
     MANUAL_COMMAND = "MANUAL_COMMAND"
     CHAT_MESSAGE = "CHAT_MESSAGE"
+    IMPORT = "IMPORT"  # загрузка из другого трекера (import_tasks.py, POST /api/import)
+
+
+class TaskEventType(str, Enum):
+    """Запись истории задачи (task_events)."""
+    CREATED = "CREATED"
+    STATUS_CHANGED = "STATUS_CHANGED"
+    BLOCKED = "BLOCKED"  # добавлен блокер
+    ASSIGNED = "ASSIGNED"
+    MOVED = "MOVED"  # перенос в другой проект
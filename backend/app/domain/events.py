@@ -1,7 +1,14 @@
-"""Domain events."""
-from dataclasses import dataclass
+"""Domain events.
+
+Сервисы регистрируют события через app.core.event_bus.record_event,
+шина публикует их подписчикам после COMMIT транзакции.
+project_id / assignee_telegram_id — состояние задачи после события,
+чтобы подписчики могли фильтровать без запроса к БД.
+"""
+import json
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Type, Union, get_args, get_origin, get_type_hints
 from app.domain.enums import TaskStatus
 
 
@@ -18,6 +25,8 @@ class TaskCreated(DomainEvent):
     title: str
     assignee_name: Optional[str]
     source: str
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
 
 
 @dataclass
@@ -27,6 +36,8 @@ class TaskStatusChanged(DomainEvent):
     old_status: TaskStatus
     new_status: TaskStatus
     changed_by: Optional[int]  # Telegram user ID
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
 
 
 @dataclass
@@ -35,6 +46,8 @@ class TaskBlocked(DomainEvent):
     task_id: int
     blocker_text: str
     blocked_by: Optional[int]
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
 
 
 @dataclass
@@ -42,6 +55,74 @@ class TaskUnblocked(DomainEvent):
     """Event when task is unblocked."""
     task_id: int
     unblocked_by: Optional[int]
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
+
+
+@dataclass
+class TaskAssigned(DomainEvent):
+    """Event when task assignee changes (None — исполнитель снят)."""
+    task_id: int
+    assignee_telegram_id: Optional[int]
+    assignee_name: Optional[str]
+    previous_assignee_telegram_id: Optional[int]
+    project_id: Optional[int] = None
+
+
+@dataclass
+class TaskMoved(DomainEvent):
+    """Event when task is moved to another project."""
+    task_id: int
+    project_id: Optional[int]
+    previous_project_id: Optional[int]
+    assignee_telegram_id: Optional[int] = None
+
+
+@dataclass
+class TaskUpdated(DomainEvent):
+    """Event when task text fields change (title, description, due date...)."""
+    task_id: int
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
+
+
+@dataclass
+class TaskDeleted(DomainEvent):
+    """Event when task is deleted."""
+    task_id: int
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
+
+
+@dataclass
+class TasksBulkChanged(DomainEvent):
+    """Event when many tasks change in one set-based update."""
+    task_ids: List[int]
+    changes: dict = field(default_factory=dict)  # поле -> новое значение
+
+
+@dataclass
+class TasksArchived(DomainEvent):
+    """Event when closed tasks are moved to tasks_archive."""
+    task_ids: List[int]
+
+
+@dataclass
+class TasksImported(DomainEvent):
+    """Event when a batch of tasks is loaded by the import pipeline."""
+    task_ids: List[int]
+
+
+@dataclass
+class ProjectChanged(DomainEvent):
+    """Event when project is created, edited or deactivated."""
+    project_id: int
+
+
+@dataclass
+class UsersChanged(DomainEvent):
+    """Event when telegram users are created or their names change."""
+    telegram_ids: List[int]
 
 
 @dataclass
@@ -50,3 +131,56 @@ class MeetingRecorded(DomainEvent):
     meeting_id: int
     meeting_date: datetime
     summary: str
+
+
+@dataclass
+class MeetingUpdated(DomainEvent):
+    """Event when meeting is edited."""
+    meeting_id: int
+
+
+@dataclass
+class MeetingDeleted(DomainEvent):
+    """Event when meeting is deleted."""
+    meeting_id: int
+
+
+# ============= SERIALIZATION (event_outbox) =============
+
+def _event_types() -> Dict[str, Type[DomainEvent]]:
+    found, stack = {}, [DomainEvent]
+    while stack:
+        cls = stack.pop()
+        for sub in cls.__subclasses__():
+            found[sub.__name__] = sub
+            stack.append(sub)
+    return found
+
+
+def event_to_payload(event: DomainEvent) -> str:
+    """JSON полей события (тип хранится отдельно — type(event).__name__)."""
+    return json.dumps(asdict(event), ensure_ascii=False, default=str)
+
+
+def _convert(value, hint):
+    if value is None:
+        return None
+    if get_origin(hint) is Union:
+        hint = next(arg for arg in get_args(hint) if arg is not type(None))
+    if hint is datetime:
+        return datetime.fromisoformat(value)
+    if hint is TaskStatus:
+        return TaskStatus(value)
+    return value
+
+
+def event_from_payload(event_type: str, payload: str) -> DomainEvent:
+    """Восстановить событие. KeyError — неизвестный тип (другая версия кода)."""
+    cls = _event_types()[event_type]
+    hints = get_type_hints(cls)
+    data = json.loads(payload)
+    return cls(**{
+        f.name: _convert(data[f.name], hints[f.name])
+        for f in fields(cls)
+        if f.name in data
+    })
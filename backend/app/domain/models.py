@@ -1,6 +1,6 @@
 """Domain models."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, BigInteger, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, BigInteger, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 from app.domain.enums import TaskStatus, TaskSource
@@ -35,6 +35,8 @@ class TelegramUser(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Последнее сообщение или нажатие в боте; пишется пачками (UserTracker)
+    last_seen_at = Column(DateTime, nullable=True)
 
     assigned_tasks = relationship("Task", back_populates="assignee", foreign_keys="Task.assignee_id")
 
@@ -53,6 +55,9 @@ class TelegramUser(Base):
 class Task(Base):
     """Task entity."""
     __tablename__ = "tasks"
+    # Без AUTOINCREMENT SQLite отдаёт новой задаче id последней удалённой
+    # или заархивированной — её история и архивная копия «прилипают» к новой
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(255), nullable=False)
@@ -91,6 +96,153 @@ class Task(Base):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
 
 
+class TaskCounter(Base):
+    """Денормализованный счётчик задач по (проект, исполнитель, статус).
+
+    Обновляется TaskService в той же транзакции, что и сама задача.
+    0 в project_id / assignee_id означает «без проекта» / «не назначено».
+    Пересчитать с нуля: python rebuild_counters.py
+    """
+    __tablename__ = "task_counters"
+
+    project_id = Column(Integer, primary_key=True, default=0)
+    assignee_id = Column(Integer, primary_key=True, default=0)
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TaskEvent(Base):
+    """Запись истории задачи — только добавляются, не меняются.
+
+    Смены статуса, назначения, блокеры и переносы между проектами.
+    old_value / new_value — статус, telegram_id исполнителя или id
+    проекта строкой. Вся история задачи читается одним диапазоном
+    индекса (task_id, occurred_at). Переживает архивацию, удаляется
+    вместе с задачей.
+    """
+    __tablename__ = "task_events"
+    __table_args__ = (
+        Index("ix_task_events_task_id_occurred_at", "task_id", "occurred_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    event_type = Column(String(20), nullable=False)
+    old_value = Column(String(100), nullable=True)
+    new_value = Column(String(100), nullable=True)
+    details = Column(Text, nullable=True)  # текст блокера, имя исполнителя
+    actor_telegram_id = Column(BigInteger, nullable=True)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class FlowDaily(Base):
+    """Дневной роллап потока: завершённые задачи за день по (проект, исполнитель).
+
+    Обновляется TaskService при переходе в DONE (и из DONE — вычитается).
+    cycle — completed_at - started_at, lead — completed_at - created_at;
+    *_hist — гистограммы для перцентилей за период (app.core.histogram).
+    0 в project_id / assignee_id — «без проекта» / «не назначено».
+    Пересчитать с нуля: python rebuild_analytics.py
+    """
+    __tablename__ = "flow_daily"
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, primary_key=True, default=0)
+    assignee_id = Column(Integer, primary_key=True, default=0)
+    throughput = Column(Integer, nullable=False, default=0)
+    cycle_count = Column(Integer, nullable=False, default=0)  # из них с started_at
+    cycle_seconds = Column(BigInteger, nullable=False, default=0)
+    lead_seconds = Column(BigInteger, nullable=False, default=0)
+    cycle_p50 = Column(Integer, nullable=True)
+    cycle_p85 = Column(Integer, nullable=True)
+    lead_p50 = Column(Integer, nullable=True)
+    lead_p85 = Column(Integer, nullable=True)
+    cycle_hist = Column(Text, nullable=False, default="{}")
+    lead_hist = Column(Text, nullable=False, default="{}")
+
+
+class BoardSnapshot(Base):
+    """Доска на конец дня: число задач по статусам в проекте.
+
+    Строку текущего дня каждый час перезаписывает фоновая задача
+    snapshot_board (по task_counters, архив входит в DONE), так что
+    за прошедший день остаётся последнее состояние. Историю до
+    появления таблицы восстанавливает python backfill_snapshots.py.
+    0 в project_id — задачи без проекта.
+    """
+    __tablename__ = "board_snapshots"
+    __table_args__ = (
+        Index("ix_board_snapshots_project_id_day", "project_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, primary_key=True, default=0)
+    todo = Column(Integer, nullable=False, default=0)
+    doing = Column(Integer, nullable=False, default=0)
+    blocked = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+
+
+class TaskTombstone(Base):
+    """След удалённой (или перенесённой в архив) задачи для delta sync.
+
+    GET /api/tasks/changes отдаёт такие id в deleted, чтобы клиент
+    убрал задачу из своей копии. Старше TOMBSTONE_RETENTION_DAYS удаляются.
+    """
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        # Лента изменений идёт по (deleted_at, task_id)
+        Index("ix_task_tombstones_deleted_at_task_id", "deleted_at", "task_id"),
+    )
+
+    # Свой id: SQLite может переиспользовать id последней удалённой задачи
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    reason = Column(String(20), nullable=False, default="deleted")  # deleted | archived
+
+
+class EventOutbox(Base):
+    """Доменное событие для других процессов (transactional outbox).
+
+    Пишется в той же транзакции, что и изменение, которое его породило.
+    OutboxRelay каждого процесса читает таблицу по возрастанию id и
+    публикует чужие события в свою шину. Прочитанные всеми — удаляются.
+    """
+    __tablename__ = "event_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String(100), nullable=False)  # процесс-источник
+    event_type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON полей события
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class OutboxOffset(Base):
+    """Докуда прочитал event_outbox потребитель (bot, api)."""
+    __tablename__ = "outbox_offsets"
+
+    consumer = Column(String(50), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class PendingSuggestion(Base):
+    """Предложение создать задачу из сообщения чата, ждущее «Создать» / «Отмена».
+
+    Копия памяти бота (PENDING_SUGGESTIONS_PERSIST), чтобы кнопки
+    работали после перезапуска. Просроченные удаляет периодическая задача.
+    """
+    __tablename__ = "pending_suggestions"
+
+    chat_id = Column(BigInteger, primary_key=True)
+    message_id = Column(BigInteger, primary_key=True)
+    text = Column(Text, nullable=False)
+    from_user_id = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
 class Blocker(Base):
     """Blocker entity."""
     __tablename__ = "blockers"
@@ -112,3 +264,45 @@ class Meeting(Base):
     meeting_date = Column(DateTime, nullable=False)
     summary = Column(Text, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class TaskArchive(Base):
+    """Архивная (холодная) копия закрытой задачи.
+
+    Колонки совпадают с tasks, id сохраняется. Перенос делает
+    ArchiveService — DONE-задачи старше ARCHIVE_AFTER_DAYS.
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    project_id = Column(Integer, nullable=True, index=True)
+    assignee_id = Column(Integer, nullable=True)
+    assignee_name = Column(String(100), nullable=True)
+    assignee_telegram_id = Column(BigInteger, nullable=True)
+    status = Column(String(20), nullable=False)
+    due_date = Column(DateTime, nullable=True)
+    definition_of_done = Column(Text, nullable=True)
+    source = Column(String(20), nullable=False)
+    source_message_id = Column(Integer, nullable=True)
+    source_chat_id = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    updated_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TaskArchive(id={self.id}, title='{self.title}')>"
+
+
+class BlockerArchive(Base):
+    """Архивная копия блокера архивной задачи."""
+    __tablename__ = "blockers_archive"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    text = Column(Text, nullable=False)
+    created_by = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, nullable=False)
@@ -4,7 +4,7 @@ import uvicorn
 from multiprocessing import Process
 from app.config import settings
 from app.core.logging import configure_logging, get_logger
-from app.core.db import init_db
+from app.core.db import init_db, dispose_engines
 from app.telegram.bot import run_bot
 
 logger = get_logger(__name__)
@@ -17,6 +17,8 @@ async def startup():
     
     # Initialize database
     await init_db()
+    # Пулы создаются заново в каждом процессе и event loop
+    await dispose_engines()
     logger.info("database_initialized")
 
 
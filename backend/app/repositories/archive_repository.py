@@ -0,0 +1,111 @@
+"""Archive repository — cold storage for closed tasks."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, delete, insert, func, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.models import Task, Blocker, TaskArchive, BlockerArchive, TaskTombstone
+from app.domain.enums import TaskStatus
+from app.core.pagination import encode_cursor, decode_cursor
+
+# Общие колонки горячих и архивных таблиц
+_TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+_BLOCKER_COLUMNS = [column.name for column in Blocker.__table__.columns]
+
+
+class ArchiveRepository:
+    """Перенос задач в tasks_archive и чтение архива."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_archivable_ids(self, completed_before: datetime, limit: int) -> List[int]:
+        """DONE-задачи, закрытые раньше completed_before (старые первыми)."""
+        closed_at = func.coalesce(Task.completed_at, Task.updated_at)
+        result = await self.session.execute(
+            select(Task.id)
+            .where(Task.status == TaskStatus.DONE.value, closed_at < completed_before)
+            .order_by(closed_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def move_to_archive(self, task_ids: List[int]) -> int:
+        """Скопировать задачи с блокерами в архив и удалить из горячих таблиц.
+
+        Пять set-based запросов (включая tombstones для delta sync);
+        вызывать внутри одной транзакции.
+        """
+        if not task_ids:
+            return 0
+        now = datetime.utcnow()
+
+        await self.session.execute(
+            insert(TaskArchive).from_select(
+                _TASK_COLUMNS,
+                select(*[Task.__table__.c[name] for name in _TASK_COLUMNS]).where(Task.id.in_(task_ids)),
+            )
+        )
+        await self.session.execute(
+            insert(BlockerArchive).from_select(
+                _BLOCKER_COLUMNS,
+                select(*[Blocker.__table__.c[name] for name in _BLOCKER_COLUMNS]).where(Blocker.task_id.in_(task_ids)),
+            )
+        )
+        await self.session.execute(
+            insert(TaskTombstone).from_select(
+                ["task_id", "deleted_at", "reason"],
+                select(Task.id, literal(now), literal("archived")).where(Task.id.in_(task_ids)),
+            )
+        )
+        await self.session.execute(
+            delete(Blocker).where(Blocker.task_id.in_(task_ids)).execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(
+            delete(Task).where(Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def get_by_id(self, task_id: int) -> Optional[TaskArchive]:
+        """Get archived task by ID."""
+        result = await self.session.execute(
+            select(TaskArchive).where(TaskArchive.id == task_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_blockers(self, task_id: int) -> List[BlockerArchive]:
+        """Блокеры архивной задачи."""
+        result = await self.session.execute(
+            select(BlockerArchive)
+            .where(BlockerArchive.task_id == task_id)
+            .order_by(BlockerArchive.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        project_id: Optional[int] = None,
+        assignee_telegram_id: Optional[int] = None,
+    ) -> Tuple[List[TaskArchive], Optional[str]]:
+        """Страница архива по (created_at, id) desc — как TaskRepository.get_page."""
+        query = select(TaskArchive)
+        if project_id is not None:
+            query = query.where(TaskArchive.project_id == project_id)
+        if assignee_telegram_id is not None:
+            query = query.where(TaskArchive.assignee_telegram_id == assignee_telegram_id)
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            # Row value, а не OR: SQLite ищет по индексу created_at (см. task_repository)
+            query = query.where(tuple_(TaskArchive.created_at, TaskArchive.id) < tuple_(created_at, task_id))
+
+        result = await self.session.execute(
+            query.order_by(TaskArchive.created_at.desc(), TaskArchive.id.desc()).limit(limit + 1)
+        )
+        tasks = list(result.scalars().all())
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return tasks, next_cursor
@@ -0,0 +1,91 @@
+"""Change feed repository — delta sync for task replicas."""
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, delete, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.domain.models import Task, TaskTombstone
+
+# Позиция в ленте изменений: (время изменения, id задачи)
+ChangePosition = Tuple[datetime, int]
+
+
+class ChangeBatch(NamedTuple):
+    """Порция изменений после позиции."""
+    tasks: List[Task]
+    deleted: List[int]
+    position: Optional[ChangePosition]
+    has_more: bool
+
+
+def _after(ts_column, id_column, position: Optional[ChangePosition]):
+    if position is None:
+        return true()
+    ts, item_id = position
+    # Row value, а не ts > ? OR (ts = ? AND id > ?): так SQLite ищет по
+    # индексу, и опрос в конце ленты не проходит весь индекс
+    return tuple_(ts_column, id_column) > tuple_(ts, item_id)
+
+
+class ChangeRepository:
+    """Лента изменений задач: обновлённые строки tasks + tombstones.
+
+    Обе таблицы читаются по индексам (updated_at, id) и (deleted_at, task_id)
+    в порядке (время, id задачи) и сливаются в одну ленту.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_changes(
+        self,
+        position: Optional[ChangePosition],
+        until: datetime,
+        limit: int,
+    ) -> ChangeBatch:
+        """Изменения строго после position и не позже until.
+
+        until отстаёт от текущего времени на grace-окно: транзакция могла
+        проставить updated_at раньше, чем закоммитилась, и без отставания
+        клиент проскочил бы её изменения.
+        """
+        tasks_result = await self.session.execute(
+            select(Task)
+            .options(selectinload(Task.assignee))
+            .where(_after(Task.updated_at, Task.id, position), Task.updated_at <= until)
+            .order_by(Task.updated_at, Task.id)
+            .limit(limit + 1)
+        )
+        tombstones_result = await self.session.execute(
+            select(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .where(
+                _after(TaskTombstone.deleted_at, TaskTombstone.task_id, position),
+                TaskTombstone.deleted_at <= until,
+            )
+            .order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .limit(limit + 1)
+        )
+
+        merged = [((task.updated_at, task.id), task) for task in tasks_result.scalars().all()]
+        merged += [((deleted_at, task_id), None) for deleted_at, task_id in tombstones_result.all()]
+        merged.sort(key=lambda item: item[0])
+
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+        next_position = merged[-1][0] if merged else position
+        if not has_more and (next_position is None or next_position[0] < until):
+            # Всё до until отдано — двигаем позицию, чтобы токен не устаревал
+            next_position = (until, 0)
+        return ChangeBatch(
+            tasks=[task for _, task in merged if task is not None],
+            deleted=[key[1] for key, task in merged if task is None],
+            position=next_position,
+            has_more=has_more,
+        )
+
+    async def prune_tombstones(self, before: datetime) -> int:
+        """Удалить tombstones старше before. Возвращает их количество."""
+        result = await self.session.execute(
+            delete(TaskTombstone).where(TaskTombstone.deleted_at < before)
+        )
+        return result.rowcount
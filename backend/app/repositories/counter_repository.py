@@ -0,0 +1,133 @@
+"""Task counter repository — incrementally maintained totals."""
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import STATS, query_cache
+from app.core.upsert import upsert
+from app.domain.models import TaskCounter
+from app.repositories.stats_repository import empty_counts, task_keys
+
+# (project_id, assignee_id, status); 0 — «нет проекта» / «не назначено»
+CounterKey = Tuple[int, int, str]
+
+
+def counter_key(project_id: Optional[int], assignee_id: Optional[int], status: str) -> CounterKey:
+    """Ключ счётчика для задачи с такими полями."""
+    return (project_id or 0, assignee_id or 0, status)
+
+
+class CounterRepository:
+    """Чтение и изменение таблицы task_counters."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def adjust(self, deltas: Dict[CounterKey, int]) -> None:
+        """Прибавить дельты к счётчикам одним UPSERT."""
+        rows = [
+            {"project_id": key[0], "assignee_id": key[1], "status": key[2], "count": delta}
+            for key, delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+        await upsert(
+            self.session, TaskCounter, rows,
+            index_elements=["project_id", "assignee_id", "status"],
+            increment_columns=["count"],
+        )
+
+    async def rebuild(self) -> int:
+        """Пересчитать все счётчики из tasks и tasks_archive. Возвращает число строк."""
+        await self.session.execute(delete(TaskCounter))
+        tasks = task_keys(include_archive=True)
+        project_id = func.coalesce(tasks.c.project_id, 0)
+        assignee_id = func.coalesce(tasks.c.assignee_id, 0)
+        result = await self.session.execute(
+            insert(TaskCounter).from_select(
+                ["project_id", "assignee_id", "status", "count"],
+                select(project_id, assignee_id, tasks.c.status, func.count())
+                .group_by(project_id, assignee_id, tasks.c.status),
+            )
+        )
+        return result.rowcount
+
+    async def get_counts(
+        self,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Количество задач по статусам (+ total) по счётчикам (кэшируется)."""
+        return await query_cache.get_or_load(
+            STATS, ("counts", project_id, assignee_id),
+            lambda: self._load_counts(project_id, assignee_id),
+        )
+
+    async def _load_counts(self, project_id: Optional[int], assignee_id: Optional[int]) -> Dict[str, int]:
+        query = select(TaskCounter.status, func.sum(TaskCounter.count)).group_by(TaskCounter.status)
+        if project_id is not None:
+            query = query.where(TaskCounter.project_id == project_id)
+        if assignee_id is not None:
+            query = query.where(TaskCounter.assignee_id == assignee_id)
+
+        counts = empty_counts()
+        for status, count in (await self.session.execute(query)).all():
+            counts[status] = count or 0
+            counts["total"] += count or 0
+        return counts
+
+    async def get_total(
+        self,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """Одно число — сколько задач с такими проектом/исполнителем/статусом."""
+        query = select(func.coalesce(func.sum(TaskCounter.count), 0))
+        if project_id is not None:
+            query = query.where(TaskCounter.project_id == project_id)
+        if assignee_id is not None:
+            query = query.where(TaskCounter.assignee_id == assignee_id)
+        if status is not None:
+            query = query.where(TaskCounter.status == status)
+        return (await self.session.execute(query)).scalar_one()
+
+    async def count_by_project(self) -> Dict[Optional[int], Dict[str, int]]:
+        """Счётчики по статусам для каждого проекта (None — без проекта)."""
+        return await query_cache.get_or_load(
+            STATS, ("by_project",), lambda: self._count_grouped(TaskCounter.project_id),
+        )
+
+    async def count_by_assignee(self) -> Dict[Optional[int], Dict[str, int]]:
+        """Счётчики по статусам для каждого исполнителя (None — не назначено)."""
+        return await query_cache.get_or_load(
+            STATS, ("by_assignee",), lambda: self._count_grouped(TaskCounter.assignee_id),
+        )
+
+    async def count_actual_by_project(self) -> Dict[Optional[int], Dict[str, int]]:
+        """То же, что count_by_project, но GROUP BY по tasks и tasks_archive — для сверки."""
+        tasks = task_keys(include_archive=True)
+        result = await self.session.execute(
+            select(tasks.c.project_id, tasks.c.status, func.count())
+            .group_by(tasks.c.project_id, tasks.c.status)
+        )
+        return _grouped(result.all())
+
+    async def _count_grouped(self, column) -> Dict[Optional[int], Dict[str, int]]:
+        result = await self.session.execute(
+            select(column, TaskCounter.status, func.sum(TaskCounter.count))
+            .group_by(column, TaskCounter.status)
+        )
+        return _grouped(result.all())
+
+
+def _grouped(rows) -> Dict[Optional[int], Dict[str, int]]:
+    """Строки (ключ, статус, count) → счётчики по ключу; 0 в ключе — None."""
+    grouped: Dict[Optional[int], Dict[str, int]] = {}
+    for key, status, count in rows:
+        if not count:
+            continue
+        counts = grouped.setdefault(key or None, empty_counts())
+        counts[status] = count
+        counts["total"] += count
+    return grouped
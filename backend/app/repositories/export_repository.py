@@ -0,0 +1,119 @@
+"""Export repository: запросы выгрузки и потоковое чтение строк."""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import select, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.models import Task, TaskArchive, Blocker, BlockerArchive, Meeting, Project
+
+
+def _task_query(model, archived: bool, start, end, project_id):
+    query = (
+        select(
+            model.id,
+            model.title,
+            model.description,
+            model.status,
+            model.project_id,
+            Project.name.label("project_name"),
+            model.assignee_telegram_id,
+            model.assignee_name,
+            model.source,
+            model.due_date,
+            model.created_at,
+            model.updated_at,
+            model.started_at,
+            model.completed_at,
+            literal(archived).label("archived"),
+        )
+        .outerjoin(Project, Project.id == model.project_id)
+    )
+    if start is not None:
+        query = query.where(model.created_at >= start)
+    if end is not None:
+        query = query.where(model.created_at < end)
+    if project_id is not None:
+        query = query.where(model.project_id == project_id)
+    return query.order_by(model.id)
+
+
+def _blocker_query(model, task_model, archived: bool, start, end, project_id):
+    query = (
+        select(
+            model.id,
+            model.task_id,
+            task_model.title.label("task_title"),
+            task_model.project_id,
+            model.text,
+            model.created_by,
+            model.created_at,
+            literal(archived).label("archived"),
+        )
+        .join(task_model, task_model.id == model.task_id)
+    )
+    if start is not None:
+        query = query.where(model.created_at >= start)
+    if end is not None:
+        query = query.where(model.created_at < end)
+    if project_id is not None:
+        query = query.where(task_model.project_id == project_id)
+    return query.order_by(model.id)
+
+
+class ExportRepository:
+    """Запросы для выгрузки: только колонки, без ORM-объектов.
+
+    Интервал [start, end) — по created_at (встречи — по meeting_date).
+    Архивные задачи и блокеры идут отдельным запросом после основных.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def task_queries(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        project_id: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> list:
+        queries = [_task_query(Task, False, start, end, project_id)]
+        if include_archived:
+            queries.append(_task_query(TaskArchive, True, start, end, project_id))
+        return queries
+
+    def blocker_queries(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        project_id: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> list:
+        queries = [_blocker_query(Blocker, Task, False, start, end, project_id)]
+        if include_archived:
+            queries.append(_blocker_query(BlockerArchive, TaskArchive, True, start, end, project_id))
+        return queries
+
+    def meeting_queries(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list:
+        query = select(Meeting.id, Meeting.meeting_date, Meeting.summary, Meeting.created_at)
+        if start is not None:
+            query = query.where(Meeting.meeting_date >= start)
+        if end is not None:
+            query = query.where(Meeting.meeting_date < end)
+        return [query.order_by(Meeting.id)]
+
+    async def stream(self, queries: list, chunk_size: int) -> AsyncIterator[List[dict]]:
+        """Строки запросов пачками по chunk_size через серверный курсор.
+
+        В памяти одновременно не больше одной пачки, независимо от размера таблицы.
+        """
+        for query in queries:
+            result = await self.session.stream(query.execution_options(yield_per=chunk_size))
+            try:
+                async for partition in result.mappings().partitions():
+                    yield [dict(row) for row in partition]
+            finally:
+                await result.close()
@@ -0,0 +1,142 @@
+"""Flow analytics repository — daily rollups of completed tasks."""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, delete, union_all, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import histogram
+from app.domain.enums import TaskStatus
+from app.domain.models import FlowDaily, Task, TaskArchive
+
+# (day, project_id, assignee_id); 0 — «нет проекта» / «не назначено»
+FlowKey = Tuple[date, int, int]
+
+# Ключей в одном IN (...) — по 3 переменные на ключ, ниже лимита SQLite
+_KEYS_PER_QUERY = 300
+
+
+class FlowSample(NamedTuple):
+    """Одно завершение задачи."""
+    key: FlowKey
+    cycle_seconds: Optional[float]  # None — задачу не брали в работу
+    lead_seconds: float
+
+
+def flow_sample(
+    project_id: Optional[int],
+    assignee_id: Optional[int],
+    created_at: datetime,
+    started_at: Optional[datetime],
+    completed_at: datetime,
+) -> FlowSample:
+    cycle = max((completed_at - started_at).total_seconds(), 0) if started_at else None
+    return FlowSample(
+        key=(completed_at.date(), project_id or 0, assignee_id or 0),
+        cycle_seconds=cycle,
+        lead_seconds=max((completed_at - created_at).total_seconds(), 0),
+    )
+
+
+def _apply(row: FlowDaily, samples: List[FlowSample], sign: int) -> None:
+    cycles = [s.cycle_seconds for s in samples if s.cycle_seconds is not None]
+    leads = [s.lead_seconds for s in samples]
+    cycle_hist = histogram.add(histogram.loads(row.cycle_hist), cycles, sign)
+    lead_hist = histogram.add(histogram.loads(row.lead_hist), leads, sign)
+
+    row.throughput = (row.throughput or 0) + sign * len(samples)
+    row.cycle_count = (row.cycle_count or 0) + sign * len(cycles)
+    row.cycle_seconds = (row.cycle_seconds or 0) + sign * int(sum(cycles))
+    row.lead_seconds = (row.lead_seconds or 0) + sign * int(sum(leads))
+    row.cycle_hist = histogram.dumps(cycle_hist)
+    row.lead_hist = histogram.dumps(lead_hist)
+    row.cycle_p50 = histogram.percentile(cycle_hist, 0.5)
+    row.cycle_p85 = histogram.percentile(cycle_hist, 0.85)
+    row.lead_p50 = histogram.percentile(lead_hist, 0.5)
+    row.lead_p85 = histogram.percentile(lead_hist, 0.85)
+
+
+def _done(model):
+    """Поля для flow_sample у завершённых задач таблицы model."""
+    return select(
+        model.project_id, model.assignee_id, model.created_at, model.started_at, model.completed_at
+    ).where(model.status == TaskStatus.DONE.value, model.completed_at.isnot(None))
+
+
+def _group(samples: Iterable[FlowSample]) -> Dict[FlowKey, List[FlowSample]]:
+    grouped: Dict[FlowKey, List[FlowSample]] = {}
+    for sample in samples:
+        grouped.setdefault(sample.key, []).append(sample)
+    return grouped
+
+
+class FlowRepository:
+    """Чтение и инкрементальное обновление flow_daily."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply(self, samples: Iterable[FlowSample], sign: int = 1) -> None:
+        """Добавить завершения в роллапы (sign=-1 — задачу переоткрыли)."""
+        grouped = _group(samples)
+        rows = await self._get_many(list(grouped))
+        for key, group in grouped.items():
+            row = rows.get(key)
+            if row is None:
+                if sign < 0:
+                    continue
+                row = FlowDaily(day=key[0], project_id=key[1], assignee_id=key[2])
+                self.session.add(row)
+            _apply(row, group, sign)
+            if row.throughput <= 0:
+                await self.session.delete(row)
+        await self.session.flush()
+
+    async def _get_many(self, keys: List[FlowKey]) -> Dict[FlowKey, FlowDaily]:
+        """Строки роллапов по ключам — один запрос на _KEYS_PER_QUERY ключей."""
+        found = {}
+        for i in range(0, len(keys), _KEYS_PER_QUERY):
+            result = await self.session.execute(
+                select(FlowDaily).where(
+                    tuple_(FlowDaily.day, FlowDaily.project_id, FlowDaily.assignee_id)
+                    .in_(keys[i:i + _KEYS_PER_QUERY])
+                )
+            )
+            for row in result.scalars():
+                found[(row.day, row.project_id, row.assignee_id)] = row
+        return found
+
+    async def get_rows(
+        self,
+        date_from: date,
+        date_to: date,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[FlowDaily]:
+        """Роллапы за [date_from, date_to] — range scan по первичному ключу."""
+        query = (
+            select(FlowDaily)
+            .where(FlowDaily.day >= date_from, FlowDaily.day <= date_to)
+            .order_by(FlowDaily.day)
+        )
+        if project_id is not None:
+            query = query.where(FlowDaily.project_id == project_id)
+        if assignee_id is not None:
+            query = query.where(FlowDaily.assignee_id == assignee_id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def rebuild(self) -> int:
+        """Пересчитать роллапы по DONE-задачам из tasks и tasks_archive. Возвращает число строк."""
+        await self.session.execute(delete(FlowDaily))
+        samples: List[FlowSample] = []
+        result = await self.session.stream(union_all(_done(Task), _done(TaskArchive)))
+        async for row in result:
+            samples.append(flow_sample(*row))
+
+        rows = []
+        for key, group in _group(samples).items():
+            row = FlowDaily(day=key[0], project_id=key[1], assignee_id=key[2])
+            _apply(row, group, 1)
+            rows.append(row)
+        self.session.add_all(rows)
+        await self.session.flush()
+        return len(rows)
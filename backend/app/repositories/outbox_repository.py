@@ -0,0 +1,63 @@
+"""Event outbox repository."""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.upsert import upsert
+from app.domain.models import EventOutbox, OutboxOffset
+
+
+class OutboxRepository:
+    """Чтение и очистка event_outbox, позиции потребителей."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_after(self, last_id: int, limit: int) -> List[Row]:
+        """Строки (id, origin, event_type, payload) с id > last_id по возрастанию."""
+        result = await self.session.execute(
+            select(EventOutbox.id, EventOutbox.origin, EventOutbox.event_type, EventOutbox.payload)
+            .where(EventOutbox.id > last_id)
+            .order_by(EventOutbox.id)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_between(self, first_id: int, last_id: int) -> List[Row]:
+        """Строки с first_id <= id <= last_id по возрастанию."""
+        result = await self.session.execute(
+            select(EventOutbox.id, EventOutbox.origin, EventOutbox.event_type, EventOutbox.payload)
+            .where(EventOutbox.id.between(first_id, last_id))
+            .order_by(EventOutbox.id)
+        )
+        return result.all()
+
+    async def get_last_id(self) -> int:
+        result = await self.session.execute(select(func.max(EventOutbox.id)))
+        return result.scalar() or 0
+
+    async def save_offset(self, consumer: str, last_id: int) -> None:
+        await upsert(
+            self.session, OutboxOffset,
+            [{"consumer": consumer, "last_id": last_id, "updated_at": datetime.utcnow()}],
+            index_elements=["consumer"],
+            update_columns=["last_id", "updated_at"],
+        )
+
+    async def get_min_offset(self) -> Optional[int]:
+        result = await self.session.execute(select(func.min(OutboxOffset.last_id)))
+        return result.scalar()
+
+    async def prune(self, before: datetime) -> int:
+        """Удалить события, прочитанные всеми потребителями, и всё старше before.
+
+        Ограничение по времени нужно, чтобы остановленный навсегда
+        потребитель не держал таблицу.
+        """
+        condition = EventOutbox.created_at < before
+        min_offset = await self.get_min_offset()
+        if min_offset is not None:
+            condition = or_(condition, EventOutbox.id <= min_offset)
+        result = await self.session.execute(delete(EventOutbox).where(condition))
+        return result.rowcount
@@ -1,7 +1,11 @@
 """Project repository."""
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import PROJECTS, detached, query_cache
+from app.core.event_bus import record_event
+from app.domain.events import ProjectChanged
 from app.domain.models import Project
 
 
@@ -10,12 +14,16 @@ class ProjectRepository:
         self.session = session
 
     async def get_all_active(self) -> List[Project]:
+        """Активные проекты по имени (кэшируется до изменения проекта)."""
+        return await query_cache.get_or_load(PROJECTS, ("active",), self._load_active)
+
+    async def _load_active(self) -> List[Project]:
         result = await self.session.execute(
             select(Project)
             .where(Project.is_active == True)
             .order_by(Project.name)
         )
-        return list(result.scalars().all())
+        return detached(self.session, list(result.scalars().all()))
 
     async def get_by_id(self, project_id: int) -> Optional[Project]:
         result = await self.session.execute(
@@ -23,8 +31,29 @@ class ProjectRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_existing_ids(self, project_ids: Iterable[int]) -> Set[int]:
+        """Какие из project_ids существуют — один запрос IN (...)."""
+        project_ids = set(project_ids)
+        if not project_ids:
+            return set()
+        result = await self.session.execute(select(Project.id).where(Project.id.in_(project_ids)))
+        return set(result.scalars().all())
+
     async def create(self, name: str, description: str = None, emoji: str = "📁") -> Project:
         project = Project(name=name, description=description, emoji=emoji)
         self.session.add(project)
         await self.session.flush()
+        self._changed(project)
+        return project
+
+    async def update(self, project: Project, **fields) -> Project:
+        """Поменять поля проекта (None — оставить как есть)."""
+        for name, value in fields.items():
+            if value is not None:
+                setattr(project, name, value)
+        await self.session.flush()
+        self._changed(project)
         return project
+
+    def _changed(self, project: Project) -> None:
+        record_event(self.session, ProjectChanged(occurred_at=datetime.utcnow(), project_id=project.id))
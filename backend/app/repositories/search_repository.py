@@ -0,0 +1,89 @@
+"""Full-text search over tasks, blockers and meetings."""
+import re
+from typing import List, NamedTuple, Optional
+from sqlalchemy import select, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import IS_SQLITE
+from app.domain.models import Task
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Веса колонок для bm25: kind, ref_id, task_id (не индексируются), title, body
+_BM25 = "bm25(search_index, 0.0, 0.0, 0.0, 10.0, 1.0)"
+
+
+class SearchHit(NamedTuple):
+    """Найденная строка: задача, блокер или встреча."""
+    kind: str
+    id: int
+    task_id: Optional[int]
+    title: Optional[str]
+    snippet: str
+    rank: float
+
+
+def normalize_query(query: str) -> List[str]:
+    """Слова запроса в том виде, в каком они лежат в индексе."""
+    return [word.replace("ё", "е") for word in _WORD.findall(query.lower())]
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Превратить пользовательский ввод в безопасное FTS5-выражение.
+
+    Каждое слово — префиксный поиск, слова объединяются через AND.
+    У длинных слов отрезаем последнюю букву, чтобы «задачи» находило
+    «задача» и «задачу» — грубая, но дешёвая замена стеммингу.
+    """
+    terms = []
+    for word in normalize_query(query):
+        if len(word) >= 5:
+            word = word[:-1]
+        terms.append(f'"{word}"*')
+    return " ".join(terms) or None
+
+
+class SearchRepository:
+    """Поиск по индексу search_index (FTS5, см. миграцию 4)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Найти задачи, блокеры и встречи, лучшие совпадения первыми."""
+        match = build_match_query(query)
+        if match is None:
+            return []
+
+        if not IS_SQLITE:
+            return await self._search_like(query, limit)
+
+        result = await self.session.execute(
+            text(
+                "SELECT search_index.kind, search_index.ref_id, search_index.task_id, t.title, "
+                "snippet(search_index, -1, '«', '»', '…', 12), "
+                f"{_BM25} AS rank "
+                "FROM search_index LEFT JOIN tasks t ON t.id = search_index.task_id "
+                "WHERE search_index MATCH :match "
+                "ORDER BY rank LIMIT :limit"
+            ).columns(),
+            {"match": match, "limit": limit},
+        )
+        return [SearchHit(*row) for row in result.all()]
+
+    async def _search_like(self, query: str, limit: int) -> List[SearchHit]:
+        # Без FTS5 ищем только по задачам и без ранжирования
+        conditions = []
+        for word in normalize_query(query):
+            pattern = f"%{word}%"
+            conditions.append(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+
+        result = await self.session.execute(
+            select(Task.id, Task.title, Task.description)
+            .where(*conditions)
+            .order_by(Task.created_at.desc())
+            .limit(limit)
+        )
+        return [
+            SearchHit("task", task_id, task_id, title, (description or "")[:120], 0.0)
+            for task_id, title, description in result.all()
+        ]
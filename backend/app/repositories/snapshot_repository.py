@@ -0,0 +1,71 @@
+"""Board snapshot repository — daily per-status counts for CFD."""
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.enums import TaskStatus
+from app.domain.models import BoardSnapshot
+
+# Статус -> колонка board_snapshots
+STATUS_COLUMNS = {
+    TaskStatus.TODO.value: "todo",
+    TaskStatus.DOING.value: "doing",
+    TaskStatus.BLOCKED.value: "blocked",
+    TaskStatus.DONE.value: "done",
+}
+
+INSERT_CHUNK_SIZE = 500
+
+
+def snapshot_row(day: date, project_id: Optional[int], counts: Dict[str, int]) -> dict:
+    """Строка board_snapshots из счётчиков по статусам."""
+    row = {"day": day, "project_id": project_id or 0}
+    for status, column in STATUS_COLUMNS.items():
+        row[column] = counts.get(status, 0)
+    return row
+
+
+class SnapshotRepository:
+    """Чтение и запись board_snapshots."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save_day(self, day: date, rows: List[dict]) -> int:
+        """Заменить снимок дня day строками rows."""
+        await self.session.execute(delete(BoardSnapshot).where(BoardSnapshot.day == day))
+        await self._insert(rows)
+        return len(rows)
+
+    async def replace_all(self, rows: List[dict]) -> int:
+        """Заменить всю историю (backfill)."""
+        await self.session.execute(delete(BoardSnapshot))
+        await self._insert(rows)
+        return len(rows)
+
+    async def _insert(self, rows: List[dict]) -> None:
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            await self.session.execute(insert(BoardSnapshot), rows[i:i + INSERT_CHUNK_SIZE])
+
+    async def get_range(self, date_from: date, date_to: date, project_id: Optional[int] = None) -> List[Row]:
+        """(day, todo, doing, blocked, done) по дням — один запрос по индексу.
+
+        Без project_id — сумма по всем проектам.
+        """
+        query = (
+            select(
+                BoardSnapshot.day,
+                func.sum(BoardSnapshot.todo),
+                func.sum(BoardSnapshot.doing),
+                func.sum(BoardSnapshot.blocked),
+                func.sum(BoardSnapshot.done),
+            )
+            .where(BoardSnapshot.day >= date_from, BoardSnapshot.day <= date_to)
+            .group_by(BoardSnapshot.day)
+            .order_by(BoardSnapshot.day)
+        )
+        if project_id is not None:
+            query = query.where(BoardSnapshot.project_id == project_id)
+        result = await self.session.execute(query)
+        return result.all()
@@ -0,0 +1,22 @@
+"""Stats helpers — status counts and task keys shared by counter queries."""
+from typing import Dict
+from sqlalchemy import select, union_all
+from app.domain.models import Task, TaskArchive
+from app.domain.enums import TaskStatus
+
+
+def empty_counts() -> Dict[str, int]:
+    """Счётчики по всем статусам, заполненные нулями."""
+    counts = {status.value: 0 for status in TaskStatus}
+    counts["total"] = 0
+    return counts
+
+
+def task_keys(include_archive: bool = False):
+    """(project_id, assignee_id, status) задач — горячих и, по желанию, архивных."""
+    hot = select(Task.project_id, Task.assignee_id, Task.status)
+    if not include_archive:
+        return hot.subquery()
+    archived = select(TaskArchive.project_id, TaskArchive.assignee_id, TaskArchive.status)
+    return union_all(hot, archived).subquery()
+
@@ -0,0 +1,52 @@
+"""Pending suggestion repository."""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.upsert import upsert
+from app.domain.models import PendingSuggestion
+
+
+class SuggestionRepository:
+    """Предложения создать задачу, ждущие подтверждения."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, chat_id: int, message_id: int, text: str,
+                  from_user_id: Optional[int], expires_at: datetime) -> None:
+        await upsert(
+            self.session, PendingSuggestion,
+            [{"chat_id": chat_id, "message_id": message_id, "text": text,
+              "from_user_id": from_user_id, "created_at": datetime.utcnow(),
+              "expires_at": expires_at}],
+            index_elements=["chat_id", "message_id"],
+            update_columns=["text", "from_user_id", "created_at", "expires_at"],
+        )
+
+    async def take(self, chat_id: int, message_id: int, now: datetime) -> Optional[Row]:
+        """Удалить предложение и вернуть (text, from_user_id), если оно не просрочено.
+
+        DELETE ... RETURNING — из двух одновременных подтверждений строку
+        получает только одно.
+        """
+        result = await self.session.execute(
+            delete(PendingSuggestion)
+            .where(
+                PendingSuggestion.chat_id == chat_id,
+                PendingSuggestion.message_id == message_id,
+            )
+            .returning(PendingSuggestion.text, PendingSuggestion.from_user_id,
+                       PendingSuggestion.expires_at)
+        )
+        row = result.first()
+        if row is None or row.expires_at <= now:
+            return None
+        return row
+
+    async def delete_expired(self, now: datetime) -> int:
+        result = await self.session.execute(
+            delete(PendingSuggestion).where(PendingSuggestion.expires_at <= now)
+        )
+        return result.rowcount
@@ -0,0 +1,110 @@
+"""Task history repository."""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, insert, delete, literal, cast, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.enums import TaskEventType, TaskStatus
+from app.domain.models import Task, TaskEvent
+
+
+def _str(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def seed_events(
+    task_id: int,
+    status: str,
+    created_at: datetime,
+    started_at: Optional[datetime],
+    completed_at: Optional[datetime],
+    updated_at: datetime,
+) -> List[dict]:
+    """История задачи, восстановленная по её датам (как в миграции v6)."""
+    active = TaskStatus.DOING.value if started_at else TaskStatus.TODO.value
+    rows = [(TaskEventType.CREATED, None, TaskStatus.TODO.value, created_at)]
+    if started_at:
+        rows.append((TaskEventType.STATUS_CHANGED, TaskStatus.TODO.value, TaskStatus.DOING.value, started_at))
+    if status == TaskStatus.DONE.value and completed_at:
+        rows.append((TaskEventType.STATUS_CHANGED, active, TaskStatus.DONE.value, completed_at))
+    elif status == TaskStatus.BLOCKED.value:
+        rows.append((TaskEventType.STATUS_CHANGED, active, TaskStatus.BLOCKED.value, updated_at))
+    return [
+        {"task_id": task_id, "event_type": event_type.value, "old_value": old_value,
+         "new_value": new_value, "occurred_at": occurred_at}
+        for event_type, old_value, new_value, occurred_at in rows
+    ]
+
+
+class TaskEventRepository:
+    """Append-only история задач (task_events)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(
+        self,
+        task_id: int,
+        event_type: TaskEventType,
+        old_value=None,
+        new_value=None,
+        details: Optional[str] = None,
+        actor_telegram_id: Optional[int] = None,
+        occurred_at: Optional[datetime] = None,
+    ) -> None:
+        """Добавить запись; пишется при следующем flush/commit."""
+        self.session.add(TaskEvent(
+            task_id=task_id,
+            event_type=event_type.value,
+            old_value=_str(old_value),
+            new_value=_str(new_value),
+            details=details,
+            actor_telegram_id=actor_telegram_id,
+            occurred_at=occurred_at or datetime.utcnow(),
+        ))
+
+    async def add_many(self, rows: List[dict]) -> None:
+        """Вставить готовые записи одним executemany (Core INSERT — без дробления ORM)."""
+        if rows:
+            await self.session.execute(insert(TaskEvent.__table__), rows)
+
+    async def add_bulk_change(
+        self,
+        task_ids: List[int],
+        event_type: TaskEventType,
+        column,
+        new_value,
+        occurred_at: datetime,
+        details: Optional[str] = None,
+    ) -> None:
+        """INSERT ... SELECT по задачам, у которых column отличается от new_value.
+
+        Вызывается до UPDATE — старое значение берётся из самой строки.
+        """
+        new_value = _str(new_value)
+        await self.session.execute(
+            insert(TaskEvent).from_select(
+                ["task_id", "event_type", "old_value", "new_value", "details", "occurred_at"],
+                select(
+                    Task.id,
+                    literal(event_type.value),
+                    cast(column, String),
+                    literal(new_value, String),
+                    literal(details, String),
+                    literal(occurred_at),
+                ).where(Task.id.in_(task_ids), cast(column, String).is_distinct_from(new_value)),
+            )
+        )
+
+    async def get_timeline(self, task_id: int) -> List[TaskEvent]:
+        """Вся история задачи по времени — один range scan по индексу."""
+        result = await self.session.execute(
+            select(TaskEvent)
+            .where(TaskEvent.task_id == task_id)
+            .order_by(TaskEvent.occurred_at, TaskEvent.id)
+        )
+        return list(result.scalars().all())
+
+    async def delete_for_task(self, task_id: int) -> None:
+        await self.session.execute(delete(TaskEvent).where(TaskEvent.task_id == task_id))
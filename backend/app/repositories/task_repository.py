@@ -1,10 +1,49 @@
 """Task repository for data access."""
-from typing import Optional, List
-from sqlalchemy import select
+from datetime import datetime
+from typing import Optional, List, NamedTuple, Tuple
+from sqlalchemy import select, and_, case, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from app.domain.models import Task
+from app.domain.models import Task, TelegramUser, TaskTombstone
 from app.domain.enums import TaskStatus, TaskSource
+from app.core.pagination import encode_cursor, decode_cursor
+
+
+class TaskListRow(NamedTuple):
+    """Лёгкая строка списка задач — без ORM-графа, блокеров и исполнителя."""
+    id: int
+    title: str
+    status: str
+    project_id: Optional[int]
+    assignee_telegram_id: Optional[int]
+    assignee_display_name: Optional[str]
+    created_at: datetime
+
+
+# То же, что TelegramUser.display_name, но вычисляется в SQL
+_assignee_display_name = case(
+    (and_(TelegramUser.username.isnot(None), TelegramUser.username != ""),
+     literal("@") + TelegramUser.username),
+    (and_(TelegramUser.last_name.isnot(None), TelegramUser.last_name != ""),
+     TelegramUser.first_name + " " + TelegramUser.last_name),
+    else_=TelegramUser.first_name,
+)
+
+
+# Позиция сравнивается как row value: (created_at, id) < (?, ?) SQLite
+# превращает в поиск по ix_tasks_created_at_id, а равносильное
+# created_at < ? OR (created_at = ? AND id < ?) — в полный проход индекса.
+
+def _after_cursor(query, cursor: str):
+    """Продолжить выборку после позиции курсора (порядок created_at, id desc)."""
+    created_at, task_id = decode_cursor(cursor)
+    return query.where(tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id))
+
+
+def _before_cursor(query, cursor: str):
+    """Строки перед позицией курсора в том же порядке (created_at, id desc)."""
+    created_at, task_id = decode_cursor(cursor)
+    return query.where(tuple_(Task.created_at, Task.id) > tuple_(created_at, task_id))
 
 
 class TaskRepository:
@@ -47,6 +86,133 @@ class TaskRepository:
         result = await self.session.execute(query.order_by(Task.created_at.desc()))
         return list(result.scalars().all())
     
+    async def get_open(self) -> List[Task]:
+        """Незакрытые задачи (не DONE), старые первыми."""
+        result = await self.session.execute(
+            select(Task)
+            .options(selectinload(Task.blockers), selectinload(Task.assignee))
+            .where(Task.status != TaskStatus.DONE.value)
+            .order_by(Task.created_at, Task.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_overdue(self, now: datetime) -> List[Task]:
+        """Незакрытые задачи со сроком раньше now (частичный индекс ix_tasks_open_due_date)."""
+        result = await self.session.execute(
+            select(Task)
+            .options(selectinload(Task.blockers), selectinload(Task.assignee))
+            .where(
+                Task.status != TaskStatus.DONE.value,
+                Task.due_date.isnot(None),
+                Task.due_date < now,
+            )
+            .order_by(Task.due_date)
+        )
+        return list(result.scalars().all())
+
+    async def get_created_between(self, start: datetime, end: datetime) -> List[Task]:
+        """Задачи, созданные в интервале [start, end]."""
+        result = await self.session.execute(
+            select(Task)
+            .options(selectinload(Task.blockers), selectinload(Task.assignee))
+            .where(Task.created_at >= start, Task.created_at <= end)
+            .order_by(Task.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_telegram_id: Optional[int] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get one page of tasks ordered by (created_at, id) desc.
+
+        Keyset-пагинация: следующая страница начинается строго после
+        последней пары (created_at, id), поэтому стоимость запроса не
+        зависит от глубины листания. Возвращает задачи и курсор
+        следующей страницы (None — страниц больше нет).
+        """
+        query = (
+            select(Task)
+            .options(selectinload(Task.blockers), selectinload(Task.assignee))
+        )
+        if status:
+            query = query.where(Task.status == status.value)
+        if assignee_telegram_id:
+            query = query.where(Task.assignee_telegram_id == assignee_telegram_id)
+        if cursor:
+            query = _after_cursor(query, cursor)
+
+        result = await self.session.execute(
+            query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+        )
+        tasks = list(result.scalars().all())
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return tasks, next_cursor
+
+    async def get_list_rows(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee_telegram_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        without_project: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        backward: bool = False,
+    ) -> Tuple[List[TaskListRow], Optional[str]]:
+        """Get list-view rows: only the columns lists show, one LEFT JOIN.
+
+        Для списков в боте и компактного API — детали задачи по-прежнему
+        загружает get_by_id. Без limit возвращает все строки.
+        backward — страница перед cursor (кнопка «Назад»): строки в обычном
+        порядке, курсор указывает на первую из них, если раньше есть ещё.
+        """
+        query = (
+            select(
+                Task.id,
+                Task.title,
+                Task.status,
+                Task.project_id,
+                Task.assignee_telegram_id,
+                _assignee_display_name.label("assignee_display_name"),
+                Task.created_at,
+            )
+            .outerjoin(TelegramUser, TelegramUser.id == Task.assignee_id)
+        )
+        if status:
+            query = query.where(Task.status == status.value)
+        if assignee_telegram_id is not None:
+            query = query.where(Task.assignee_telegram_id == assignee_telegram_id)
+        if without_project:
+            query = query.where(Task.project_id.is_(None))
+        elif project_id is not None:
+            query = query.where(Task.project_id == project_id)
+        if cursor:
+            query = _before_cursor(query, cursor) if backward else _after_cursor(query, cursor)
+
+        if backward:
+            query = query.order_by(Task.created_at, Task.id)
+        else:
+            query = query.order_by(Task.created_at.desc(), Task.id.desc())
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        rows = [TaskListRow(*row) for row in (await self.session.execute(query)).all()]
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        if backward:
+            rows.reverse()
+        return rows, next_cursor
+
     async def update(self, task: Task) -> Task:
         """Update existing task."""
         await self.session.flush()
@@ -58,6 +224,8 @@ class TaskRepository:
         task = await self.get_by_id(task_id)
         if task:
             await self.session.delete(task)
+            # Tombstone для GET /api/tasks/changes
+            self.session.add(TaskTombstone(task_id=task_id))
             return True
         return False
     
@@ -1,8 +1,12 @@
 """TelegramUser repository."""
-from typing import Optional, List
-from sqlalchemy import select
-from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime
+from typing import Dict, Optional, List
+from sqlalchemy import select, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import USERS, detached, query_cache
+from app.core.event_bus import record_event
+from app.core.upsert import upsert, UPSERT_BATCH_SIZE
+from app.domain.events import UsersChanged
 from app.domain.models import TelegramUser
 
 
@@ -17,12 +21,16 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def get_all(self) -> List[TelegramUser]:
+        """Активные пользователи по имени (кэшируется до изменения пользователей)."""
+        return await query_cache.get_or_load(USERS, ("active",), self._load_all)
+
+    async def _load_all(self) -> List[TelegramUser]:
         result = await self.session.execute(
             select(TelegramUser)
             .where(TelegramUser.is_active == True)
             .order_by(TelegramUser.first_name)
         )
-        return list(result.scalars().all())
+        return detached(self.session, list(result.scalars().all()))
 
     async def create_or_update(
         self,
@@ -31,25 +39,83 @@ class UserRepository:
         username: Optional[str] = None,
         last_name: Optional[str] = None,
     ) -> TelegramUser:
-        """Upsert через INSERT OR REPLACE — атомарно, без race condition."""
-        stmt = sqlite_insert(TelegramUser).values(
-            telegram_id=telegram_id,
-            first_name=first_name,
-            username=username,
-            last_name=last_name,
-            is_active=True,
-        )
-        # ON CONFLICT — обновляем поля если запись уже есть
-        stmt = stmt.on_conflict_do_update(
+        """Upsert через INSERT ... ON CONFLICT — атомарно, без race condition."""
+        await self.create_or_update_many([{
+            "telegram_id": telegram_id,
+            "first_name": first_name,
+            "username": username,
+            "last_name": last_name,
+        }])
+        # Возвращаем актуальный объект
+        return await self.get_by_telegram_id(telegram_id)
+
+    async def create_or_update_many(self, users: List[dict]) -> Dict[int, int]:
+        """Upsert многих пользователей — один INSERT на пачку.
+
+        users — словари telegram_id, first_name, username, last_name.
+        Возвращает telegram_id -> id для всех переданных пользователей.
+        """
+        if not users:
+            return {}
+        now = datetime.utcnow()
+        rows = [
+            {
+                "telegram_id": user["telegram_id"],
+                "first_name": user["first_name"],
+                "username": user.get("username"),
+                "last_name": user.get("last_name"),
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user in users
+        ]
+        await upsert(
+            self.session, TelegramUser, rows,
             index_elements=["telegram_id"],
-            set_={
-                "first_name": first_name,
-                "username": username,
-                "last_name": last_name,
-            },
+            update_columns=["first_name", "username", "last_name", "updated_at"],
         )
-        await self.session.execute(stmt)
         await self.session.flush()
+        telegram_ids = [row["telegram_id"] for row in rows]
+        record_event(self.session, UsersChanged(occurred_at=now, telegram_ids=telegram_ids))
+        return await self.get_ids(telegram_ids)
 
-        # Возвращаем актуальный объект
-        return await self.get_by_telegram_id(telegram_id)
+    async def get_names(self, telegram_ids: List[int]) -> Dict[int, tuple]:
+        """telegram_id -> (first_name, username, last_name) существующих пользователей."""
+        names: Dict[int, tuple] = {}
+        unique = list(dict.fromkeys(telegram_ids))
+        for i in range(0, len(unique), UPSERT_BATCH_SIZE):
+            result = await self.session.execute(
+                select(TelegramUser.telegram_id, TelegramUser.first_name,
+                       TelegramUser.username, TelegramUser.last_name)
+                .where(TelegramUser.telegram_id.in_(unique[i:i + UPSERT_BATCH_SIZE]))
+            )
+            names.update((row[0], tuple(row[1:])) for row in result.all())
+        return names
+
+    async def touch_last_seen(self, seen: Dict[int, datetime]) -> None:
+        """Записать last_seen_at многим пользователям одним executemany.
+
+        На список пользователей в кэше не влияет — UsersChanged не нужен.
+        """
+        if not seen:
+            return
+        table = TelegramUser.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.telegram_id == bindparam("seen_telegram_id"))
+            .values(last_seen_at=bindparam("seen_at")),
+            [{"seen_telegram_id": telegram_id, "seen_at": at} for telegram_id, at in seen.items()],
+        )
+
+    async def get_ids(self, telegram_ids: List[int]) -> Dict[int, int]:
+        """telegram_id -> id для существующих пользователей."""
+        ids: Dict[int, int] = {}
+        unique = list(dict.fromkeys(telegram_ids))
+        for i in range(0, len(unique), UPSERT_BATCH_SIZE):
+            result = await self.session.execute(
+                select(TelegramUser.telegram_id, TelegramUser.id)
+                .where(TelegramUser.telegram_id.in_(unique[i:i + UPSERT_BATCH_SIZE]))
+            )
+            ids.update(dict(result.all()))
+        return ids
@@ -0,0 +1,176 @@
+"""Analytics service — flow metrics and cumulative flow from daily tables."""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import histogram
+from app.core.write_queue import run_write
+from app.core.logging import get_logger
+from app.domain.enums import TaskEventType
+from app.domain.models import FlowDaily, Task, TaskArchive, TaskEvent
+from app.repositories.counter_repository import CounterRepository
+from app.repositories.flow_repository import FlowRepository
+from app.repositories.snapshot_repository import SnapshotRepository, STATUS_COLUMNS, snapshot_row
+
+logger = get_logger(__name__)
+
+# Записи task_events, после которых меняется статус задачи
+_STATUS_EVENTS = (TaskEventType.CREATED.value, TaskEventType.STATUS_CHANGED.value, TaskEventType.BLOCKED.value)
+
+
+def _summary(rows: List[FlowDaily], hist_field: str, count_field: str, seconds_field: str) -> dict:
+    merged: histogram.Histogram = {}
+    count = seconds = 0
+    for row in rows:
+        histogram.merge(merged, histogram.loads(getattr(row, hist_field)))
+        count += getattr(row, count_field)
+        seconds += getattr(row, seconds_field)
+    return {
+        "p50": histogram.percentile(merged, 0.5),
+        "p85": histogram.percentile(merged, 0.85),
+        "avg": seconds // count if count else None,
+        "count": count,
+    }
+
+
+class AnalyticsService:
+    """Cycle time, lead time и throughput по flow_daily.
+
+    Отчёт за период читает только роллапы (строка на день × проект ×
+    исполнитель с завершёнными задачами), а не задачи. Перцентили за
+    период считаются по сумме дневных гистограмм.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = FlowRepository(session)
+        self.snapshots = SnapshotRepository(session)
+
+    async def get_flow(
+        self,
+        date_from: date,
+        date_to: date,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+    ) -> dict:
+        """Итоги за период и ряд по дням (дни без завершений пропущены)."""
+        rows = await self.repository.get_rows(date_from, date_to, project_id, assignee_id)
+
+        by_day: Dict[date, List[FlowDaily]] = {}
+        for row in rows:
+            by_day.setdefault(row.day, []).append(row)
+        days = []
+        for day, day_rows in by_day.items():
+            cycle = _summary(day_rows, "cycle_hist", "cycle_count", "cycle_seconds")
+            lead = _summary(day_rows, "lead_hist", "throughput", "lead_seconds")
+            days.append({
+                "day": day,
+                "throughput": lead["count"],
+                "cycle_time_p50": cycle["p50"],
+                "cycle_time_p85": cycle["p85"],
+                "lead_time_p50": lead["p50"],
+                "lead_time_p85": lead["p85"],
+            })
+
+        lead = _summary(rows, "lead_hist", "throughput", "lead_seconds")
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "throughput": lead["count"],
+            "cycle_time": _summary(rows, "cycle_hist", "cycle_count", "cycle_seconds"),
+            "lead_time": lead,
+            "days": days,
+        }
+
+    # ============= CUMULATIVE FLOW =============
+
+    async def take_snapshot(self, day: date) -> int:
+        """Записать текущую доску (task_counters) как снимок дня day."""
+        counts = await CounterRepository(self.session).count_by_project()
+        rows = [snapshot_row(day, project_id, project_counts) for project_id, project_counts in counts.items()]
+        return await self.snapshots.save_day(day, rows)
+
+    async def backfill_snapshots(self, until: date) -> int:
+        """Восстановить снимки всех дней до until по истории статусов (task_events).
+
+        Статус задачи на конец дня — последний переход в этот день или
+        раньше; проект — текущий (горячая таблица или архив).
+        """
+        projects = dict((await self.session.execute(union_all(
+            select(Task.id, Task.project_id), select(TaskArchive.id, TaskArchive.project_id)
+        ))).all())
+
+        # День -> (проект, статус) -> изменение числа задач
+        deltas: Dict[date, Dict[Tuple[int, str], int]] = {}
+
+        def add_interval(project_id: int, transitions: List[Tuple[date, str]]) -> None:
+            for i, (day, status) in enumerate(transitions):
+                key = (project_id, status)
+                deltas.setdefault(day, {})
+                deltas[day][key] = deltas[day].get(key, 0) + 1
+                if i + 1 < len(transitions):
+                    end = transitions[i + 1][0]
+                    deltas.setdefault(end, {})
+                    deltas[end][key] = deltas[end].get(key, 0) - 1
+
+        current_task, transitions = None, []
+        result = await self.session.stream(
+            select(TaskEvent.task_id, TaskEvent.occurred_at, TaskEvent.new_value)
+            .where(TaskEvent.event_type.in_(_STATUS_EVENTS))
+            .order_by(TaskEvent.task_id, TaskEvent.occurred_at, TaskEvent.id)
+        )
+        async for task_id, occurred_at, status in result:
+            if task_id != current_task:
+                if current_task in projects:
+                    add_interval(projects[current_task] or 0, transitions)
+                current_task, transitions = task_id, []
+            day = occurred_at.date()
+            if transitions and transitions[-1][0] == day:
+                transitions[-1] = (day, status)  # на конец дня важен последний переход
+            else:
+                transitions.append((day, status))
+        if current_task in projects:
+            add_interval(projects[current_task] or 0, transitions)
+
+        rows = []
+        if deltas:
+            totals: Dict[Tuple[int, str], int] = {}
+            day = min(deltas)
+            while day <= until:
+                for key, delta in deltas.get(day, {}).items():
+                    totals[key] = totals.get(key, 0) + delta
+                by_project: Dict[int, Dict[str, int]] = {}
+                for (project_id, status), count in totals.items():
+                    if count:
+                        by_project.setdefault(project_id, {})[status] = count
+                rows += [snapshot_row(day, project_id, counts) for project_id, counts in by_project.items()]
+                day += timedelta(days=1)
+        return await self.snapshots.replace_all(rows)
+
+    async def get_cfd(self, date_from: date, date_to: date, project_id: Optional[int] = None) -> dict:
+        """Ряды для CFD: days и по массиву на статус одинаковой длины.
+
+        Начинается с первого снимка в периоде; пропущенные дни (процесс
+        не работал) повторяют предыдущий снимок.
+        """
+        rows = await self.snapshots.get_range(date_from, date_to, project_id)
+        series = {"days": [], **{column: [] for column in STATUS_COLUMNS.values()}}
+        if not rows:
+            return series
+
+        by_day = {row[0]: row[1:] for row in rows}
+        day, last = rows[0][0], rows[0][1:]
+        while day <= rows[-1][0]:
+            last = by_day.get(day, last)
+            series["days"].append(day)
+            for column, value in zip(STATUS_COLUMNS.values(), last):
+                series[column].append(value or 0)
+            day += timedelta(days=1)
+        return series
+
+
+async def snapshot_board() -> int:
+    """Фоновая задача: обновить снимок доски за сегодня (UTC)."""
+    rows = await run_write(lambda session: AnalyticsService(session).take_snapshot(datetime.utcnow().date()))
+    logger.debug("board_snapshot_saved", rows=rows)
+    return rows
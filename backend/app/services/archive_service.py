@@ -0,0 +1,76 @@
+"""Archive service — moves old closed tasks out of the hot table."""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.domain.models import TaskArchive, BlockerArchive
+from app.repositories.archive_repository import ArchiveRepository
+from app.core.write_queue import run_write
+from app.core.event_bus import record_event
+from app.domain.events import TasksArchived
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArchiveService:
+    """Архивирование DONE-задач и чтение архива.
+
+    Архив — только место хранения: счётчики task_counters при переносе
+    не меняются, поэтому /stats по-прежнему учитывает закрытые задачи.
+    Поиск (search_index) и обычные списки видят лишь горячую таблицу.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = ArchiveRepository(session)
+
+    async def archive_batch(self, completed_before: datetime, batch_size: int) -> int:
+        """Перенести в архив одну пачку задач. Возвращает их количество."""
+        task_ids = await self.repository.get_archivable_ids(completed_before, batch_size)
+        moved = await self.repository.move_to_archive(task_ids)
+        if task_ids:
+            record_event(self.session, TasksArchived(occurred_at=datetime.utcnow(), task_ids=task_ids))
+        return moved
+
+    async def get_archived_task(self, task_id: int) -> Optional[Tuple[TaskArchive, List[BlockerArchive]]]:
+        """Архивная задача с блокерами."""
+        task = await self.repository.get_by_id(task_id)
+        if not task:
+            return None
+        return task, await self.repository.get_blockers(task_id)
+
+    async def get_archived_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        project_id: Optional[int] = None,
+        assignee_telegram_id: Optional[int] = None,
+    ) -> Tuple[List[TaskArchive], Optional[str]]:
+        """Страница архива (keyset-пагинация)."""
+        return await self.repository.get_page(limit, cursor, project_id, assignee_telegram_id)
+
+
+async def archive_closed_tasks(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Фоновая задача: архивировать DONE-задачи старше older_than_days.
+
+    Каждая пачка — отдельная единица записи в общей очереди, чтобы не
+    держать блокировку писателя долго и не мешать обычным запросам.
+    """
+    days = older_than_days if older_than_days is not None else settings.ARCHIVE_AFTER_DAYS
+    size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    completed_before = datetime.utcnow() - timedelta(days=days)
+
+    total = 0
+    while True:
+        moved = await run_write(lambda session: ArchiveService(session).archive_batch(completed_before, size))
+        total += moved
+        if moved < size:
+            break
+
+    if total:
+        logger.info("tasks_archived", count=total, older_than_days=days)
+    return total
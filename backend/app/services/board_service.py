@@ -16,12 +16,8 @@ class BoardService:
     
     async def get_week_board(self) -> Dict[str, List[Task]]:
         """Get all open tasks (не DONE) grouped by status, старые сверху."""
-        # Получаем все задачи
-        all_tasks = await self.task_repository.get_all()
-        
-        # Фильтруем незакрытые и сортируем по дате создания (старые сверху)
-        open_tasks = [t for t in all_tasks if t.status != TaskStatus.DONE.value]
-        open_tasks.sort(key=lambda t: t.created_at)
+        # Незакрытые задачи, старые сверху — фильтр и сортировка в SQL
+        open_tasks = await self.task_repository.get_open()
         
         # Group by status
         board = {
@@ -56,15 +52,7 @@ class BoardService:
     
     async def get_overdue_tasks(self) -> List[Task]:
         """Get all overdue tasks."""
-        all_tasks = await self.task_repository.get_all()
-        now = datetime.utcnow()
-        
-        overdue = []
-        for task in all_tasks:
-            if task.due_date and task.due_date < now and task.status != TaskStatus.DONE.value:
-                overdue.append(task)
-        
-        return overdue
+        return await self.task_repository.get_overdue(datetime.utcnow())
     
     def format_board_message(self, board: Dict[str, List[Task]]) -> str:
         """Format board as text message."""
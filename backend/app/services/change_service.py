@@ -0,0 +1,53 @@
+"""Change feed service — delta sync tokens and tombstone retention."""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.write_queue import run_write
+from app.repositories.change_repository import ChangeRepository, ChangeBatch
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SyncTokenExpired(Exception):
+    """Токен старше срока хранения tombstones — нужна полная пересинхронизация."""
+
+
+class ChangeService:
+    """Лента изменений задач для клиентских реплик."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = ChangeRepository(session)
+
+    async def get_changes(self, since: Optional[str], limit: int) -> ChangeBatch:
+        """Изменения после токена since (None — с самого начала).
+
+        ValueError — токен повреждён, SyncTokenExpired — устарел.
+        """
+        now = datetime.utcnow()
+        position = None
+        if since:
+            position = decode_cursor(since)
+            if position[0] < now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+                raise SyncTokenExpired(since)
+
+        until = now - timedelta(seconds=settings.CHANGES_GRACE_SECONDS)
+        return await self.repository.get_changes(position, until, limit)
+
+    @staticmethod
+    def encode_token(batch: ChangeBatch) -> Optional[str]:
+        if batch.position is None:
+            return None
+        return encode_cursor(*batch.position)
+
+
+async def prune_tombstones() -> int:
+    """Фоновая задача: удалить tombstones старше TOMBSTONE_RETENTION_DAYS."""
+    before = datetime.utcnow() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    pruned = await run_write(lambda session: ChangeRepository(session).prune_tombstones(before))
+    if pruned:
+        logger.info("tombstones_pruned", count=pruned)
+    return pruned
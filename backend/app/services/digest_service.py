@@ -29,13 +29,10 @@ class DigestService:
         week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
         week_end = week_start + timedelta(days=6, hours=23, minutes=59, seconds=59)
         
-        # Задачи текущей недели
-        all_tasks = await self.task_repo.get_all()
-        # Сравниваем aware datetime
-        week_tasks = [
-            t for t in all_tasks 
-            if t.created_at and week_start <= t.created_at.replace(tzinfo=now.tzinfo) <= week_end
-        ]
+        # Задачи текущей недели — в БД naive datetime, границы тоже naive
+        week_tasks = await self.task_repo.get_created_between(
+            week_start.replace(tzinfo=None), week_end.replace(tzinfo=None)
+        )
         
         # Встречи текущей недели
         all_meetings = await self.meeting_repo.get_recent(days=30)
@@ -143,13 +140,8 @@ class DigestService:
         """Get reminder about overdue tasks."""
         from app.core.clock import Clock
         
-        all_tasks = await self.task_repo.get_all()
-        now = Clock.now()
-        
-        overdue = [
-            t for t in all_tasks
-            if t.due_date and t.due_date < now and t.status != TaskStatus.DONE.value
-        ]
+        now = Clock.now().replace(tzinfo=None)
+        overdue = await self.task_repo.get_overdue(now)
         
         if not overdue:
             return None
@@ -0,0 +1,118 @@
+"""Export service: потоковая выгрузка задач, блокеров и встреч в NDJSON/CSV."""
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, List, Optional
+from app.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.repositories.export_repository import ExportRepository
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def format_ndjson(rows: List[dict]) -> str:
+    return "".join(
+        json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+        for row in rows
+    )
+
+
+def format_csv(rows: List[list]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def day_range(date_from: Optional[date], date_to: Optional[date]):
+    """Дни [from, to] включительно → полуинтервал datetime [start, end)."""
+    start = datetime.combine(date_from, time.min) if date_from else None
+    end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+    return start, end
+
+
+class ExportService:
+    """Выгрузка для отчётов.
+
+    Каждый поток открывает свою сессию: FastAPI закрывает сессию из
+    get_db до того, как начнёт отдавать тело StreamingResponse.
+    Строки читаются серверным курсором пачками по EXPORT_CHUNK_SIZE,
+    каждая пачка сразу уходит клиенту одним куском.
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+
+    def tasks(
+        self,
+        format: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        project_id: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[str]:
+        start, end = day_range(date_from, date_to)
+        return self._stream(
+            "tasks", format,
+            lambda repo: repo.task_queries(start, end, project_id, include_archived),
+        )
+
+    def blockers(
+        self,
+        format: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        project_id: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[str]:
+        start, end = day_range(date_from, date_to)
+        return self._stream(
+            "blockers", format,
+            lambda repo: repo.blocker_queries(start, end, project_id, include_archived),
+        )
+
+    def meetings(
+        self,
+        format: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> AsyncIterator[str]:
+        start, end = day_range(date_from, date_to)
+        return self._stream("meetings", format, lambda repo: repo.meeting_queries(start, end))
+
+    async def _stream(self, kind: str, format: str, build_queries) -> AsyncIterator[str]:
+        exported = 0
+        async with AsyncSessionLocal() as session:
+            repo = ExportRepository(session)
+            queries = build_queries(repo)
+            if format == "csv":
+                # Заголовок — даже для пустой выгрузки
+                yield format_csv([list(queries[0].selected_columns.keys())])
+            async for rows in repo.stream(queries, self.chunk_size):
+                if format == "csv":
+                    yield format_csv([row.values() for row in rows])
+                else:
+                    yield format_ndjson(rows)
+                exported += len(rows)
+        logger.info("export_finished", kind=kind, format=format, rows=exported)
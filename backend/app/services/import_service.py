@@ -0,0 +1,299 @@
+"""Import service: пакетная загрузка задач из NDJSON/CSV (миграция с другого трекера).
+
+Вход читается потоком, каждая строка проверяется и превращается в
+значения колонок tasks; проекты и исполнители ищутся в словарях,
+загруженных один раз в начале. Проверенные строки копятся в пачку
+IMPORT_BATCH_SIZE и вставляются одним executemany через run_write —
+каждая пачка в своей транзакции, импорт не держит писателя SQLite.
+"""
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from sqlalchemy import select
+from app.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.write_queue import run_write
+from app.domain.enums import TaskSource, TaskStatus
+from app.domain.models import Project, TelegramUser
+from app.services.task_service import TaskService
+
+logger = get_logger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# Строка входа: номер строки и объект (или исходный текст, если не разобрался)
+Record = Tuple[int, Union[dict, str]]
+
+
+class RowRejected(ValueError):
+    """Строка импорта не прошла проверку."""
+
+
+# ============= PARSING =============
+
+async def decode_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Байтовые куски (тело запроса) → строки UTF-8 (BOM отбрасывается)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def read_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, line.rstrip("\n")
+
+
+# Состояния разбора CSV — как в модуле csv (диалект excel)
+_START_FIELD, _IN_FIELD, _IN_QUOTED_FIELD, _QUOTE_IN_QUOTED_FIELD = range(4)
+
+
+def _csv_state(line: str, state: int = _START_FIELD) -> int:
+    """Состояние разбора после line, начатой в state.
+
+    Кавычка открывает поле только в его начале, внутри поля без кавычек
+    она обычный символ (`27" monitor`); "" внутри кавычек — экранированная
+    кавычка. Запись продолжается на следующей строке, только если строка
+    кончилась внутри поля в кавычках.
+    """
+    for char in line:
+        if state == _IN_QUOTED_FIELD:
+            if char == '"':
+                state = _QUOTE_IN_QUOTED_FIELD
+        elif char in ",\r\n":
+            state = _START_FIELD
+        elif state == _START_FIELD and char == '"':
+            state = _IN_QUOTED_FIELD
+        elif state == _QUOTE_IN_QUOTED_FIELD and char == '"':
+            state = _IN_QUOTED_FIELD
+        else:
+            state = _IN_FIELD
+    return state
+
+
+async def read_csv(lines: AsyncIterable[str]) -> AsyncIterator[Record]:
+    """CSV с заголовком. Запись в кавычках может занимать несколько строк."""
+    header, record, line_no, first_line = None, "", 0, 0
+    state = _START_FIELD
+    async for line in lines:
+        line_no += 1
+        if not record:
+            first_line = line_no
+            state = _START_FIELD
+        record += line
+        state = _csv_state(line, state)
+        if state == _IN_QUOTED_FIELD:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield first_line, dict(zip(header, values))
+    if record.strip():
+        yield first_line, record
+
+
+def read_records(lines: AsyncIterable[str], format: str) -> AsyncIterator[Record]:
+    return read_csv(lines) if format == "csv" else read_ndjson(lines)
+
+
+# ============= VALIDATION =============
+
+@dataclass
+class ImportLookups:
+    """Справочники для сопоставления строк: проекты и пользователи."""
+    project_ids: set = field(default_factory=set)
+    projects_by_name: Dict[str, int] = field(default_factory=dict)
+    # telegram_id / username в нижнем регистре → (id, telegram_id, display_name)
+    users_by_telegram_id: Dict[int, tuple] = field(default_factory=dict)
+    users_by_username: Dict[str, tuple] = field(default_factory=dict)
+
+    @classmethod
+    async def load(cls, session) -> "ImportLookups":
+        lookups = cls()
+        for project in (await session.execute(select(Project))).scalars():
+            lookups.project_ids.add(project.id)
+            lookups.projects_by_name[project.name.strip().lower()] = project.id
+        for user in (await session.execute(select(TelegramUser))).scalars():
+            entry = (user.id, user.telegram_id, user.display_name)
+            lookups.users_by_telegram_id[user.telegram_id] = entry
+            if user.username:
+                lookups.users_by_username[user.username.lower()] = entry
+        return lookups
+
+
+def _text(raw: dict, name: str, max_length: Optional[int] = None) -> Optional[str]:
+    value = raw.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    if max_length and len(value) > max_length:
+        raise RowRejected(f"{name} longer than {max_length} characters")
+    return value
+
+
+def _datetime(raw: dict, name: str) -> Optional[datetime]:
+    value = _text(raw, name)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise RowRejected(f"{name} is not an ISO 8601 date: {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _project_id(raw: dict, lookups: ImportLookups) -> Optional[int]:
+    project_id = _text(raw, "project_id")
+    if project_id is not None:
+        if not project_id.isdigit() or int(project_id) not in lookups.project_ids:
+            raise RowRejected(f"unknown project_id {project_id}")
+        return int(project_id)
+    name = _text(raw, "project")
+    if name is None:
+        return None
+    if name.lower() not in lookups.projects_by_name:
+        raise RowRejected(f"unknown project {name!r}")
+    return lookups.projects_by_name[name.lower()]
+
+
+def _assignee(raw: dict, lookups: ImportLookups) -> tuple:
+    """(assignee_id, assignee_telegram_id, assignee_name) по полю assignee.
+
+    assignee — telegram id или @username известного пользователя;
+    без него assignee_name сохраняется как есть, без привязки.
+    """
+    value = _text(raw, "assignee")
+    if value is None:
+        return None, None, _text(raw, "assignee_name", 100)
+    if value.lstrip("-").isdigit():
+        entry = lookups.users_by_telegram_id.get(int(value))
+    else:
+        entry = lookups.users_by_username.get(value.lstrip("@").lower())
+    if entry is None:
+        raise RowRejected(f"unknown assignee {value!r}")
+    return entry
+
+
+def parse_row(raw: Union[dict, str], lookups: ImportLookups, now: datetime) -> dict:
+    """Строка входа → значения колонок tasks. RowRejected — строку пропустить."""
+    if not isinstance(raw, dict):
+        raise RowRejected("malformed row" if isinstance(raw, str) else "row is not an object")
+    title = _text(raw, "title", 255)
+    if title is None:
+        raise RowRejected("title is required")
+    status = (_text(raw, "status") or TaskStatus.TODO.value).upper()
+    if status not in TaskStatus.__members__:
+        raise RowRejected(f"unknown status {status!r}")
+
+    created_at = _datetime(raw, "created_at") or now
+    started_at = _datetime(raw, "started_at")
+    completed_at = _datetime(raw, "completed_at")
+    for name, value in (("started_at", started_at), ("completed_at", completed_at)):
+        if value is not None and value < created_at:
+            raise RowRejected(f"{name} is before created_at")
+    if status == TaskStatus.TODO.value:
+        started_at = completed_at = None
+    elif status != TaskStatus.DONE.value:
+        completed_at = None
+
+    assignee_id, assignee_telegram_id, assignee_name = _assignee(raw, lookups)
+    return {
+        "title": title,
+        "description": _text(raw, "description"),
+        "definition_of_done": _text(raw, "definition_of_done"),
+        "status": status,
+        "project_id": _project_id(raw, lookups),
+        "assignee_id": assignee_id,
+        "assignee_telegram_id": assignee_telegram_id,
+        "assignee_name": assignee_name,
+        "due_date": _datetime(raw, "due_date"),
+        "source": TaskSource.IMPORT.value,
+        "created_at": created_at,
+        # updated_at — момент импорта, иначе delta sync не увидит задачи
+        "updated_at": now,
+        "started_at": started_at,
+        "completed_at": completed_at,
+    }
+
+
+# ============= PIPELINE =============
+
+@dataclass
+class ImportReport:
+    """Итог (и текущий прогресс) импорта."""
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+
+
+class TaskImporter:
+    """Проверка строк и пакетная вставка.
+
+    on_reject(line_no, raw, error) — для каждой отклонённой строки,
+    on_progress(report) — после каждой вставленной пачки.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        on_reject: Optional[Callable[[int, Union[dict, str], str], None]] = None,
+        on_progress: Optional[Callable[[ImportReport], None]] = None,
+    ):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.on_reject = on_reject
+        self.on_progress = on_progress
+        self.report = ImportReport()
+
+    async def run(self, records: AsyncIterable[Record]) -> ImportReport:
+        async with AsyncSessionLocal() as session:
+            lookups = await ImportLookups.load(session)
+        now = datetime.utcnow()
+        batch: List[dict] = []
+        async for line_no, raw in records:
+            self.report.read += 1
+            try:
+                batch.append(parse_row(raw, lookups, now))
+            except RowRejected as e:
+                self.report.rejected += 1
+                if self.on_reject:
+                    self.on_reject(line_no, raw, str(e))
+                continue
+            if len(batch) >= self.batch_size:
+                await self._insert(batch)
+                batch = []
+        if batch:
+            await self._insert(batch)
+        logger.info("tasks_imported", read=self.report.read, imported=self.report.imported,
+                    rejected=self.report.rejected)
+        return self.report
+
+    async def _insert(self, batch: List[dict]) -> None:
+        task_ids = await run_write(lambda session: TaskService(session).import_tasks(batch))
+        self.report.imported += len(task_ids)
+        if self.on_progress:
+            self.on_progress(self.report)
@@ -0,0 +1,64 @@
+"""Meeting service."""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.models import Meeting
+from app.domain.events import MeetingRecorded, MeetingUpdated, MeetingDeleted
+from app.repositories.meeting_repository import MeetingRepository
+from app.core.event_bus import record_event
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MeetingService:
+    """Service for meeting operations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = MeetingRepository(session)
+
+    async def record_meeting(self, summary: str, meeting_date: Optional[datetime] = None) -> Meeting:
+        """Зафиксировать встречу."""
+        meeting = await self.repository.create(Meeting(
+            meeting_date=meeting_date or datetime.utcnow(),
+            summary=summary,
+        ))
+        record_event(self.session, MeetingRecorded(
+            occurred_at=datetime.utcnow(),
+            meeting_id=meeting.id,
+            meeting_date=meeting.meeting_date,
+            summary=meeting.summary,
+        ))
+        logger.info("meeting_recorded", meeting_id=meeting.id)
+        return meeting
+
+    async def update_meeting(
+        self,
+        meeting_id: int,
+        summary: Optional[str] = None,
+        meeting_date: Optional[datetime] = None,
+    ) -> Optional[Meeting]:
+        """Изменить встречу. None — встречи нет."""
+        meeting = await self.repository.get_by_id(meeting_id)
+        if not meeting:
+            return None
+        if summary is not None:
+            meeting.summary = summary
+        if meeting_date is not None:
+            meeting.meeting_date = meeting_date
+        await self.session.flush()
+        record_event(self.session, MeetingUpdated(occurred_at=datetime.utcnow(), meeting_id=meeting_id))
+        return meeting
+
+    async def delete_meeting(self, meeting_id: int) -> bool:
+        """Удалить встречу."""
+        if not await self.repository.delete(meeting_id):
+            return False
+        record_event(self.session, MeetingDeleted(occurred_at=datetime.utcnow(), meeting_id=meeting_id))
+        logger.info("meeting_deleted", meeting_id=meeting_id)
+        return True
+
+    async def get_recent(self, days: int = 30) -> List[Meeting]:
+        """Встречи за последние days дней."""
+        return await self.repository.get_recent(days=days)
@@ -0,0 +1,90 @@
+"""Pending suggestions: сообщения чата, для которых бот предложил создать задачу.
+
+Ключ — (chat_id, message_id): message_id уникален только внутри чата.
+В памяти бота не больше PENDING_SUGGESTIONS_MAX предложений (лишние
+вытесняются давно не тронутые), каждое живёт PENDING_SUGGESTION_TTL_HOURS.
+
+При PENDING_SUGGESTIONS_PERSIST предложение ещё и пишется в таблицу
+pending_suggestions: кнопки работают после перезапуска бота и для
+вытесненных из памяти предложений. Подтверждение удаляет строку через
+DELETE ... RETURNING — задача создаётся не больше одного раза, даже если
+«Создать» нажали дважды. Просроченное удаляет sweep_pending_suggestions
+в планировщике бота.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from app.config import settings
+from app.core.logging import get_logger
+from app.core.lru import TTLCache
+from app.core.write_queue import run_write
+from app.repositories.suggestion_repository import SuggestionRepository
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    text: str
+    from_user_id: Optional[int]
+
+
+class PendingSuggestions:
+    """Ограниченное хранилище предложений с копией в базе."""
+
+    def __init__(self, maxsize: int, ttl: float, persist: bool):
+        self._memory: TTLCache[Tuple[int, int], Suggestion] = TTLCache(maxsize, ttl)
+        self.ttl = ttl
+        self.persist = persist
+
+    async def add(self, chat_id: int, message_id: int, text: str, from_user_id: Optional[int]) -> None:
+        suggestion = Suggestion(text, from_user_id)
+        if self.persist:
+            expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+            await run_write(lambda session: SuggestionRepository(session).add(
+                chat_id, message_id, text, from_user_id, expires_at))
+        self._memory.set((chat_id, message_id), suggestion)
+
+    async def take(self, chat_id: int, message_id: int) -> Optional[Suggestion]:
+        """Забрать предложение для подтверждения; None — истекло или уже забрано."""
+        suggestion = self._memory.pop((chat_id, message_id))
+        if not self.persist:
+            return suggestion
+        # Удаление из памяти и постановка в очередь записи — без await между
+        # ними: параллельный take, не нашедший записи в памяти, встанет в
+        # очередь следом и строки в базе уже не найдёт.
+        row = await run_write(lambda session: SuggestionRepository(session).take(
+            chat_id, message_id, datetime.utcnow()))
+        if suggestion is None and row is not None:
+            suggestion = Suggestion(row.text, row.from_user_id)
+        return suggestion
+
+    async def discard(self, chat_id: int, message_id: int) -> None:
+        await self.take(chat_id, message_id)
+
+    async def sweep(self) -> int:
+        """Удалить просроченные предложения из памяти и из базы."""
+        removed = self._memory.purge()
+        if self.persist:
+            # Строки в базе — полный набор, память — его часть
+            now = datetime.utcnow()
+            removed = await run_write(lambda session: SuggestionRepository(session).delete_expired(now))
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+pending_suggestions = PendingSuggestions(
+    settings.PENDING_SUGGESTIONS_MAX,
+    settings.PENDING_SUGGESTION_TTL_HOURS * 60 * 60,
+    settings.PENDING_SUGGESTIONS_PERSIST,
+)
+
+
+async def sweep_pending_suggestions() -> int:
+    """Фоновая задача: удалить просроченные предложения создать задачу."""
+    removed = await pending_suggestions.sweep()
+    if removed:
+        logger.info("pending_suggestions_swept", count=removed, in_memory=len(pending_suggestions))
+    return removed
@@ -1,23 +1,122 @@
 """Task service with business logic."""
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple, Iterable
 from datetime import datetime
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.sql import ClauseElement
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.domain.models import Task, Blocker
-from app.domain.enums import TaskStatus, TaskSource
-from app.domain.events import TaskCreated, TaskStatusChanged, TaskBlocked
-from app.repositories.task_repository import TaskRepository
+from app.domain.models import Task, Blocker, TaskEvent
+from app.domain.enums import TaskStatus, TaskSource, TaskEventType
+from app.domain.events import (
+    TaskCreated, TaskStatusChanged, TaskBlocked, TaskUnblocked, TaskAssigned,
+    TaskMoved, TaskUpdated, TaskDeleted, TasksBulkChanged, TasksImported,
+)
+from app.core.cache import TASKS, detached, query_cache
+from app.core.event_bus import record_event
+from app.repositories.task_repository import TaskRepository, TaskListRow
+from app.repositories.counter_repository import CounterRepository, CounterKey, counter_key
+from app.repositories.task_event_repository import TaskEventRepository, seed_events
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.flow_repository import FlowRepository, FlowSample, flow_sample
 from app.core.logging import get_logger
 from app.core.clock import Clock
 
 logger = get_logger(__name__)
 
+# Сколько id передавать в одном IN (...) — ниже лимита переменных SQLite
+BULK_CHUNK_SIZE = 500
+
+
+def _chunks(ids: List[int], size: int = BULK_CHUNK_SIZE) -> Iterable[List[int]]:
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def _key(task: Task) -> CounterKey:
+    return counter_key(task.project_id, task.assignee_id, task.status)
+
+
+def _sample(task: Task) -> Optional[FlowSample]:
+    """Завершение задачи в flow_daily (None — задача сейчас не учтена)."""
+    if task.status != TaskStatus.DONE.value or not task.completed_at:
+        return None
+    return flow_sample(task.project_id, task.assignee_id, task.created_at, task.started_at, task.completed_at)
+
+
+# Колонки, от которых зависит ключ или наличие завершения в flow_daily
+_FLOW_COLUMNS = {"status", "project_id", "assignee_id"}
+
+
+# Какие колонки bulk-UPDATE попадают в историю
+_BULK_HISTORY = {
+    "status": (TaskEventType.STATUS_CHANGED, Task.status),
+    "assignee_telegram_id": (TaskEventType.ASSIGNED, Task.assignee_telegram_id),
+    "project_id": (TaskEventType.MOVED, Task.project_id),
+}
+
+
+def status_durations(events: List[TaskEvent], now: datetime) -> Dict[str, int]:
+    """Сколько секунд задача провела в каждом статусе по её истории.
+
+    Время в текущем статусе считается до now, кроме DONE.
+    """
+    durations: Dict[str, int] = {}
+    current, since = None, None
+    for event in events:
+        if event.event_type not in (TaskEventType.CREATED.value, TaskEventType.STATUS_CHANGED.value,
+                                    TaskEventType.BLOCKED.value):
+            continue
+        if current is not None:
+            durations[current] = durations.get(current, 0) + int((event.occurred_at - since).total_seconds())
+        current, since = event.new_value, event.occurred_at
+    if current is not None and current != TaskStatus.DONE.value:
+        durations[current] = durations.get(current, 0) + int((now - since).total_seconds())
+    return durations
+
 
 class TaskService:
-    """Service for task operations."""
+    """Service for task operations.
+
+    Все изменения задач, влияющие на проект, исполнителя или статус,
+    проходят через этот сервис — он же поддерживает task_counters
+    в той же транзакции.
+    """
     
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repository = TaskRepository(session)
+        self.counters = CounterRepository(session)
+        self.history = TaskEventRepository(session)
+        self.flow = FlowRepository(session)
+
+    async def _move_counter(self, before: Optional[CounterKey], after: Optional[CounterKey]) -> None:
+        """Перенести задачу между счётчиками (None — задачи нет / больше нет)."""
+        if before == after:
+            return
+        deltas = {}
+        if before:
+            deltas[before] = deltas.get(before, 0) - 1
+        if after:
+            deltas[after] = deltas.get(after, 0) + 1
+        await self.counters.adjust(deltas)
+
+    async def _move_flow(self, before: Optional[FlowSample], after: Optional[FlowSample]) -> None:
+        """Перенести завершение между роллапами flow_daily (как _move_counter)."""
+        if before == after:
+            return
+        if before:
+            await self.flow.apply([before], sign=-1)
+        if after:
+            await self.flow.apply([after])
+
+    def _emit(self, event) -> None:
+        """Доменное событие — публикуется после COMMIT."""
+        record_event(self.session, event)
+
+    async def _get_or_raise(self, task_id: int) -> Task:
+        task = await self.repository.get_by_id(task_id)
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
+        return task
     
     async def create_task(
         self,
@@ -30,12 +129,14 @@ class TaskService:
         source: TaskSource = TaskSource.MANUAL_COMMAND,
         source_message_id: Optional[int] = None,
         source_chat_id: Optional[int] = None,
+        project_id: Optional[int] = None,
     ) -> Task:
         """Create new task."""
         
         task = Task(
             title=title,
             description=description,
+            project_id=project_id,
             assignee_name=assignee_name,
             assignee_telegram_id=assignee_telegram_id,
             status=TaskStatus.TODO.value,
@@ -47,8 +148,18 @@ class TaskService:
         )
         
         task = await self.repository.create(task)
+        await self._move_counter(None, _key(task))
+        self.history.add(task.id, TaskEventType.CREATED, new_value=task.status, occurred_at=task.created_at)
         
-        # Log event
+        self._emit(TaskCreated(
+            occurred_at=datetime.utcnow(),
+            task_id=task.id,
+            title=task.title,
+            assignee_name=task.assignee_name,
+            source=task.source,
+            project_id=task.project_id,
+            assignee_telegram_id=task.assignee_telegram_id,
+        ))
         logger.info("task_created", task_id=task.id, title=task.title, source=source.value)
         
         return task
@@ -61,11 +172,11 @@ class TaskService:
     ) -> Task:
         """Change task status."""
         
-        task = await self.repository.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        task = await self._get_or_raise(task_id)
+        before = _key(task)
         
         old_status = TaskStatus(task.status)
+        completed = _sample(task)
         task.status = new_status.value
 
         now = datetime.utcnow()
@@ -78,6 +189,29 @@ class TaskService:
             task.completed_at = None
 
         task = await self.repository.update(task)
+        await self._move_counter(before, _key(task))
+        await self._move_flow(completed, _sample(task))
+
+        if old_status != new_status:
+            self.history.add(task_id, TaskEventType.STATUS_CHANGED, old_status, new_status,
+                             actor_telegram_id=changed_by, occurred_at=now)
+            self._emit(TaskStatusChanged(
+                occurred_at=now,
+                task_id=task_id,
+                old_status=old_status,
+                new_status=new_status,
+                changed_by=changed_by,
+                project_id=task.project_id,
+                assignee_telegram_id=task.assignee_telegram_id,
+            ))
+            if old_status == TaskStatus.BLOCKED:
+                self._emit(TaskUnblocked(
+                    occurred_at=now,
+                    task_id=task_id,
+                    unblocked_by=changed_by,
+                    project_id=task.project_id,
+                    assignee_telegram_id=task.assignee_telegram_id,
+                ))
         
         logger.info(
             "task_status_changed",
@@ -96,9 +230,10 @@ class TaskService:
     ) -> Task:
         """Block task with reason."""
         
-        task = await self.repository.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        task = await self._get_or_raise(task_id)
+        before = _key(task)
+        completed = _sample(task)
+        old_status = task.status
         
         # Change status to BLOCKED
         task.status = TaskStatus.BLOCKED.value
@@ -112,7 +247,19 @@ class TaskService:
         task.blockers.append(blocker)
         
         task = await self.repository.update(task)
-        
+        await self._move_counter(before, _key(task))
+        await self._move_flow(completed, None)
+
+        self.history.add(task_id, TaskEventType.BLOCKED, old_status, TaskStatus.BLOCKED,
+                         details=blocker_text, actor_telegram_id=blocked_by)
+        self._emit(TaskBlocked(
+            occurred_at=datetime.utcnow(),
+            task_id=task_id,
+            blocker_text=blocker_text,
+            blocked_by=blocked_by,
+            project_id=task.project_id,
+            assignee_telegram_id=task.assignee_telegram_id,
+        ))
         logger.info("task_blocked", task_id=task_id, blocker_text=blocker_text)
         
         return task
@@ -123,36 +270,154 @@ class TaskService:
     
     async def assign_task(self, task_id: int, user) -> "Task":
         """Назначить задачу пользователю."""
-        task = await self.repository.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        task = await self._get_or_raise(task_id)
+        before = _key(task)
+        completed = _sample(task)
+        previous = task.assignee_telegram_id
 
         task.assignee_id = user.id
         task.assignee_telegram_id = user.telegram_id
         task.assignee_name = user.display_name
 
         task = await self.repository.update(task)
+        await self._move_counter(before, _key(task))
+        await self._move_flow(completed, _sample(task))
+        self._emit_assigned(task, previous)
         logger.info("task_assigned", task_id=task_id, assignee=user.display_name)
         return task
 
+    async def unassign_task(self, task_id: int) -> Task:
+        """Снять исполнителя с задачи."""
+        task = await self._get_or_raise(task_id)
+        before = _key(task)
+        completed = _sample(task)
+        previous = task.assignee_telegram_id
+
+        task.assignee_id = None
+        task.assignee_telegram_id = None
+        task.assignee_name = None
+
+        task = await self.repository.update(task)
+        await self._move_counter(before, _key(task))
+        await self._move_flow(completed, _sample(task))
+        self._emit_assigned(task, previous)
+        logger.info("task_unassigned", task_id=task_id)
+        return task
+
+    async def move_to_project(self, task_id: int, project_id: Optional[int]) -> Task:
+        """Перенести задачу в проект (None — убрать из проекта)."""
+        task = await self._get_or_raise(task_id)
+        before = _key(task)
+        completed = _sample(task)
+        previous = task.project_id
+
+        task.project_id = project_id
+
+        task = await self.repository.update(task)
+        await self._move_counter(before, _key(task))
+        await self._move_flow(completed, _sample(task))
+        if previous != project_id:
+            self.history.add(task_id, TaskEventType.MOVED, previous, project_id)
+            self._emit(TaskMoved(
+                occurred_at=datetime.utcnow(),
+                task_id=task_id,
+                project_id=project_id,
+                previous_project_id=previous,
+                assignee_telegram_id=task.assignee_telegram_id,
+            ))
+        logger.info("task_moved_to_project", task_id=task_id, project_id=project_id)
+        return task
+
+    async def delete_task(self, task_id: int) -> bool:
+        """Удалить задачу вместе с блокерами."""
+        task = await self.repository.get_by_id(task_id)
+        if not task:
+            return False
+
+        before = _key(task)
+        completed = _sample(task)
+        event = TaskDeleted(
+            occurred_at=datetime.utcnow(),
+            task_id=task_id,
+            project_id=task.project_id,
+            assignee_telegram_id=task.assignee_telegram_id,
+        )
+        await self.repository.delete(task_id)
+        await self.history.delete_for_task(task_id)
+        await self._move_counter(before, None)
+        # Удалённая задача пропадает и из flow_daily (архивные остаются)
+        await self._move_flow(completed, None)
+        self._emit(event)
+        logger.info("task_deleted", task_id=task_id)
+        return True
+
+    def _emit_assigned(self, task: Task, previous: Optional[int]) -> None:
+        """История и событие смены исполнителя."""
+        if previous == task.assignee_telegram_id:
+            return
+        self.history.add(task.id, TaskEventType.ASSIGNED, previous, task.assignee_telegram_id,
+                         details=task.assignee_name)
+        self._emit(TaskAssigned(
+            occurred_at=datetime.utcnow(),
+            task_id=task.id,
+            assignee_telegram_id=task.assignee_telegram_id,
+            assignee_name=task.assignee_name,
+            previous_assignee_telegram_id=previous,
+            project_id=task.project_id,
+        ))
+
     async def take_task(self, task_id: int, user) -> "Task":
         """Взять задачу себе и перевести в DOING."""
         task = await self.assign_task(task_id, user)
         if task.status == TaskStatus.TODO.value:
-            task.status = TaskStatus.DOING.value
-            if not task.started_at:
-                task.started_at = datetime.utcnow()
-            task = await self.repository.update(task)
+            task = await self.change_status(task_id, TaskStatus.DOING)
         return task
 
-    async def get_all_tasks(
+    async def get_tasks_page(
         self,
+        limit: int,
+        cursor: Optional[str] = None,
         status: Optional[TaskStatus] = None,
         assignee_telegram_id: Optional[int] = None
-    ) -> List[Task]:
-        """Get all tasks with filters."""
-        return await self.repository.get_all(status, assignee_telegram_id)
-    
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get one page of tasks and the cursor of the next page.
+
+        Первая страница (её перечитывает доска после каждого события)
+        кэшируется до следующей записи задач; дальние — нет.
+        """
+        async def load():
+            tasks, next_cursor = await self.repository.get_page(limit, cursor, status, assignee_telegram_id)
+            return detached(self.session, tasks, "assignee"), next_cursor
+
+        if cursor:
+            return await self.repository.get_page(limit, cursor, status, assignee_telegram_id)
+        return await query_cache.get_or_load(TASKS, ("first_page", limit, status, assignee_telegram_id), load)
+
+    async def get_task_rows(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee_telegram_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        without_project: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        backward: bool = False,
+    ) -> Tuple[List[TaskListRow], Optional[str]]:
+        """Get compact rows for list views (no ORM objects)."""
+        return await self.repository.get_list_rows(
+            status, assignee_telegram_id, project_id, without_project, limit, cursor, backward
+        )
+
+    async def get_history(self, task_id: int) -> Optional[List[TaskEvent]]:
+        """История задачи по времени (горячей или архивной). None — задачи нет."""
+        events = await self.history.get_timeline(task_id)
+        if events:
+            return events
+        exists = await self.session.execute(select(Task.id).where(Task.id == task_id))
+        if exists.first() or await ArchiveRepository(self.session).get_by_id(task_id):
+            return events
+        return None
+
     async def get_week_tasks(self) -> List[Task]:
         """Get tasks for current week."""
         return await self.repository.get_week_tasks()
@@ -169,9 +434,7 @@ class TaskService:
     ) -> Task:
         """Update task fields."""
         
-        task = await self.repository.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        task = await self._get_or_raise(task_id)
         
         if title is not None:
             task.title = title
@@ -187,7 +450,256 @@ class TaskService:
             task.definition_of_done = definition_of_done
         
         task = await self.repository.update(task)
-        
+
+        self._emit(TaskUpdated(
+            occurred_at=datetime.utcnow(),
+            task_id=task_id,
+            project_id=task.project_id,
+            assignee_telegram_id=task.assignee_telegram_id,
+        ))
         logger.info("task_updated", task_id=task_id)
         
         return task
+
+    # ============= BULK =============
+
+    async def _existing_ids(self, task_ids: List[int]) -> List[int]:
+        """Какие из task_ids существуют (в исходном порядке, без дублей)."""
+        task_ids = list(dict.fromkeys(task_ids))
+        found = set()
+        for chunk in _chunks(task_ids):
+            result = await self.session.execute(select(Task.id).where(Task.id.in_(chunk)))
+            found.update(result.scalars().all())
+        return [task_id for task_id in task_ids if task_id in found]
+
+    async def _count_keys(self, task_ids: List[int]) -> dict:
+        """Сколько задач из task_ids приходится на каждый ключ счётчика."""
+        project_id = func.coalesce(Task.project_id, 0)
+        assignee_id = func.coalesce(Task.assignee_id, 0)
+        result = await self.session.execute(
+            select(project_id, assignee_id, Task.status, func.count())
+            .where(Task.id.in_(task_ids))
+            .group_by(project_id, assignee_id, Task.status)
+        )
+        return {(row[0], row[1], row[2]): row[3] for row in result.all()}
+
+    async def _done_samples(self, task_ids: List[int]) -> List[FlowSample]:
+        """Завершения задач task_ids, учтённые в flow_daily."""
+        result = await self.session.execute(
+            select(Task.project_id, Task.assignee_id, Task.created_at, Task.started_at, Task.completed_at)
+            .where(
+                Task.id.in_(task_ids),
+                Task.status == TaskStatus.DONE.value,
+                Task.completed_at.isnot(None),
+            )
+        )
+        return [flow_sample(*row) for row in result.all()]
+
+    async def _bulk_update(self, task_ids: List[int], values: dict) -> List[int]:
+        """Один UPDATE ... WHERE id IN (...) на пачку. Возвращает обновлённые id.
+
+        Счётчики переносятся по группировке до и после UPDATE — двумя
+        GROUP BY на пачку, без загрузки задач. Объекты Task в этой сессии
+        не синхронизируются — bulk-методы рассчитаны на отдельную сессию.
+        """
+        task_ids = await self._existing_ids(task_ids)
+        now = datetime.utcnow()
+        # flow_daily: вычесть завершения до UPDATE и добавить те, что есть после —
+        # смена статуса, проекта или исполнителя меняет ключ роллапа
+        moves_flow = bool(_FLOW_COLUMNS & values.keys())
+        for chunk in _chunks(task_ids):
+            deltas = {key: -count for key, count in (await self._count_keys(chunk)).items()}
+            for name, (event_type, column) in _BULK_HISTORY.items():
+                if name in values:
+                    details = values.get("assignee_name") if event_type == TaskEventType.ASSIGNED else None
+                    await self.history.add_bulk_change(chunk, event_type, column, values[name], now, details)
+            if moves_flow:
+                await self.flow.apply(await self._done_samples(chunk), sign=-1)
+            await self.session.execute(
+                update(Task)
+                .where(Task.id.in_(chunk))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if moves_flow:
+                await self.flow.apply(await self._done_samples(chunk))
+            for key, count in (await self._count_keys(chunk)).items():
+                deltas[key] = deltas.get(key, 0) + count
+            await self.counters.adjust(deltas)
+        if task_ids:
+            # SQL-выражения (coalesce для started_at) подписчикам не передаём
+            changes = {name: value for name, value in values.items() if not isinstance(value, ClauseElement)}
+            self._emit(TasksBulkChanged(occurred_at=now, task_ids=task_ids, changes=changes))
+        return task_ids
+
+    async def bulk_create(self, items: List[dict]) -> List[Task]:
+        """Создать несколько задач одним flush.
+
+        items — словари с полями create_task (title обязателен).
+        """
+        tasks = [
+            Task(
+                title=item["title"],
+                description=item.get("description"),
+                project_id=item.get("project_id"),
+                assignee_id=item.get("assignee_id"),
+                assignee_name=item.get("assignee_name"),
+                assignee_telegram_id=item.get("assignee_telegram_id"),
+                status=TaskStatus.TODO.value,
+                due_date=item.get("due_date"),
+                source=item.get("source", TaskSource.MANUAL_COMMAND).value,
+            )
+            for item in items
+        ]
+        self.session.add_all(tasks)
+        await self.session.flush()
+
+        deltas = {}
+        for task in tasks:
+            deltas[_key(task)] = deltas.get(_key(task), 0) + 1
+        await self.counters.adjust(deltas)
+        now = datetime.utcnow()
+        for task in tasks:
+            self.history.add(task.id, TaskEventType.CREATED, new_value=task.status, occurred_at=task.created_at)
+            self._emit(TaskCreated(
+                occurred_at=now,
+                task_id=task.id,
+                title=task.title,
+                assignee_name=task.assignee_name,
+                source=task.source,
+                project_id=task.project_id,
+                assignee_telegram_id=task.assignee_telegram_id,
+            ))
+        logger.info("tasks_bulk_created", count=len(tasks))
+        return tasks
+
+    async def import_tasks(self, rows: List[dict]) -> List[int]:
+        """Вставить проверенные строки импорта одним executemany. Возвращает id.
+
+        rows — значения колонок tasks, у всех строк одинаковый набор ключей.
+        История восстанавливается по датам задачи, завершённые попадают в
+        flow_daily; одно событие TasksImported на пачку.
+        """
+        if not rows:
+            return []
+        # INSERT по таблице, а не по модели: ORM bulk insert дробит executemany
+        # по набору NULL-колонок. RETURNING отдаёт нужные колонки вместе с id,
+        # порядок строк не важен (sort_by_parameter_order на SQLite — построчные INSERT)
+        result = await self.session.execute(
+            insert(Task.__table__).returning(
+                Task.id, Task.status, Task.project_id, Task.assignee_id,
+                Task.created_at, Task.started_at, Task.completed_at, Task.updated_at,
+            ),
+            rows,
+        )
+        inserted = result.all()
+
+        deltas, history, samples = {}, [], []
+        for task in inserted:
+            key = counter_key(task.project_id, task.assignee_id, task.status)
+            deltas[key] = deltas.get(key, 0) + 1
+            history.extend(seed_events(
+                task.id, task.status, task.created_at, task.started_at, task.completed_at, task.updated_at,
+            ))
+            if task.status == TaskStatus.DONE.value and task.completed_at:
+                samples.append(flow_sample(
+                    task.project_id, task.assignee_id, task.created_at, task.started_at, task.completed_at,
+                ))
+        await self.counters.adjust(deltas)
+        await self.history.add_many(history)
+        await self.flow.apply(samples)
+        task_ids = sorted(task.id for task in inserted)
+        self._emit(TasksImported(occurred_at=datetime.utcnow(), task_ids=task_ids))
+        return task_ids
+
+    async def bulk_change_status(self, task_ids: List[int], new_status: TaskStatus) -> List[int]:
+        """Сменить статус у многих задач set-based UPDATE'ом.
+
+        Даты начала/завершения меняются по тем же правилам, что в change_status.
+        """
+        now = datetime.utcnow()
+        values = {"status": new_status.value}
+        if new_status == TaskStatus.DOING:
+            values["started_at"] = func.coalesce(Task.started_at, now)
+        elif new_status == TaskStatus.DONE:
+            values["completed_at"] = now
+        elif new_status == TaskStatus.TODO:
+            values["started_at"] = None
+            values["completed_at"] = None
+
+        updated = await self._bulk_update(task_ids, values)
+        logger.info("tasks_bulk_status_changed", count=len(updated), new_status=new_status.value)
+        return updated
+
+    async def bulk_assign(self, task_ids: List[int], user=None) -> List[int]:
+        """Назначить задачи пользователю (user=None — снять исполнителя)."""
+        updated = await self._bulk_update(task_ids, {
+            "assignee_id": user.id if user else None,
+            "assignee_telegram_id": user.telegram_id if user else None,
+            "assignee_name": user.display_name if user else None,
+        })
+        logger.info("tasks_bulk_assigned", count=len(updated), assignee=user.display_name if user else None)
+        return updated
+
+    async def bulk_move_to_project(self, task_ids: List[int], project_id: Optional[int]) -> List[int]:
+        """Перенести задачи в проект (None — убрать из проекта)."""
+        updated = await self._bulk_update(task_ids, {"project_id": project_id})
+        logger.info("tasks_bulk_moved", count=len(updated), project_id=project_id)
+        return updated
+
+    async def bulk_update(
+        self,
+        task_ids: List[int],
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> List[int]:
+        """Обновить текстовые поля у многих задач."""
+        values = {}
+        if title is not None:
+            values["title"] = title
+        if description is not None:
+            values["description"] = description
+        if not values:
+            return await self._existing_ids(task_ids)
+
+        updated = await self._bulk_update(task_ids, values)
+        logger.info("tasks_bulk_updated", count=len(updated))
+        return updated
+
+    async def bulk_update_each(self, items: List[dict]) -> List[int]:
+        """Обновить текстовые поля задач — у каждой свои значения.
+
+        items — словари {id, title, description}; None оставляет поле как
+        есть. Один executemany UPDATE по id на пачку. Возвращает найденные id.
+        """
+        values_by_id: Dict[int, dict] = {}
+        for item in items:
+            values_by_id.setdefault(item["id"], {}).update(
+                {name: item[name] for name in ("title", "description") if item.get(name) is not None}
+            )
+
+        now = datetime.utcnow()
+        updated = []
+        for chunk in _chunks(list(values_by_id)):
+            result = await self.session.execute(
+                select(Task.id, Task.project_id, Task.assignee_telegram_id).where(Task.id.in_(chunk))
+            )
+            found = {row.id: row for row in result.all()}
+            rows = [
+                {"id": task_id, "updated_at": now, **values_by_id[task_id]}
+                for task_id in chunk
+                if task_id in found and values_by_id[task_id]
+            ]
+            if rows:
+                await self.session.execute(update(Task), rows)
+            for row in rows:
+                task = found[row["id"]]
+                self._emit(TaskUpdated(
+                    occurred_at=now,
+                    task_id=task.id,
+                    project_id=task.project_id,
+                    assignee_telegram_id=task.assignee_telegram_id,
+                ))
+            updated += [task_id for task_id in chunk if task_id in found]
+        logger.info("tasks_bulk_updated", count=len(updated))
+        return updated
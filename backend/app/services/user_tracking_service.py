@@ -0,0 +1,88 @@
+"""User tracking: запись пользователей бота без UPSERT на каждое сообщение.
+
+Для каждого пользователя в памяти хранится «отпечаток» — (first_name,
+username, last_name), который уже есть в базе. Сообщение от известного
+пользователя с тем же отпечатком в базу не пишет; UPSERT (и событие
+UsersChanged) — только для новых пользователей и сменивших имя.
+Отпечатки живут в LRU на USER_TRACKING_CACHE_SIZE записей и
+USER_TRACKING_TTL_SECONDS; после промаха отпечаток сначала сверяется
+с базой чтением — перезапуск бота не вызывает волну записей.
+
+Время последней активности копится в памяти и пишется пачкой раз в
+LAST_SEEN_FLUSH_SECONDS (flush_last_seen в планировщике бота).
+"""
+from datetime import datetime
+from typing import Dict, List
+from app.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.lru import TTLCache
+from app.core.write_queue import run_write
+from app.repositories.user_repository import UserRepository
+
+logger = get_logger(__name__)
+
+
+def fingerprint(user: dict) -> tuple:
+    return user["first_name"], user.get("username"), user.get("last_name")
+
+
+class UserTracker:
+    """Отпечатки известных пользователей и буфер last_seen_at."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._known: TTLCache[int, tuple] = TTLCache(maxsize, ttl)
+        self._last_seen: Dict[int, datetime] = {}
+        self.skipped = 0
+        self.written = 0
+
+    async def track(self, users: List[dict]) -> None:
+        """Отметить активность и записать новых/изменившихся пользователей.
+
+        users — словари telegram_id, first_name, username, last_name.
+        """
+        now = datetime.utcnow()
+        for user in users:
+            self._last_seen[user["telegram_id"]] = now
+
+        unknown = [user for user in users if self._known.get(user["telegram_id"]) is None]
+        if unknown:
+            async with AsyncSessionLocal() as session:
+                stored = await UserRepository(session).get_names([user["telegram_id"] for user in unknown])
+            for telegram_id, names in stored.items():
+                self._known.set(telegram_id, names)
+
+        changed = [user for user in users if self._known.get(user["telegram_id"]) != fingerprint(user)]
+        self.skipped += len(users) - len(changed)
+        if not changed:
+            return
+        await run_write(lambda session: UserRepository(session).create_or_update_many(changed))
+        # Отпечаток — только после успешной записи, иначе повторим в следующий раз
+        for user in changed:
+            self._known.set(user["telegram_id"], fingerprint(user))
+        self.written += len(changed)
+
+    async def flush(self) -> int:
+        """Записать накопленные last_seen_at одной единицей записи."""
+        if not self._last_seen:
+            return 0
+        seen, self._last_seen = self._last_seen, {}
+        try:
+            await run_write(lambda session: UserRepository(session).touch_last_seen(seen))
+        except Exception:
+            # Вернуть в буфер, не затирая более свежие отметки
+            for telegram_id, at in seen.items():
+                self._last_seen.setdefault(telegram_id, at)
+            raise
+        self._known.purge()
+        logger.debug("last_seen_flushed", users=len(seen), upserts_skipped=self.skipped,
+                     upserts_written=self.written)
+        return len(seen)
+
+
+user_tracker = UserTracker(settings.USER_TRACKING_CACHE_SIZE, settings.USER_TRACKING_TTL_SECONDS)
+
+
+async def flush_last_seen() -> int:
+    """Фоновая задача: сбросить буфер активности в telegram_users.last_seen_at."""
+    return await user_tracker.flush()
@@ -6,6 +6,17 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from app.config import settings
 from app.core.logging import get_logger
+from app.core.write_queue import write_coordinator
+from app.core.event_bus import event_bus
+from app.core.outbox import outbox_relay, prune_outbox
+from app.core.cache import query_cache
+from app.core.scheduler import scheduler, PeriodicJob
+from app.core.backup import scheduled_backup
+from app.services.archive_service import archive_closed_tasks
+from app.services.change_service import prune_tombstones
+from app.services.analytics_service import snapshot_board
+from app.services.user_tracking_service import flush_last_seen
+from app.services.suggestion_service import sweep_pending_suggestions
 from app.telegram.middleware import UserTrackingMiddleware
 from app.telegram.handlers import (
     help_handlers,
@@ -14,6 +25,7 @@ from app.telegram.handlers import (
     meeting_handlers,
     digest_handlers,
     message_handlers,
+    search_handlers,
 )
 from app.telegram.handlers.tasks_list_handler import router as tasks_list_router
 
@@ -44,6 +56,7 @@ def setup_handlers():
     dp.include_router(week_handlers.router)
     dp.include_router(meeting_handlers.router)
     dp.include_router(digest_handlers.router)
+    dp.include_router(search_handlers.router)
 
     # Message handler (lowest priority)
     dp.include_router(message_handlers.router)
@@ -61,6 +74,7 @@ async def start_bot():
     await bot.set_my_commands([
         BotCommand(command="task",     description="Создать новую задачу"),
         BotCommand(command="tasks",    description="Список задач с фильтрами"),
+        BotCommand(command="find",     description="Поиск по задачам и встречам"),
         BotCommand(command="week",     description="Недельная доска"),
         BotCommand(command="meeting",  description="Зафиксировать встречу"),
         BotCommand(command="meetings", description="История встреч"),
@@ -69,9 +83,70 @@ async def start_bot():
         BotCommand(command="help",     description="Справка"),
     ])
 
+    # Фоновые задачи — только в процессе бота
+    scheduler.add(PeriodicJob(
+        name="archive_closed_tasks",
+        interval=settings.ARCHIVE_INTERVAL_MINUTES * 60,
+        run=archive_closed_tasks,
+        initial_delay=60,
+    ))
+    scheduler.add(PeriodicJob(
+        name="prune_tombstones",
+        interval=24 * 60 * 60,
+        run=prune_tombstones,
+        initial_delay=120,
+    ))
+    scheduler.add(PeriodicJob(
+        name="snapshot_board",
+        interval=60 * 60,
+        run=snapshot_board,
+        initial_delay=30,
+    ))
+    scheduler.add(PeriodicJob(
+        name="prune_outbox",
+        interval=10 * 60,
+        run=prune_outbox,
+        initial_delay=180,
+    ))
+    scheduler.add(PeriodicJob(
+        name="flush_last_seen",
+        interval=settings.LAST_SEEN_FLUSH_SECONDS,
+        run=flush_last_seen,
+        initial_delay=settings.LAST_SEEN_FLUSH_SECONDS,
+    ))
+    scheduler.add(PeriodicJob(
+        name="sweep_pending_suggestions",
+        interval=settings.PENDING_SUGGESTIONS_SWEEP_MINUTES * 60,
+        run=sweep_pending_suggestions,
+        initial_delay=90,
+    ))
+    if settings.BACKUP_INTERVAL_HOURS > 0:
+        scheduler.add(PeriodicJob(
+            name="scheduled_backup",
+            interval=settings.BACKUP_INTERVAL_HOURS * 60 * 60,
+            run=scheduled_backup,
+            initial_delay=300,
+        ))
+    scheduler.start()
+
+    # Кэш запросов сбрасывается по своим событиям и событиям API из outbox
+    cache_subscription = query_cache.subscribe(event_bus)
+    # События, записанные процессом API
+    relay = outbox_relay("bot")
+    relay.start()
+
     try:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
+        await relay.stop()
+        await scheduler.stop()
+        try:
+            await flush_last_seen()
+        except Exception as e:
+            logger.warning("last_seen_flush_failed", error=str(e))
+        await write_coordinator.close()
+        await event_bus.close()
+        event_bus.unsubscribe(cache_subscription)
         await bot.session.close()
 
 
@@ -62,6 +62,7 @@ async def cmd_help(message: Message):
         "*📝 Задачи:*\n"
         "• /task — создать новую задачу\n"
         "• /tasks — список задач с фильтрами\n"
+        "• /find <слова> — поиск по задачам, блокерам и встречам\n"
         "• /week — недельная доска\n\n"
         "*🤝 Встречи:*\n"
         "• /meeting — зафиксировать встречу\n"
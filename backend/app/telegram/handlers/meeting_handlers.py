@@ -4,10 +4,9 @@ from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from datetime import datetime
 from app.core.db import AsyncSessionLocal
-from app.domain.models import Meeting
-from app.repositories.meeting_repository import MeetingRepository
+from app.core.write_queue import run_write
+from app.services.meeting_service import MeetingService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -36,16 +35,7 @@ async def process_meeting_summary(message: Message, state: FSMContext):
     
     summary = message.text
     
-    async with AsyncSessionLocal() as session:
-        repo = MeetingRepository(session)
-        
-        meeting = Meeting(
-            meeting_date=datetime.utcnow(),
-            summary=summary
-        )
-        
-        meeting = await repo.create(meeting)
-        await session.commit()
+    meeting = await run_write(lambda session: MeetingService(session).record_meeting(summary))
     
     await message.answer(
         f"✅ Встреча зафиксирована!\n\n"
@@ -54,7 +44,6 @@ async def process_meeting_summary(message: Message, state: FSMContext):
     )
     
     await state.clear()
-    logger.info("meeting_recorded", meeting_id=meeting.id)
 
 
 @router.message(Command("meetings"))
@@ -62,8 +51,7 @@ async def cmd_meetings_list(message: Message):
     """Show recent meetings."""
     
     async with AsyncSessionLocal() as session:
-        repo = MeetingRepository(session)
-        meetings = await repo.get_recent(days=30)
+        meetings = await MeetingService(session).get_recent(days=30)
     
     if not meetings:
         await message.answer("📋 Встреч за последний месяц не было")
@@ -2,9 +2,10 @@
 import re
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
-from app.core.db import AsyncSessionLocal
+from app.core.write_queue import run_write
 from app.services.task_service import TaskService
 from app.repositories.user_repository import UserRepository
+from app.services.suggestion_service import pending_suggestions
 from app.domain.enums import TaskSource
 from app.telegram.keyboards.task_keyboards import get_confirmation_keyboard
 from app.core.logging import get_logger
@@ -113,10 +114,6 @@ def make_assign_keyboard(task_id: int, users: list) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-# Хранилище ожидающих подтверждения
-_pending = {}
-
-
 @router.message(F.text)
 async def handle_potential_task(message: Message):
     """Обработчик всех текстовых сообщений — детектирует задачи."""
@@ -127,46 +124,44 @@ async def handle_potential_task(message: Message):
     
     # Сохраняем в ожидании подтверждения
     msg_id = message.message_id
-    _pending[msg_id] = {
-        'text': text,
-        'chat_id': message.chat.id,
-        'from_user': message.from_user.id
-    }
+    await pending_suggestions.add(
+        message.chat.id, msg_id, text,
+        message.from_user.id if message.from_user else None,
+    )
     
     await message.reply(
         f"💡 Обнаружена задача!\n\n*Создать задачу?*\n_{extract_task_title(text)}_",
         reply_markup=get_confirmation_keyboard(msg_id),
         parse_mode="Markdown"
     )
-    logger.info("task_suggestion", message_id=msg_id)
+    logger.info("task_suggestion", chat_id=message.chat.id, message_id=msg_id)
 
 
 @router.callback_query(F.data.startswith("confirm_task:"))
 async def handle_confirm_task(callback: CallbackQuery, tg_user_id: int = 0):
     """Подтверждение создания задачи."""
     msg_id = int(callback.data.split(":")[1])
+    chat_id = callback.message.chat.id
     
-    if msg_id not in _pending:
+    pending = await pending_suggestions.take(chat_id, msg_id)
+    if pending is None:
         await callback.answer("⏱️ Время подтверждения истекло")
         return
     
-    pending = _pending.pop(msg_id)
-    title = extract_task_title(pending['text'])
+    title = extract_task_title(pending.text)
     
-    async with AsyncSessionLocal() as session:
-        service = TaskService(session)
-        task = await service.create_task(
+    async def create(session):
+        task = await TaskService(session).create_task(
             title=title,
-            source=TaskSource.AUTO_KEYWORD,
+            source=TaskSource.CHAT_MESSAGE,
             source_message_id=msg_id,
-            source_chat_id=pending['chat_id']
+            source_chat_id=chat_id
         )
-        
         # Получаем список пользователей для назначения
-        user_repo = UserRepository(session)
-        users = await user_repo.get_all()
-        
-        await session.commit()
+        users = await UserRepository(session).get_all()
+        return task, users
+
+    task, users = await run_write(create)
     
     await callback.message.edit_text(
         f"✅ *Задача создана!*\n\n#{task.id} {task.title}\n\n👤 Назначить исполнителя:",
@@ -181,7 +176,7 @@ async def handle_confirm_task(callback: CallbackQuery, tg_user_id: int = 0):
 async def handle_cancel_task(callback: CallbackQuery):
     """Отмена создания задачи."""
     msg_id = int(callback.data.split(":")[1])
-    _pending.pop(msg_id, None)
+    await pending_suggestions.discard(callback.message.chat.id, msg_id)
     
     await callback.message.edit_text("❌ Отменено")
     await callback.answer()
@@ -192,14 +187,13 @@ async def handle_self_assign(callback: CallbackQuery, tg_user_id: int = 0):
     """Взять задачу себе."""
     task_id = int(callback.data.split(":")[1])
     
-    async with AsyncSessionLocal() as session:
-        service = TaskService(session)
-        user_repo = UserRepository(session)
-        user = await user_repo.get_by_telegram_id(tg_user_id)
-        
+    async def take(session):
+        user = await UserRepository(session).get_by_telegram_id(tg_user_id)
         if user:
-            await service.take_task(task_id, user)
-            await session.commit()
+            await TaskService(session).take_task(task_id, user)
+        return user
+
+    user = await run_write(take)
     
     await callback.message.edit_text(
         f"✅ Задача #{task_id} взята в работу!\n👤 Исполнитель: {user.display_name}"
@@ -214,14 +208,13 @@ async def handle_assign_new(callback: CallbackQuery):
     task_id = int(parts[1])
     user_telegram_id = int(parts[2])
     
-    async with AsyncSessionLocal() as session:
-        service = TaskService(session)
-        user_repo = UserRepository(session)
-        user = await user_repo.get_by_telegram_id(user_telegram_id)
-        
+    async def assign(session):
+        user = await UserRepository(session).get_by_telegram_id(user_telegram_id)
         if user:
-            await service.assign_task(task_id, user)
-            await session.commit()
+            await TaskService(session).assign_task(task_id, user)
+        return user
+
+    user = await run_write(assign)
     
     await callback.message.edit_text(
         f"✅ Задача #{task_id} назначена!\n👤 Исполнитель: {user.display_name}"
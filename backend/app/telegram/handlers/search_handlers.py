@@ -0,0 +1,56 @@
+"""Команда /find — полнотекстовый поиск."""
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+from app.core.db import AsyncSessionLocal
+from app.repositories.search_repository import SearchRepository
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+router = Router()
+
+KIND_EMOJI = {"task": "📝", "blocker": "🚫", "meeting": "🤝"}
+MAX_RESULTS = 10
+
+
+@router.message(Command("find"))
+async def cmd_find(message: Message, command: CommandObject):
+    """Handle /find <query> - search tasks, blockers and meetings."""
+    query = (command.args or "").strip()
+    if not query:
+        await message.answer("🔎 Использование: /find <слова>\nНапример: /find отчёт квартал")
+        return
+
+    async with AsyncSessionLocal() as session:
+        hits = await SearchRepository(session).search(query, limit=MAX_RESULTS)
+
+    if not hits:
+        await message.answer(f"🔎 По запросу «{query}» ничего не найдено", parse_mode=None)
+        return
+
+    lines = [f"🔎 Найдено по запросу «{query}»:\n"]
+    buttons = []
+    seen_tasks = set()
+    for hit in hits:
+        emoji = KIND_EMOJI.get(hit.kind, "•")
+        if hit.kind == "meeting":
+            lines.append(f"{emoji} Встреча #{hit.id}: {hit.snippet}")
+        elif hit.kind == "blocker":
+            lines.append(f"{emoji} Блокер задачи #{hit.task_id} {hit.title}: {hit.snippet}")
+        else:
+            lines.append(f"{emoji} #{hit.id} {hit.title}")
+
+        if hit.task_id and hit.task_id not in seen_tasks:
+            seen_tasks.add(hit.task_id)
+            buttons.append([InlineKeyboardButton(
+                text=f"#{hit.task_id} {hit.title or ''}"[:60],
+                callback_data=f"task_detail:{hit.task_id}",
+            )])
+
+    # Сниппеты — пользовательский текст, Markdown в нём не экранирован
+    await message.answer(
+        "\n".join(lines),
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons) if buttons else None,
+        parse_mode=None,
+    )
+    logger.info("search_performed", results=len(hits))
@@ -4,7 +4,7 @@ from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from app.core.db import AsyncSessionLocal
+from app.core.write_queue import run_write
 from app.services.task_service import TaskService
 from app.domain.enums import TaskStatus, TaskSource
 from app.telegram.keyboards.task_keyboards import get_task_action_keyboard
@@ -82,14 +82,11 @@ async def handle_skip_description(callback: CallbackQuery, state: FSMContext):
     
     # Create task without description
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            task = await service.create_task(
-                title=title,
-                description=None,
-                source=TaskSource.MANUAL_COMMAND
-            )
-            await session.commit()
+        task = await run_write(lambda session: TaskService(session).create_task(
+            title=title,
+            description=None,
+            source=TaskSource.MANUAL_COMMAND
+        ))
         
         await callback.message.edit_text(
             f"✅ *Задача создана!*\n\n"
@@ -155,14 +152,11 @@ async def process_task_description(message: Message, state: FSMContext):
     description = message.text.strip() if message.text else None
     
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            task = await service.create_task(
-                title=title,
-                description=description,
-                source=TaskSource.MANUAL_COMMAND
-            )
-            await session.commit()
+        task = await run_write(lambda session: TaskService(session).create_task(
+            title=title,
+            description=description,
+            source=TaskSource.MANUAL_COMMAND
+        ))
         
         await message.answer(
             f"✅ *Задача создана!*\n\n"
@@ -200,31 +194,28 @@ async def handle_task_action(callback: CallbackQuery):
         task_id = int(parts[1])
         action = parts[2]
         
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
+        if action == "start":
+            new_status = TaskStatus.DOING
+            message_text = f"🔄 Задача #{task_id} в работе"
+            answer_text = "✅ Задача взята в работу"
             
-            if action == "start":
-                task = await service.change_status(task_id, TaskStatus.DOING)
-                message_text = f"🔄 Задача #{task.id} в работе"
-                answer_text = "✅ Задача взята в работу"
-                
-            elif action == "done":
-                task = await service.change_status(task_id, TaskStatus.DONE)
-                message_text = f"✅ Задача #{task.id} выполнена"
-                answer_text = "✅ Задача выполнена!"
-                
-            elif action == "block":
-                task = await service.change_status(task_id, TaskStatus.BLOCKED)
-                message_text = f"🚫 Задача #{task.id} заблокирована"
-                answer_text = "🚫 Задача заблокирована"
-            else:
-                try:
-                    await callback.answer("❌ Неизвестная команда")
-                except:
-                    pass
-                return
+        elif action == "done":
+            new_status = TaskStatus.DONE
+            message_text = f"✅ Задача #{task_id} выполнена"
+            answer_text = "✅ Задача выполнена!"
             
-            await session.commit()
+        elif action == "block":
+            new_status = TaskStatus.BLOCKED
+            message_text = f"🚫 Задача #{task_id} заблокирована"
+            answer_text = "🚫 Задача заблокирована"
+        else:
+            try:
+                await callback.answer("❌ Неизвестная команда")
+            except:
+                pass
+            return
+        
+        task = await run_write(lambda session: TaskService(session).change_status(task_id, new_status))
         
         try:
             await callback.answer(answer_text)
@@ -1,12 +1,23 @@
-"""Команда /tasks — список задач кнопками с деталями."""
+"""Команда /tasks — список задач кнопками с деталями.
+
+Страницы списка не хранятся в памяти: кнопки «Назад» / «Вперёд» несут
+в callback_data фильтр и позицию (created_at, id) крайней задачи
+страницы, и каждая страница — один запрос с LIMIT по индексу.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from app.core.db import AsyncSessionLocal
-from app.services.task_service import TaskService
+from app.core.pagination import encode_cursor, encode_short_cursor, decode_short_cursor
+from app.core.write_queue import run_write
+from app.services.task_service import TaskService, status_durations
+from app.repositories.task_repository import TaskListRow
+from app.repositories.counter_repository import CounterRepository
 from app.repositories.user_repository import UserRepository
-from app.domain.enums import TaskStatus
-from app.domain.models import TelegramUser
+from app.domain.enums import TaskStatus, TaskEventType
+from app.domain.models import TelegramUser, TaskEvent
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +25,9 @@ router = Router()
 
 STATUS_EMOJI = {"TODO": "📝", "DOING": "🔄", "DONE": "✅", "BLOCKED": "🚫"}
 
+# Задач на одной странице списка
+PAGE_SIZE = 8
+
 
 def tasks_list_keyboard(filter_status: str = "all", show_mine: bool = False, show_projects: bool = False) -> InlineKeyboardMarkup:
     """Фильтры для списка."""
@@ -41,28 +55,35 @@ def tasks_list_keyboard(filter_status: str = "all", show_mine: bool = False, sho
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def task_buttons_keyboard(tasks: list, page: int = 0, per_page: int = 8) -> InlineKeyboardMarkup:
-    """Список задач кнопками (до 8 на странице)."""
-    start = page * per_page
-    end = start + per_page
-    page_tasks = tasks[start:end]
-    
+def _page_callback(list_filter: str, page: int, direction: str, task: TaskListRow) -> str:
+    """tasks_page:{фильтр}:{страница}:{n|p}:{позиция задачи} — до 64 байт."""
+    return f"tasks_page:{list_filter}:{page}:{direction}:{encode_short_cursor(task.created_at, task.id)}"
+
+
+def task_buttons_keyboard(
+    tasks: list[TaskListRow],
+    list_filter: str = "all",
+    page: int = 1,
+    has_prev: bool = False,
+    has_next: bool = False,
+) -> InlineKeyboardMarkup:
+    """Страница списка задач кнопками (до PAGE_SIZE)."""
     buttons = []
-    for task in page_tasks:
+    for task in tasks:
         emoji = STATUS_EMOJI.get(task.status, "•")
-        assignee = f" → {task.assignee.display_name}" if task.assignee else ""
+        assignee = f" → {task.assignee_display_name}" if task.assignee_display_name else ""
         text = f"{emoji} #{task.id} {task.title[:30]}{assignee}"
         buttons.append([InlineKeyboardButton(text=text, callback_data=f"task_detail:{task.id}")])
-    
-    # Пагинация если > per_page
+
+    # «Назад» — страница перед первой задачей, «Вперёд» — после последней
     nav = []
-    if page > 0:
-        nav.append(InlineKeyboardButton(text="◀️ Назад", callback_data=f"tasks_page:{page-1}"))
-    if end < len(tasks):
-        nav.append(InlineKeyboardButton(text="Вперёд ▶️", callback_data=f"tasks_page:{page+1}"))
+    if has_prev:
+        nav.append(InlineKeyboardButton(text="◀️ Назад", callback_data=_page_callback(list_filter, page - 1, "p", tasks[0])))
+    if has_next:
+        nav.append(InlineKeyboardButton(text="Вперёд ▶️", callback_data=_page_callback(list_filter, page + 1, "n", tasks[-1])))
     if nav:
         buttons.append(nav)
-    
+
     buttons.append([InlineKeyboardButton(text="🔍 Фильтры", callback_data="show_filters")])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
@@ -101,7 +122,10 @@ def task_detail_keyboard(task_id: int, status: str, assignee_telegram_id: int =
     elif status == "DONE":
         buttons.append([InlineKeyboardButton(text="🔄 Переоткрыть", callback_data=f"task_status:{task_id}:TODO")])
 
-    buttons.append([InlineKeyboardButton(text="↩️ К списку", callback_data="tasks:all")])
+    buttons.append([
+        InlineKeyboardButton(text="📜 История", callback_data=f"task_history:{task_id}"),
+        InlineKeyboardButton(text="↩️ К списку", callback_data="tasks:all"),
+    ])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -117,8 +141,84 @@ def assign_keyboard(task_id: int, users: list[TelegramUser]) -> InlineKeyboardMa
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-# Кеш текущих задач в памяти (для пагинации)
-_task_cache = {}
+async def _list_filter_args(session, list_filter: str, tg_user_id: int) -> Optional[Tuple[dict, str]]:
+    """Фильтр списка (all, mine, статус, p{project_id}) → аргументы get_task_rows и заголовок.
+
+    None — проекта нет.
+    """
+    if list_filter == "mine":
+        return {"assignee_telegram_id": tg_user_id}, "👤 Мои задачи"
+    if list_filter in STATUS_EMOJI:
+        return {"status": TaskStatus(list_filter)}, f"{STATUS_EMOJI[list_filter]} {list_filter}"
+    if list_filter.startswith("p"):
+        project_id = int(list_filter[1:])
+        if project_id == 0:
+            return {"without_project": True}, "📋 Задачи без проекта"
+        from app.repositories.project_repository import ProjectRepository
+        repo = ProjectRepository(session)
+        # Активные проекты — из кэша, неактивный ищем в базе
+        project = next((p for p in await repo.get_all_active() if p.id == project_id), None)
+        project = project or await repo.get_by_id(project_id)
+        if not project:
+            return None
+        return {"project_id": project_id}, f"{project.emoji or '📁'} {project.name}"
+    return {}, "📋 Все задачи"
+
+
+async def _show_tasks_page(
+    callback: CallbackQuery,
+    list_filter: str,
+    tg_user_id: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    backward: bool = False,
+) -> None:
+    """Показать страницу списка: PAGE_SIZE задач после (или перед) cursor."""
+    async with AsyncSessionLocal() as session:
+        found = await _list_filter_args(session, list_filter, tg_user_id)
+        if found is None:
+            await callback.answer("❌ Проект не найден")
+            return
+        args, header = found
+        tasks, more = await TaskService(session).get_task_rows(
+            **args,
+            limit=PAGE_SIZE,
+            cursor=encode_cursor(*decode_short_cursor(cursor)) if cursor else None,
+            backward=backward,
+        )
+
+    if not tasks and cursor:
+        # Задачи этой страницы удалены или сменили статус — начинаем сначала
+        await _show_tasks_page(callback, list_filter, tg_user_id)
+        return
+
+    if backward:
+        has_prev, has_next = more is not None, True
+    else:
+        has_prev, has_next = cursor is not None, more is not None
+    if not has_prev:
+        page = 1
+
+    if not tasks:
+        if list_filter.startswith("p"):
+            keyboard = InlineKeyboardMarkup(inline_keyboard=[[
+                InlineKeyboardButton(text="↩️ К проектам", callback_data="tasks:projects")
+            ]])
+        else:
+            keyboard = tasks_list_keyboard(list_filter, list_filter == "mine", False)
+        await callback.message.edit_text(f"{header}\n\n✨ Задач нет", reply_markup=keyboard)
+        await callback.answer()
+        return
+
+    if page > 1:
+        header = f"{header} · стр. {page}"
+    elif not has_next:
+        header = f"{header} ({len(tasks)})"
+    await callback.message.edit_text(
+        f"{header}\n\nВыберите задачу:",
+        reply_markup=task_buttons_keyboard(tasks, list_filter, page, has_prev, has_next)
+    )
+    await callback.answer()
 
 
 @router.message(Command("tasks"))
@@ -154,6 +254,7 @@ async def handle_tasks_filter(callback: CallbackQuery, tg_user_id: int = 0):
                 from app.repositories.project_repository import ProjectRepository
                 repo = ProjectRepository(session)
                 projects = await repo.get_all_active()
+                counts = await CounterRepository(session).count_by_project()
 
             if not projects:
                 await callback.message.edit_text(
@@ -163,51 +264,35 @@ async def handle_tasks_filter(callback: CallbackQuery, tg_user_id: int = 0):
                     parse_mode="Markdown"
                 )
             else:
+                # Счётчики включают архив, а он состоит только из DONE —
+                # показываем открытые задачи, их число от архивации не зависит
+                def open_count(project_id: Optional[int]) -> int:
+                    project_counts = counts.get(project_id, {})
+                    return project_counts.get("total", 0) - project_counts.get(TaskStatus.DONE.value, 0)
+
                 buttons = []
                 for proj in projects:
                     emoji = proj.emoji or "📁"
                     buttons.append([InlineKeyboardButton(
-                        text=f"{emoji} {proj.name}",
+                        text=f"{emoji} {proj.name} ({open_count(proj.id)})",
                         callback_data=f"tasks_project:{proj.id}"
                     )])
-                buttons.append([InlineKeyboardButton(text="📋 Без проекта", callback_data="tasks_project:0")])
+                buttons.append([InlineKeyboardButton(
+                    text=f"📋 Без проекта ({open_count(None)})", callback_data="tasks_project:0"
+                )])
                 buttons.append([InlineKeyboardButton(text="↩️ Назад", callback_data="tasks:all")])
 
                 await callback.message.edit_text(
-                    "📁 *Выберите проект*",
+                    "📁 *Выберите проект*\n_в скобках — открытые задачи_",
                     reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons),
                     parse_mode="Markdown"
                 )
             await callback.answer()
             return
 
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-
-            if action == "mine":
-                tasks = await service.get_all_tasks()
-                tasks = [t for t in tasks if t.assignee_telegram_id == tg_user_id]
-                header = "👤 Мои задачи"
-            elif action in ("TODO", "DOING", "DONE", "BLOCKED"):
-                status = TaskStatus(action)
-                tasks = await service.get_all_tasks(status=status)
-                header = f"{STATUS_EMOJI[action]} {action}"
-            else:  # all / refresh
-                tasks = await service.get_all_tasks()
-                header = "📋 Все задачи"
-
-        if not tasks:
-            await callback.message.edit_text(
-                f"{header}\n\n✨ Задач нет",
-                reply_markup=tasks_list_keyboard(action, action == "mine", False)
-            )
-        else:
-            _task_cache[callback.from_user.id] = tasks
-            await callback.message.edit_text(
-                f"{header} ({len(tasks)})\n\nВыберите задачу:",
-                reply_markup=task_buttons_keyboard(tasks, page=0)
-            )
-        await callback.answer()
+        # all / refresh / mine / статус
+        list_filter = action if action in STATUS_EMOJI or action == "mine" else "all"
+        await _show_tasks_page(callback, list_filter, tg_user_id)
 
     except Exception as e:
         logger.error("tasks_filter_error", error=str(e))
@@ -215,16 +300,22 @@ async def handle_tasks_filter(callback: CallbackQuery, tg_user_id: int = 0):
 
 
 @router.callback_query(F.data.startswith("tasks_page:"))
-async def handle_tasks_page(callback: CallbackQuery):
-    """Пагинация списка задач."""
-    page = int(callback.data.split(":")[1])
-    tasks = _task_cache.get(callback.from_user.id, [])
-    
-    await callback.message.edit_text(
-        f"📋 Задачи (стр. {page+1})\n\nВыберите задачу:",
-        reply_markup=task_buttons_keyboard(tasks, page=page)
-    )
-    await callback.answer()
+async def handle_tasks_page(callback: CallbackQuery, tg_user_id: int = 0):
+    """Пагинация списка задач: следующая или предыдущая страница от позиции в кнопке."""
+    try:
+        _, list_filter, page, direction, cursor = callback.data.split(":")
+        page = int(page)
+        decode_short_cursor(cursor)
+    except ValueError:
+        # Кнопка из старой версии бота (tasks_page:{номер}) — просто к фильтрам
+        await show_filters(callback)
+        return
+
+    try:
+        await _show_tasks_page(callback, list_filter, tg_user_id, page, cursor, backward=direction == "p")
+    except Exception as e:
+        logger.error("tasks_page_error", error=str(e))
+        await callback.answer("❌ Ошибка")
 
 
 @router.callback_query(F.data.startswith("task_detail:"))
@@ -267,23 +358,86 @@ async def handle_task_detail(callback: CallbackQuery, tg_user_id: int = 0):
         await callback.answer("❌ Ошибка")
 
 
+# Сколько последних записей истории показывать в сообщении
+HISTORY_LIMIT = 30
+
+
+def _format_duration(seconds: int) -> str:
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    if days:
+        return f"{days}д {hours}ч"
+    if hours:
+        return f"{hours}ч"
+    return f"{max(rest // 60, 1)}м"
+
+
+def _history_line(event: TaskEvent) -> str:
+    when = event.occurred_at.strftime("%d.%m %H:%M")
+    if event.event_type == TaskEventType.CREATED.value:
+        text = "🆕 Создана"
+    elif event.event_type == TaskEventType.STATUS_CHANGED.value:
+        text = f"{STATUS_EMOJI.get(event.new_value, '•')} {event.old_value} → {event.new_value}"
+    elif event.event_type == TaskEventType.BLOCKED.value:
+        text = f"🚫 Блокер: {event.details}"
+    elif event.event_type == TaskEventType.ASSIGNED.value:
+        text = f"👤 Исполнитель: {event.details}" if event.new_value else "👤 Исполнитель снят"
+    elif event.event_type == TaskEventType.MOVED.value:
+        text = f"📁 В проект #{event.new_value}" if event.new_value else "📁 Убрана из проекта"
+    else:
+        text = event.event_type
+    return f"{when}  {text}"
+
+
+@router.callback_query(F.data.startswith("task_history:"))
+async def handle_task_history(callback: CallbackQuery):
+    """История задачи."""
+    task_id = int(callback.data.split(":")[1])
+
+    async with AsyncSessionLocal() as session:
+        events = await TaskService(session).get_history(task_id)
+    if events is None:
+        await callback.answer("❌ Задача не найдена")
+        return
+
+    lines = [f"📜 История задачи #{task_id}", ""]
+    if len(events) > HISTORY_LIMIT:
+        lines.append(f"… ещё {len(events) - HISTORY_LIMIT} раньше")
+    lines += [_history_line(event) for event in events[-HISTORY_LIMIT:]] or ["Записей нет"]
+
+    durations = status_durations(events, datetime.utcnow())
+    if durations:
+        lines += ["", "⏱ В статусах: " + ", ".join(
+            f"{status} {_format_duration(seconds)}" for status, seconds in durations.items()
+        )]
+
+    # Без Markdown — текст блокеров произвольный
+    await callback.message.edit_text(
+        "\n".join(lines),
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
+            InlineKeyboardButton(text="↩️ К задаче", callback_data=f"task_detail:{task_id}")
+        ]]),
+        parse_mode=None,
+    )
+    await callback.answer()
+
+
 @router.callback_query(F.data.startswith("take_task:"))
 async def handle_take_task(callback: CallbackQuery, tg_user_id: int = 0):
     """Взять задачу себе."""
     task_id = int(callback.data.split(":")[1])
     
+    async def take(session):
+        user = await UserRepository(session).get_by_telegram_id(tg_user_id)
+        if user:
+            await TaskService(session).take_task(task_id, user)
+        return user
+
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            user_repo = UserRepository(session)
-            
-            user = await user_repo.get_by_telegram_id(tg_user_id)
-            if not user:
-                await callback.answer("❌ Пользователь не найден")
-                return
-            
-            task = await service.take_task(task_id, user)
-            await session.commit()
+        user = await run_write(take)
+        if not user:
+            await callback.answer("❌ Пользователь не найден")
+            return
         
         await callback.answer(f"✅ Задача взята в работу")
         # Показываем обновлённую задачу
@@ -302,10 +456,7 @@ async def handle_task_status_change(callback: CallbackQuery):
     new_status = TaskStatus(parts[2])
     
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            await service.change_status(task_id, new_status)
-            await session.commit()
+        await run_write(lambda session: TaskService(session).change_status(task_id, new_status))
         
         await callback.answer(f"✅ Статус изменён на {new_status.value}")
         # Показываем обновлённую задачу
@@ -344,18 +495,17 @@ async def handle_assign(callback: CallbackQuery):
     task_id = int(parts[1])
     assignee_telegram_id = int(parts[2])
     
+    async def assign(session):
+        user = await UserRepository(session).get_by_telegram_id(assignee_telegram_id)
+        if user:
+            await TaskService(session).assign_task(task_id, user)
+        return user
+
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            user_repo = UserRepository(session)
-            
-            user = await user_repo.get_by_telegram_id(assignee_telegram_id)
-            if not user:
-                await callback.answer("❌ Пользователь не найден")
-                return
-            
-            task = await service.assign_task(task_id, user)
-            await session.commit()
+        user = await run_write(assign)
+        if not user:
+            await callback.answer("❌ Пользователь не найден")
+            return
         
         await callback.answer(f"✅ Назначено на {user.display_name}")
         # Возвращаемся к задаче
@@ -372,42 +522,8 @@ async def handle_tasks_by_project(callback: CallbackQuery):
     project_id = int(callback.data.split(":")[1])
 
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-
-            if project_id == 0:
-                # Без проекта
-                tasks = await service.get_all_tasks()
-                tasks = [t for t in tasks if not t.project_id]
-                header = "📋 Задачи без проекта"
-            else:
-                from app.repositories.project_repository import ProjectRepository
-                repo = ProjectRepository(session)
-                project = await repo.get_by_id(project_id)
-
-                if not project:
-                    await callback.answer("❌ Проект не найден")
-                    return
-
-                tasks = await service.get_all_tasks()
-                tasks = [t for t in tasks if t.project_id == project_id]
-                emoji = project.emoji or "📁"
-                header = f"{emoji} {project.name}"
-
-        if not tasks:
-            await callback.message.edit_text(
-                f"{header}\n\n✨ Задач нет",
-                reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
-                    InlineKeyboardButton(text="↩️ К проектам", callback_data="tasks:projects")
-                ]])
-            )
-        else:
-            _task_cache[callback.from_user.id] = tasks
-            await callback.message.edit_text(
-                f"{header} ({len(tasks)})\n\nВыберите задачу:",
-                reply_markup=task_buttons_keyboard(tasks, page=0)
-            )
-        await callback.answer()
+        # 0 — задачи без проекта
+        await _show_tasks_page(callback, f"p{project_id}", 0)
 
     except Exception as e:
         logger.error("tasks_by_project_error", error=str(e))
@@ -420,14 +536,7 @@ async def handle_unassign(callback: CallbackQuery):
     task_id = int(callback.data.split(":")[1])
 
     try:
-        async with AsyncSessionLocal() as session:
-            service = TaskService(session)
-            task = await service.get_task(task_id)
-            if task:
-                task.assignee_id = None
-                task.assignee_telegram_id = None
-                task.assignee_name = None
-                await session.commit()
+        await run_write(lambda session: TaskService(session).unassign_task(task_id))
 
         await callback.answer("✅ Исполнитель снят")
         await handle_task_detail(callback)
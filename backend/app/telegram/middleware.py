@@ -2,13 +2,14 @@
 from typing import Callable, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, CallbackQuery
-from app.core.db import AsyncSessionLocal
-from app.repositories.user_repository import UserRepository
+from app.services.user_tracking_service import user_tracker
 
 
 class UserTrackingMiddleware(BaseMiddleware):
-    """Создаёт/обновляет TelegramUser при каждом событии.
-    
+    """Создаёт/обновляет TelegramUser и отмечает активность.
+
+    В базу пишутся только новые пользователи и сменившие имя
+    (см. app.services.user_tracking_service), last_seen_at — пачками.
     Передаёт telegram_id в data["tg_user_id"] — не сам объект,
     чтобы избежать DetachedInstanceError после закрытия сессии.
     Handlers сами загружают пользователя если нужно.
@@ -26,22 +27,29 @@ class UserTrackingMiddleware(BaseMiddleware):
         elif isinstance(event, CallbackQuery) and event.from_user:
             from_user = event.from_user
 
-        if from_user and not from_user.is_bot:
+        # Отправитель и вступившие в чат — одним upsert
+        users = [from_user] if from_user else []
+        if isinstance(event, Message) and event.new_chat_members:
+            users += event.new_chat_members
+        users = [user for user in users if not user.is_bot]
+
+        if users:
             try:
-                async with AsyncSessionLocal() as session:
-                    repo = UserRepository(session)
-                    await repo.create_or_update(
-                        telegram_id=from_user.id,
-                        first_name=from_user.first_name,
-                        username=from_user.username,
-                        last_name=from_user.last_name,
-                    )
-                    await session.commit()
+                await user_tracker.track([
+                    {
+                        "telegram_id": user.id,
+                        "first_name": user.first_name,
+                        "username": user.username,
+                        "last_name": user.last_name,
+                    }
+                    for user in users
+                ])
             except Exception as e:
                 # Не ломаем обработку события из-за ошибки трекинга
                 import logging
                 logging.getLogger(__name__).warning(f"UserTracking failed: {e}")
 
+        if from_user and not from_user.is_bot:
             # Передаём только telegram_id — безопасно
             data["tg_user_id"] = from_user.id
 
@@ -0,0 +1,64 @@
+"""Admin API: операции обслуживания (бэкапы, кэш запросов).
+
+Доступ — по заголовку X-Admin-Token, равному ADMIN_TOKEN. Если
+ADMIN_TOKEN не задан, все /api/admin/* отвечают 403.
+"""
+import secrets
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from app.config import settings
+from app.core.backup import (
+    BackupError, BackupInProgress, BackupUnavailable, create_backup, list_backups, prune_backups,
+)
+from app.core.cache import query_cache
+from app.web.schemas import BackupResponse, CacheStatsResponse
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_TOKEN is not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+def _backup_payload(info) -> dict:
+    return {"name": info.name, "size": info.size, "created_at": info.created_at}
+
+
+@router.post("/backups", response_model=BackupResponse)
+async def make_backup():
+    """Снять снимок базы сейчас (online backup, писатели не блокируются).
+
+    Ответ приходит после копирования и проверки целостности. 409 — бэкап
+    уже идёт, 400 — база не SQLite, 500 — копирование или проверка не удались.
+    """
+    try:
+        info = await create_backup()
+    except BackupInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except BackupUnavailable as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BackupError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _backup_payload(info)
+
+
+@router.get("/backups", response_model=List[BackupResponse])
+async def get_backups():
+    """Готовые снимки, новые первыми."""
+    return [_backup_payload(info) for info in list_backups()]
+
+
+@router.post("/backups/prune", response_model=List[BackupResponse])
+async def prune():
+    """Применить BACKUP_KEEP сейчас. Возвращает удалённые снимки."""
+    return [_backup_payload(info) for info in prune_backups()]
+
+
+@router.get("/cache", response_model=Dict[str, CacheStatsResponse])
+async def get_cache_stats():
+    """Попадания, промахи и сбросы кэша запросов процесса API с запуска."""
+    return query_cache.report()
@@ -4,6 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 import time
 from app.config import settings
 from app.web.routes import router as api_router
+from app.web.admin import router as admin_router
+from app.core.write_queue import write_coordinator
+from app.core.event_bus import event_bus
+from app.core.cache import query_cache
+from app.core.outbox import outbox_relay
+from app.domain.events import DomainEvent
+from app.web.event_stream import event_hub, hub_forwarder
 
 app = FastAPI(
     title="TeamFlow API",
@@ -31,10 +38,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routes
 app.include_router(api_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
+
+
+relay = outbox_relay("api")
+
+
+@app.on_event("startup")
+async def startup():
+    """События для GET /api/events и сброса кэша: свои — из шины, из бота — через outbox."""
+    app.state.sse_subscription = event_bus.subscribe(DomainEvent, hub_forwarder(event_hub), name="sse")
+    app.state.cache_subscription = query_cache.subscribe(event_bus)
+    relay.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Остановить relay, дописать очередь group commit и доставить события."""
+    await relay.stop()
+    await write_coordinator.close()
+    await event_bus.close()
+    event_bus.unsubscribe(app.state.sse_subscription)
+    event_bus.unsubscribe(app.state.cache_subscription)
 
 
 @app.get("/")
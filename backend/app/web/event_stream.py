@@ -0,0 +1,232 @@
+"""Server-sent events: live task and meeting updates for the web UI.
+
+EventHub раздаёт события подписчикам GET /api/events. У каждого клиента
+своя ограниченная очередь; если клиент не успевает её разбирать, он
+получает событие overflow и отключается — EventSource переподключится,
+а UI перечитает данные. Публикация никогда не ждёт медленных клиентов.
+
+Источник — шина доменных событий (app.core.event_bus): API подписывает
+hub_forwarder на все события. Изменения самого API приходят сразу после
+COMMIT, изменения из бота — через event_outbox и OutboxRelay процесса API.
+"""
+import asyncio
+import itertools
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator, FrozenSet, List, Optional, Set, Tuple
+from app.config import settings
+from app.core.logging import get_logger
+from app.domain.enums import TaskStatus
+from app.domain.events import (
+    DomainEvent, TaskCreated, TaskStatusChanged, TaskBlocked, TaskUnblocked, TaskAssigned,
+    TaskMoved, TaskUpdated, TaskDeleted, TasksBulkChanged, TasksArchived, TasksImported,
+    MeetingRecorded, MeetingUpdated, MeetingDeleted,
+)
+
+logger = get_logger(__name__)
+
+_OVERFLOW = object()
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """Событие для SSE-клиентов.
+
+    project_ids / assignee_ids — к каким фильтрам относится событие
+    (при переназначении — и старый, и новый исполнитель). None —
+    событие без привязки (встречи), его получают все подписчики.
+    """
+    id: int
+    type: str
+    data: dict
+    project_ids: Optional[FrozenSet[int]] = None
+    assignee_ids: Optional[FrozenSet[int]] = None
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """Один подключённый клиент."""
+    queue: asyncio.Queue
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
+    dropped: bool = False
+
+    def matches(self, event: StreamEvent) -> bool:
+        if (self.project_id is not None and event.project_ids is not None
+                and self.project_id not in event.project_ids):
+            return False
+        if (self.assignee_telegram_id is not None and event.assignee_ids is not None
+                and self.assignee_telegram_id not in event.assignee_ids):
+            return False
+        return True
+
+
+class TooManySubscribers(Exception):
+    """Достигнут SSE_MAX_SUBSCRIBERS."""
+
+
+class EventHub:
+    """Раздача событий подписчикам с ограниченными буферами."""
+
+    def __init__(self, buffer_size: int = 100, max_subscribers: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscriber] = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        project_id: Optional[int] = None,
+        assignee_telegram_id: Optional[int] = None,
+    ) -> Subscriber:
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers()
+        subscriber = Subscriber(asyncio.Queue(self.buffer_size), project_id, assignee_telegram_id)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(
+        self,
+        type: str,
+        data: dict,
+        project_ids: Optional[FrozenSet[int]] = None,
+        assignee_ids: Optional[FrozenSet[int]] = None,
+    ) -> StreamEvent:
+        """Разослать событие; переполненные клиенты отключаются."""
+        event = StreamEvent(next(self._ids), type, data, project_ids, assignee_ids)
+        for subscriber in list(self._subscribers):
+            if not subscriber.matches(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+        return event
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        # Очередь полна — освобождаем её и кладём маркер, чтобы поток завершился сразу
+        subscriber.dropped = True
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(_OVERFLOW)
+        logger.warning("sse_subscriber_dropped", subscribers=len(self._subscribers))
+
+    async def stream(self, subscriber: Subscriber, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """SSE-кадры для подписчика; отписывает при завершении."""
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is _OVERFLOW:
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                yield format_sse(event)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_sse(event: StreamEvent) -> str:
+    data = json.dumps(event.data, ensure_ascii=False, default=str)
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+# ============= DOMAIN EVENTS → SSE =============
+
+def _ids(*values: Optional[int]) -> FrozenSet[int]:
+    return frozenset(value for value in values if value is not None)
+
+
+def _task_data(event, **extra) -> dict:
+    return {
+        "id": event.task_id,
+        "project_id": event.project_id,
+        "assignee_telegram_id": event.assignee_telegram_id,
+        **extra,
+    }
+
+
+def to_stream_event(event: DomainEvent) -> Optional[Tuple[str, dict, Optional[FrozenSet[int]], Optional[FrozenSet[int]]]]:
+    """(type, data, project_ids, assignee_ids) для SSE или None — событие клиентам не нужно."""
+    if isinstance(event, TaskAssigned):
+        return (
+            "task.assigned",
+            _task_data(event, assignee_name=event.assignee_name,
+                       old_assignee_telegram_id=event.previous_assignee_telegram_id),
+            _ids(event.project_id),
+            _ids(event.assignee_telegram_id, event.previous_assignee_telegram_id),
+        )
+    if isinstance(event, TaskMoved):
+        return (
+            "task.moved",
+            _task_data(event, old_project_id=event.previous_project_id),
+            _ids(event.project_id, event.previous_project_id),
+            _ids(event.assignee_telegram_id),
+        )
+
+    if isinstance(event, TaskCreated):
+        task_event = ("task.created", _task_data(event, title=event.title, source=event.source))
+    elif isinstance(event, TaskStatusChanged):
+        task_event = ("task.status_changed", _task_data(
+            event, status=event.new_status.value, old_status=event.old_status.value))
+    elif isinstance(event, TaskBlocked):
+        task_event = ("task.blocked", _task_data(
+            event, status=TaskStatus.BLOCKED.value, blocker_text=event.blocker_text))
+    elif isinstance(event, TaskUnblocked):
+        task_event = ("task.unblocked", _task_data(event))
+    elif isinstance(event, TaskUpdated):
+        task_event = ("task.updated", _task_data(event))
+    elif isinstance(event, TaskDeleted):
+        task_event = ("task.deleted", _task_data(event))
+    else:
+        task_event = None
+    if task_event:
+        return (*task_event, _ids(event.project_id), _ids(event.assignee_telegram_id))
+
+    # Пакетные изменения и встречи — без привязки, их получают все
+    if isinstance(event, TasksBulkChanged):
+        return "tasks.bulk_changed", {"ids": event.task_ids, "changes": event.changes}, None, None
+    if isinstance(event, TasksArchived):
+        return "tasks.archived", {"ids": event.task_ids}, None, None
+    if isinstance(event, TasksImported):
+        return "tasks.imported", {"ids": event.task_ids}, None, None
+    if isinstance(event, MeetingRecorded):
+        return "meeting.recorded", {
+            "id": event.meeting_id,
+            "meeting_date": event.meeting_date,
+            "summary": event.summary,
+        }, None, None
+    if isinstance(event, MeetingUpdated):
+        return "meeting.updated", {"id": event.meeting_id}, None, None
+    if isinstance(event, MeetingDeleted):
+        return "meeting.deleted", {"id": event.meeting_id}, None, None
+    return None
+
+
+def hub_forwarder(hub: EventHub):
+    """Обработчик шины событий, пересылающий события в EventHub."""
+    async def forward(events: List[DomainEvent]) -> None:
+        if not hub.subscriber_count:
+            return
+        for event in events:
+            stream_event = to_stream_event(event)
+            if stream_event is not None:
+                hub.publish(*stream_event)
+    return forward
+
+
+event_hub = EventHub(
+    buffer_size=settings.SSE_CLIENT_BUFFER,
+    max_subscribers=settings.SSE_MAX_SUBSCRIBERS,
+)
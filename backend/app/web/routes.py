@@ -1,17 +1,35 @@
 """Web API routes - no auth."""
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional, List, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import date, datetime, timedelta
+from pydantic import BaseModel, ConfigDict, Field
 from app.core.db import get_db
-from app.services.task_service import TaskService
+from app.core.write_queue import run_write
+from app.services.task_service import TaskService, status_durations
 from app.repositories.user_repository import UserRepository
+from app.repositories.counter_repository import CounterRepository
+from app.repositories.search_repository import SearchRepository
+from app.services.archive_service import ArchiveService
+from app.services.meeting_service import MeetingService
+from app.services.change_service import ChangeService, SyncTokenExpired
+from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.import_service import TaskImporter, decode_lines, read_records
+from app.web.event_stream import event_hub, TooManySubscribers
 from app.domain.enums import TaskStatus
-from app.web.schemas import TaskResponse, TaskDetailResponse, StatsResponse, BotInfoResponse, TelegramUserResponse
+from app.web.schemas import (
+    TaskResponse, TaskListItemResponse, TaskDetailResponse, StatsResponse, BotInfoResponse,
+    TelegramUserResponse, SearchResultResponse, ArchivedTaskResponse, ArchivedTaskDetailResponse,
+    TaskChangesResponse, TaskHistoryResponse, FlowResponse, CfdResponse, ImportResponse,
+)
 from app.config import settings
+from app.core.logging import get_logger
 
+logger = get_logger(__name__)
 router = APIRouter()
 
 
@@ -25,14 +43,151 @@ async def get_bot_info():
 
 @router.get("/tasks", response_model=List[TaskResponse])
 async def get_tasks(
+    response: Response,
     status: Optional[TaskStatus] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
+    """Список задач — одна страница (по умолчанию 100).
+
+    Курсор следующей страницы приходит в заголовке X-Next-Cursor
+    (заголовка нет — это последняя страница).
+    """
     service = TaskService(db)
-    tasks = await service.get_all_tasks(status)
+    try:
+        tasks, next_cursor = await service.get_tasks_page(limit, cursor, status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tasks
 
 
+@router.get("/tasks/compact", response_model=List[TaskListItemResponse])
+async def get_tasks_compact(
+    response: Response,
+    status: Optional[TaskStatus] = None,
+    project_id: Optional[int] = None,
+    assignee_telegram_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Компактный список: id, название, статус, проект, исполнитель.
+
+    Читает только нужные колонки одним запросом с JOIN, без загрузки
+    блокеров и ORM-объектов. Пагинация — как у GET /tasks.
+    """
+    service = TaskService(db)
+    try:
+        rows, next_cursor = await service.get_task_rows(
+            status=status,
+            assignee_telegram_id=assignee_telegram_id,
+            project_id=project_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [row._asdict() for row in rows]
+
+
+@router.get("/tasks/changes", response_model=TaskChangesResponse)
+async def get_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delta sync: задачи, изменённые или удалённые после токена since.
+
+    Без since — все задачи с начала (первичная загрузка порциями).
+    Ответ содержит новый токен; при has_more=true запросить сразу ещё.
+    410 — токен старше TOMBSTONE_RETENTION_DAYS, нужна полная загрузка.
+    """
+    service = ChangeService(db)
+    try:
+        batch = await service.get_changes(since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid token")
+    except SyncTokenExpired:
+        raise HTTPException(status_code=410, detail="Token expired, full resync required")
+    return {
+        "tasks": batch.tasks,
+        "deleted": batch.deleted,
+        "token": service.encode_token(batch),
+        "has_more": batch.has_more,
+    }
+
+
+@router.get("/events")
+async def stream_events(
+    project_id: Optional[int] = None,
+    assignee_telegram_id: Optional[int] = None,
+):
+    """Server-sent events: task.created, task.updated, task.status_changed,
+    task.blocked, task.assigned, task.moved, task.deleted, meeting.recorded.
+
+    Фильтры по проекту и исполнителю. Событие overflow — клиент не успевал
+    читать и отключён; после переподключения данные нужно перечитать.
+    """
+    try:
+        subscriber = event_hub.subscribe(project_id, assignee_telegram_id)
+    except TooManySubscribers:
+        raise HTTPException(status_code=503, detail="Too many subscribers")
+    return StreamingResponse(
+        event_hub.stream(subscriber, heartbeat=settings.SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=List[SearchResultResponse])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """Полнотекстовый поиск по задачам, блокерам и встречам.
+
+    Слова ищутся по префиксу, все должны встретиться; совпадения
+    в названии задачи весят больше, чем в описании.
+    """
+    hits = await SearchRepository(db).search(q, limit=limit)
+    return [hit._asdict() for hit in hits]
+
+
+@router.get("/archive/tasks", response_model=List[ArchivedTaskResponse])
+async def get_archived_tasks(
+    response: Response,
+    project_id: Optional[int] = None,
+    assignee_telegram_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Архив закрытых задач. Пагинация — как у GET /tasks (X-Next-Cursor)."""
+    service = ArchiveService(db)
+    try:
+        tasks, next_cursor = await service.get_archived_page(limit, cursor, project_id, assignee_telegram_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+
+@router.get("/archive/tasks/{task_id}", response_model=ArchivedTaskDetailResponse)
+async def get_archived_task(task_id: int, db: AsyncSession = Depends(get_db)):
+    found = await ArchiveService(db).get_archived_task(task_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Archived task not found")
+    task, blockers = found
+    return {**ArchivedTaskResponse.model_validate(task).model_dump(), "blockers": blockers}
+
+
 @router.get("/tasks/{task_id}", response_model=TaskDetailResponse)
 async def get_task(task_id: int, db: AsyncSession = Depends(get_db)):
     service = TaskService(db)
@@ -42,16 +197,166 @@ async def get_task(task_id: int, db: AsyncSession = Depends(get_db)):
     return task
 
 
+@router.get("/tasks/{task_id}/history", response_model=TaskHistoryResponse)
+async def get_task_history(task_id: int, db: AsyncSession = Depends(get_db)):
+    """Смены статуса, назначения, блокеры и переносы задачи по времени."""
+    events = await TaskService(db).get_history(task_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {
+        "task_id": task_id,
+        "events": events,
+        "status_durations": status_durations(events, datetime.utcnow()),
+    }
+
+
+def _stats_payload(counts: dict) -> dict:
+    return {
+        "total": counts["total"],
+        "todo": counts[TaskStatus.TODO.value],
+        "doing": counts[TaskStatus.DOING.value],
+        "done": counts[TaskStatus.DONE.value],
+        "blocked": counts[TaskStatus.BLOCKED.value],
+    }
+
+
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(db: AsyncSession = Depends(get_db)):
-    service = TaskService(db)
-    tasks = await service.get_all_tasks()
+async def get_stats(
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    by_project: bool = False,
+    by_assignee: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Счётчики задач по статусам из таблицы task_counters.
+
+    project_id / assignee_id сужают выборку (0 — без проекта / не назначено),
+    by_project / by_assignee добавляют разбивку по проектам и исполнителям.
+    """
+    repo = CounterRepository(db)
+    stats = _stats_payload(await repo.get_counts(project_id, assignee_id))
+    if by_project:
+        stats["by_project"] = [
+            {"key": key, **_stats_payload(counts)}
+            for key, counts in (await repo.count_by_project()).items()
+        ]
+    if by_assignee:
+        stats["by_assignee"] = [
+            {"key": key, **_stats_payload(counts)}
+            for key, counts in (await repo.count_by_assignee()).items()
+        ]
+    return stats
+
+
+@router.get("/analytics/flow", response_model=FlowResponse)
+async def get_flow(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Throughput, cycle time и lead time по дням завершения (по умолчанию — 90 дней).
+
+    Читает дневные роллапы flow_daily; длительности — в секундах.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=89)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    return await AnalyticsService(db).get_flow(date_from, date_to, project_id, assignee_id)
+
+
+@router.get("/analytics/cfd", response_model=CfdResponse)
+async def get_cfd(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Cumulative flow diagram по снимкам доски (по умолчанию — 12 месяцев)."""
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=364)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    return await AnalyticsService(db).get_cfd(date_from, date_to, project_id)
+
+
+DataFormat = Literal["ndjson", "csv"]
+
+
+def _export_response(rows, name: str, format: str, date_from: Optional[date], date_to: Optional[date]):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+@router.get("/export/tasks")
+async def export_tasks(
+    format: DataFormat = "ndjson",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    project_id: Optional[int] = None,
+    include_archived: bool = False,
+):
+    """Выгрузка задач потоком (NDJSON или CSV), фильтр from/to — по дате создания."""
+    rows = ExportService().tasks(format, date_from, date_to, project_id, include_archived)
+    return _export_response(rows, "tasks", format, date_from, date_to)
+
+
+@router.get("/export/blockers")
+async def export_blockers(
+    format: DataFormat = "ndjson",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    project_id: Optional[int] = None,
+    include_archived: bool = False,
+):
+    """Выгрузка блокеров потоком, фильтр from/to — по дате создания блокера."""
+    rows = ExportService().blockers(format, date_from, date_to, project_id, include_archived)
+    return _export_response(rows, "blockers", format, date_from, date_to)
+
+
+@router.get("/export/meetings")
+async def export_meetings(
+    format: DataFormat = "ndjson",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+):
+    """Выгрузка встреч потоком, фильтр from/to — по дате встречи."""
+    rows = ExportService().meetings(format, date_from, date_to)
+    return _export_response(rows, "meetings", format, date_from, date_to)
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_tasks(
+    request: Request,
+    format: DataFormat = "ndjson",
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+):
+    """Импорт задач из тела запроса (NDJSON или CSV с заголовком).
+
+    Тело читается потоком, задачи вставляются пачками по batch_size
+    (по умолчанию IMPORT_BATCH_SIZE), каждая пачка — своя транзакция.
+    Отклонённые строки не прерывают импорт и возвращаются в rejects.
+    """
+    rejects = []
+
+    def on_reject(line_no, raw, error):
+        if len(rejects) < settings.IMPORT_MAX_REJECTS_IN_RESPONSE:
+            rejects.append({"line": line_no, "error": error, "row": raw})
+
+    importer = TaskImporter(batch_size, on_reject=on_reject)
+    report = await importer.run(read_records(decode_lines(request.stream()), format))
     return {
-        "total": len(tasks),
-        "todo": len([t for t in tasks if t.status == TaskStatus.TODO.value]),
-        "doing": len([t for t in tasks if t.status == TaskStatus.DOING.value]),
-        "done": len([t for t in tasks if t.status == TaskStatus.DONE.value]),
-        "blocked": len([t for t in tasks if t.status == TaskStatus.BLOCKED.value]),
+        "read": report.read,
+        "imported": report.imported,
+        "rejected": report.rejected,
+        "rejects": rejects,
     }
 
 
@@ -80,10 +385,11 @@ async def change_task_status(
     db: AsyncSession = Depends(get_db)
 ):
     """Изменить статус задачи."""
-    from app.domain.enums import TaskStatus
-    service = TaskService(db)
-    await service.change_status(task_id, TaskStatus(request.status))
-    await db.commit()
+    new_status = TaskStatus(request.status)
+    try:
+        await run_write(lambda session: TaskService(session).change_status(task_id, new_status))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Task not found")
     return {"ok": True}
 
 
@@ -94,27 +400,178 @@ async def assign_task_api(
     db: AsyncSession = Depends(get_db)
 ):
     """Назначить задачу пользователю."""
-    service = TaskService(db)
-    task = await service.get_task(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    if request.user_id:
-        user_repo = UserRepository(db)
-        user = await user_repo.get_by_telegram_id(request.user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        await service.assign_task(task_id, user)
-    else:
-        # Снять исполнителя
-        task.assignee_id = None
-        task.assignee_telegram_id = None
-        task.assignee_name = None
-    
-    await db.commit()
+    async def assign(session):
+        service = TaskService(session)
+        if not await service.get_task(task_id):
+            raise HTTPException(status_code=404, detail="Task not found")
+        if request.user_id:
+            user = await UserRepository(session).get_by_telegram_id(request.user_id)
+            if not user:
+                raise HTTPException(status_code=404, detail="User not found")
+            await service.assign_task(task_id, user)
+        else:
+            # Снять исполнителя
+            await service.unassign_task(task_id)
+
+    await run_write(assign)
     return {"ok": True}
 
 
+# ============= BULK API =============
+
+class BulkCreateItem(BaseModel):
+    """Задача для массового создания."""
+    title: str
+    description: Optional[str] = None
+    project_id: Optional[int] = None
+    assignee_telegram_id: Optional[int] = None
+
+
+class BulkUpdateItem(BaseModel):
+    """Новые значения одной задачи для update (None — не менять)."""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+
+class BulkOperation(BaseModel):
+    """Одна операция пакета.
+
+    create  — tasks
+    update  — items: у каждой задачи свои title/description;
+              или task_ids + title/description — одни значения на все задачи
+    status  — task_ids + status
+    assign  — task_ids + user_id (telegram id; null — снять исполнителя)
+    project — task_ids + project_id (null — убрать из проекта)
+    """
+    op: Literal["create", "update", "status", "assign", "project"]
+    task_ids: List[int] = []
+    tasks: List[BulkCreateItem] = []
+    items: List[BulkUpdateItem] = []
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    user_id: Optional[int] = None
+    project_id: Optional[int] = None
+
+
+class BulkRequest(BaseModel):
+    """Пакет операций — применяется в одной транзакции."""
+    operations: List[BulkOperation] = Field(..., max_length=1000)
+
+
+class BulkItemResult(BaseModel):
+    """Результат одной операции пакета."""
+    index: int
+    op: str
+    ok: bool
+    task_ids: List[int] = []
+    missing_ids: List[int] = []
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+
+
+async def _apply_bulk_operation(service: TaskService, db: AsyncSession, op: BulkOperation) -> List[int]:
+    """Выполнить операцию пакета, вернуть id затронутых задач."""
+    from app.repositories.project_repository import ProjectRepository
+
+    if op.op == "create":
+        project_ids = {item.project_id for item in op.tasks if item.project_id is not None}
+        unknown = sorted(project_ids - await ProjectRepository(db).get_existing_ids(project_ids))
+        if unknown:
+            raise ValueError(f"Projects {', '.join(map(str, unknown))} not found")
+
+        users = {}
+        for item in op.tasks:
+            if item.assignee_telegram_id and item.assignee_telegram_id not in users:
+                user = await UserRepository(db).get_by_telegram_id(item.assignee_telegram_id)
+                if not user:
+                    raise ValueError(f"User {item.assignee_telegram_id} not found")
+                users[item.assignee_telegram_id] = user
+
+        items = []
+        for item in op.tasks:
+            user = users.get(item.assignee_telegram_id)
+            items.append({
+                "title": item.title,
+                "description": item.description,
+                "project_id": item.project_id,
+                "assignee_id": user.id if user else None,
+                "assignee_telegram_id": user.telegram_id if user else None,
+                "assignee_name": user.display_name if user else None,
+            })
+        return [task.id for task in await service.bulk_create(items)]
+
+    if op.op == "update":
+        if op.items:
+            if op.task_ids or op.title is not None or op.description is not None:
+                raise ValueError("items cannot be combined with task_ids, title or description")
+            return await service.bulk_update_each([item.model_dump() for item in op.items])
+        return await service.bulk_update(op.task_ids, op.title, op.description)
+
+    if op.op == "status":
+        if op.status is None:
+            raise ValueError("status is required")
+        return await service.bulk_change_status(op.task_ids, op.status)
+
+    if op.op == "assign":
+        user = None
+        if op.user_id:
+            user = await UserRepository(db).get_by_telegram_id(op.user_id)
+            if not user:
+                raise ValueError(f"User {op.user_id} not found")
+        return await service.bulk_assign(op.task_ids, user)
+
+    # project
+    if op.project_id is not None and not await ProjectRepository(db).get_by_id(op.project_id):
+        raise ValueError(f"Project {op.project_id} not found")
+    return await service.bulk_move_to_project(op.task_ids, op.project_id)
+
+
+@router.post("/tasks/bulk", response_model=BulkResponse)
+async def bulk_tasks(request: BulkRequest):
+    """Массовые операции над задачами одной транзакцией.
+
+    Каждая операция — set-based UPDATE (или один INSERT-flush для create)
+    в своём SAVEPOINT: ошибка операции откатывает только её, остальные
+    фиксируются общим commit. Результаты — по одному на операцию.
+    """
+    async def apply(session):
+        service = TaskService(session)
+        results = []
+        for index, op in enumerate(request.operations):
+            try:
+                async with session.begin_nested():
+                    task_ids = await _apply_bulk_operation(service, session, op)
+            except ValueError as e:
+                results.append(BulkItemResult(index=index, op=op.op, ok=False, error=str(e)))
+                continue
+            except SQLAlchemyError as e:
+                # SAVEPOINT уже откатан — остальные операции пакета продолжаются
+                logger.warning("bulk_operation_failed", index=index, op=op.op, error=str(e))
+                error = str(getattr(e, "orig", None) or e)
+                results.append(BulkItemResult(index=index, op=op.op, ok=False, error=f"Database error: {error}"))
+                continue
+
+            found = set(task_ids)
+            requested = op.task_ids or [item.id for item in op.items]
+            missing = [task_id for task_id in dict.fromkeys(requested) if task_id not in found]
+            results.append(BulkItemResult(
+                index=index,
+                op=op.op,
+                ok=not missing,
+                task_ids=task_ids,
+                missing_ids=missing,
+                error="Tasks not found" if missing else None,
+            ))
+        return results
+
+    return BulkResponse(results=await run_write(apply))
+
+
 # ============= PROJECTS API =============
 
 class ProjectCreateRequest(BaseModel):
@@ -153,57 +610,56 @@ async def get_projects(db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/projects", response_model=ProjectResponse)
-async def create_project(request: ProjectCreateRequest, db: AsyncSession = Depends(get_db)):
+async def create_project(request: ProjectCreateRequest):
     """Создать проект."""
     from app.repositories.project_repository import ProjectRepository
-    repo = ProjectRepository(db)
-    project = await repo.create(
+    return await run_write(lambda session: ProjectRepository(session).create(
         name=request.name,
         description=request.description,
         emoji=request.emoji
-    )
-    await db.commit()
-    return project
+    ))
 
 
 @router.patch("/projects/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     request: ProjectUpdateRequest,
-    db: AsyncSession = Depends(get_db)
 ):
     """Обновить проект."""
     from app.repositories.project_repository import ProjectRepository
-    repo = ProjectRepository(db)
-    project = await repo.get_by_id(project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if request.name is not None:
-        project.name = request.name
-    if request.description is not None:
-        project.description = request.description
-    if request.emoji is not None:
-        project.emoji = request.emoji
-    if request.is_active is not None:
-        project.is_active = request.is_active
-    
-    await db.commit()
-    await db.refresh(project)
-    return project
+
+    async def update(session):
+        repo = ProjectRepository(session)
+        project = await repo.get_by_id(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        await repo.update(
+            project,
+            name=request.name,
+            description=request.description,
+            emoji=request.emoji,
+            is_active=request.is_active,
+        )
+        await session.flush()
+        await session.refresh(project)
+        return project
+
+    return await run_write(update)
 
 
 @router.delete("/projects/{project_id}")
-async def delete_project(project_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_project(project_id: int):
     """Удалить проект (мягкое удаление)."""
     from app.repositories.project_repository import ProjectRepository
-    repo = ProjectRepository(db)
-    project = await repo.get_by_id(project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    project.is_active = False
-    await db.commit()
+
+    async def deactivate(session):
+        repo = ProjectRepository(session)
+        project = await repo.get_by_id(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        await repo.update(project, is_active=False)
+
+    await run_write(deactivate)
     return {"ok": True}
 
 
@@ -216,18 +672,13 @@ class ProjectAssignRequest(BaseModel):
 async def assign_task_to_project(
     task_id: int,
     request: ProjectAssignRequest,
-    db: AsyncSession = Depends(get_db)
 ):
     """Назначить задачу в проект."""
-    service = TaskService(db)
-    task = await service.get_task(task_id)
-    if not task:
+    try:
+        task = await run_write(lambda session: TaskService(session).move_to_project(task_id, request.project_id))
+    except ValueError:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task.project_id = request.project_id
-    await db.commit()
-    await db.refresh(task)
-    
     return {"ok": True, "project_id": task.project_id}
 
 
@@ -266,55 +717,32 @@ async def get_meetings(db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/meetings", response_model=MeetingResponse)
-async def create_meeting(request: MeetingCreateRequest, db: AsyncSession = Depends(get_db)):
+async def create_meeting(request: MeetingCreateRequest):
     """Создать встречу."""
-    from app.domain.models import Meeting
     from app.core.clock import Clock
-    
-    meeting = Meeting(
-        summary=request.summary,
-        meeting_date=request.meeting_date or Clock.now()
-    )
-    db.add(meeting)
-    await db.commit()
-    await db.refresh(meeting)
-    return meeting
+
+    meeting_date = request.meeting_date or Clock.now()
+    return await run_write(lambda session: MeetingService(session).record_meeting(request.summary, meeting_date))
 
 
 @router.patch("/meetings/{meeting_id}", response_model=MeetingResponse)
 async def update_meeting(
     meeting_id: int,
     request: MeetingUpdateRequest,
-    db: AsyncSession = Depends(get_db)
 ):
     """Обновить встречу."""
-    from app.domain.models import Meeting
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
+    meeting = await run_write(lambda session: MeetingService(session).update_meeting(
+        meeting_id, request.summary, request.meeting_date))
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    
-    if request.summary is not None:
-        meeting.summary = request.summary
-    if request.meeting_date is not None:
-        meeting.meeting_date = request.meeting_date
-    
-    await db.commit()
-    await db.refresh(meeting)
     return meeting
 
 
 @router.delete("/meetings/{meeting_id}")
-async def delete_meeting(meeting_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_meeting(meeting_id: int):
     """Удалить встречу."""
-    from app.domain.models import Meeting
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
-    if not meeting:
+    if not await run_write(lambda session: MeetingService(session).delete_meeting(meeting_id)):
         raise HTTPException(status_code=404, detail="Meeting not found")
-    
-    await db.delete(meeting)
-    await db.commit()
     return {"ok": True}
 
 
@@ -334,66 +762,61 @@ class TaskUpdateRequest(BaseModel):
     description: Optional[str] = None
 
 
+async def _reload(session: AsyncSession, task_id: int):
+    """Задача с исполнителем для ответа — после flush/refresh связи не загружены."""
+    from app.domain.models import Task
+    from sqlalchemy.orm import selectinload
+    result = await session.execute(
+        select(Task)
+        .options(selectinload(Task.assignee))
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
 @router.post("/tasks", response_model=TaskResponse)
-async def create_task_api(request: TaskCreateRequest, db: AsyncSession = Depends(get_db)):
+async def create_task_api(request: TaskCreateRequest):
     """Создать задачу через API."""
     from app.domain.enums import TaskSource
-    service = TaskService(db)
-    
-    task = await service.create_task(
-        title=request.title,
-        description=request.description,
-        source=TaskSource.MANUAL_COMMAND
-    )
-    
-    if request.project_id:
-        task.project_id = request.project_id
-    
-    if request.assignee_telegram_id:
-        user_repo = UserRepository(db)
-        user = await user_repo.get_by_telegram_id(request.assignee_telegram_id)
-        if user:
-            task.assignee_id = user.id
-            task.assignee_telegram_id = user.telegram_id
-            task.assignee_name = user.display_name
-    
-    await db.commit()
-    await db.refresh(task)
-    return task
+
+    async def create(session):
+        service = TaskService(session)
+        task = await service.create_task(
+            title=request.title,
+            description=request.description,
+            source=TaskSource.MANUAL_COMMAND,
+            project_id=request.project_id or None,
+        )
+        if request.assignee_telegram_id:
+            user = await UserRepository(session).get_by_telegram_id(request.assignee_telegram_id)
+            if user:
+                await service.assign_task(task.id, user)
+        return await _reload(session, task.id)
+
+    return await run_write(create)
 
 
 @router.patch("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task_api(
     task_id: int,
     request: TaskUpdateRequest,
-    db: AsyncSession = Depends(get_db)
 ):
     """Обновить задачу."""
-    service = TaskService(db)
-    task = await service.get_task(task_id)
-    if not task:
+    async def update(session):
+        # Через сервис — TaskUpdated сбрасывает кэш списков и уходит в SSE
+        await TaskService(session).update_task(task_id, title=request.title, description=request.description)
+        return await _reload(session, task_id)
+
+    try:
+        return await run_write(update)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    if request.title is not None:
-        task.title = request.title
-    if request.description is not None:
-        task.description = request.description
-    
-    await db.commit()
-    await db.refresh(task)
-    return task
 
 
 @router.delete("/tasks/{task_id}")
-async def delete_task_api(task_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_task_api(task_id: int):
     """Удалить задачу."""
-    service = TaskService(db)
-    task = await service.get_task(task_id)
-    if not task:
+    if not await run_write(lambda session: TaskService(session).delete_task(task_id)):
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    from app.repositories.task_repository import TaskRepository
-    repo = TaskRepository(db)
-    await repo.delete(task_id)
-    await db.commit()
     return {"ok": True}
@@ -1,6 +1,6 @@
 """Pydantic schemas for Web API."""
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, ConfigDict
 
 
@@ -47,18 +47,169 @@ class TaskResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskListItemResponse(BaseModel):
+    """Компактная строка списка задач."""
+    id: int
+    title: str
+    status: str
+    project_id: Optional[int]
+    assignee_telegram_id: Optional[int]
+    assignee_display_name: Optional[str]
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchResultResponse(BaseModel):
+    """Результат полнотекстового поиска."""
+    kind: str  # task | blocker | meeting
+    id: int
+    task_id: Optional[int]
+    title: Optional[str]
+    snippet: str
+
+
+class TaskChangesResponse(BaseModel):
+    """Порция ленты изменений для delta sync."""
+    tasks: List[TaskResponse]  # созданные и изменённые
+    deleted: List[int]  # удалённые или перенесённые в архив
+    token: Optional[str]  # передать в следующий запрос как since
+    has_more: bool  # есть ещё изменения — запросить сразу
+
+
 class TaskDetailResponse(TaskResponse):
     blockers: List[BlockerResponse] = []
     source: str
     source_chat_id: Optional[int]
 
 
+class TaskEventResponse(BaseModel):
+    """Запись истории задачи."""
+    id: int
+    event_type: str  # CREATED | STATUS_CHANGED | BLOCKED | ASSIGNED | MOVED
+    old_value: Optional[str]
+    new_value: Optional[str]
+    details: Optional[str]
+    actor_telegram_id: Optional[int]
+    occurred_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskHistoryResponse(BaseModel):
+    """История задачи и время в каждом статусе (секунды)."""
+    task_id: int
+    events: List[TaskEventResponse]
+    status_durations: Dict[str, int]
+
+
+class ArchivedTaskResponse(BaseModel):
+    """Задача из tasks_archive."""
+    id: int
+    title: str
+    description: Optional[str]
+    status: str
+    due_date: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    archived_at: datetime
+    project_id: Optional[int] = None
+    assignee_name: Optional[str]
+    assignee_telegram_id: Optional[int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedTaskDetailResponse(ArchivedTaskResponse):
+    blockers: List[BlockerResponse] = []
+
+
+class StatsBucketResponse(BaseModel):
+    """Счётчики по статусам для одного проекта или исполнителя."""
+    key: Optional[int]
+    total: int
+    todo: int
+    doing: int
+    done: int
+    blocked: int
+
+
 class StatsResponse(BaseModel):
     total: int
     todo: int
     doing: int
     done: int
     blocked: int
+    by_project: Optional[List[StatsBucketResponse]] = None
+    by_assignee: Optional[List[StatsBucketResponse]] = None
+
+
+class FlowTimeResponse(BaseModel):
+    """Перцентили и среднее длительности, секунды."""
+    p50: Optional[int]
+    p85: Optional[int]
+    avg: Optional[int]
+    count: int  # по скольким задачам
+
+
+class FlowDayResponse(BaseModel):
+    day: date
+    throughput: int
+    cycle_time_p50: Optional[int]
+    cycle_time_p85: Optional[int]
+    lead_time_p50: Optional[int]
+    lead_time_p85: Optional[int]
+
+
+class FlowResponse(BaseModel):
+    """Поток за период: throughput, cycle time, lead time."""
+    date_from: date
+    date_to: date
+    throughput: int
+    cycle_time: FlowTimeResponse
+    lead_time: FlowTimeResponse
+    days: List[FlowDayResponse]
+
+
+class CfdResponse(BaseModel):
+    """Cumulative flow: по значению на каждый день из days."""
+    days: List[date]
+    todo: List[int]
+    doing: List[int]
+    blocked: List[int]
+    done: List[int]
+
+
+class ImportRejectResponse(BaseModel):
+    """Отклонённая строка импорта."""
+    line: int
+    error: str
+    row: Any  # строка как пришла (объект или текст)
+
+
+class ImportResponse(BaseModel):
+    """Итог импорта; rejects — первые IMPORT_MAX_REJECTS_IN_RESPONSE строк."""
+    read: int
+    imported: int
+    rejected: int
+    rejects: List[ImportRejectResponse]
+
+
+class BackupResponse(BaseModel):
+    """Снимок базы в BACKUP_DIR."""
+    name: str
+    size: int  # байт
+    created_at: datetime
+
+
+class CacheStatsResponse(BaseModel):
+    """Счётчики кэша запросов по пространству имён."""
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
 
 
 class TelegramUserResponse(BaseModel):
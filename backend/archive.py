@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Archive closed tasks now instead of waiting for the background job.
+
+Usage:
+    python archive.py            # DONE старше ARCHIVE_AFTER_DAYS
+    python archive.py --days 7   # DONE старше 7 дней
+"""
+import asyncio
+import sys
+
+from app.config import settings
+from app.core.db import init_db, dispose_engines
+from app.core.write_queue import write_coordinator
+from app.services.archive_service import archive_closed_tasks
+
+
+async def run():
+    days = settings.ARCHIVE_AFTER_DAYS
+    if "--days" in sys.argv:
+        days = int(sys.argv[sys.argv.index("--days") + 1])
+
+    await init_db()
+    try:
+        moved = await archive_closed_tasks(older_than_days=days)
+        print(f"✅ Archived {moved} tasks (DONE older than {days} days)")
+    finally:
+        await write_coordinator.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Rebuild board_snapshots (CFD history) from the task status history.
+
+Usage:
+    python backfill_snapshots.py
+"""
+import asyncio
+from datetime import datetime
+
+from app.core.db import AsyncSessionLocal, dispose_engines, init_db
+from app.services.analytics_service import AnalyticsService
+
+
+async def run():
+    await init_db()
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await AnalyticsService(session).backfill_snapshots(datetime.utcnow().date())
+            await session.commit()
+        print(f"✅ Rebuilt board_snapshots: {rows} rows")
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Online backup of the SQLite database (safe while the bot and API are running).
+
+Usage:
+    python backup.py                    # снять снимок в BACKUP_DIR, проверить, применить BACKUP_KEEP
+    python backup.py --rate 50          # ограничение скорости, МБ/с (0 — без ограничения)
+    python backup.py --list             # список снимков
+    python backup.py --verify FILE      # PRAGMA integrity_check снимка
+    python backup.py --prune            # оставить BACKUP_KEEP последних
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.backup import BackupError, create_backup, list_backups, prune_backups, verify_backup
+
+
+def _size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+async def run():
+    try:
+        if "--list" in sys.argv:
+            for info in list_backups():
+                print(f"  {info.name}  {_size(info.size)}")
+            return
+        if "--verify" in sys.argv:
+            path = Path(sys.argv[sys.argv.index("--verify") + 1])
+            verify_backup(path)
+            print(f"✅ {path.name}: integrity check passed")
+            return
+        if "--prune" in sys.argv:
+            removed = prune_backups()
+            print(f"✅ Removed {len(removed)} old backups")
+            return
+
+        rate = None
+        if "--rate" in sys.argv:
+            rate = float(sys.argv[sys.argv.index("--rate") + 1])
+        info = await create_backup(max_mb_per_sec=rate)
+        print(f"✅ {info.path} ({_size(info.size)}), integrity check passed")
+    except BackupError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
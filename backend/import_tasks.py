@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Import tasks from NDJSON or CSV (migration from another tracker).
+
+Usage:
+    python import_tasks.py tasks.ndjson
+    python import_tasks.py tasks.csv --batch-size 2000
+    python import_tasks.py export.txt --format csv --rejects bad_rows.ndjson
+
+Поля строки: title (обязательно), description, definition_of_done,
+status, project (имя) или project_id, assignee (telegram id или
+@username) или assignee_name, due_date, created_at, started_at,
+completed_at (ISO 8601). Отклонённые строки пишутся в
+<файл>.rejected.ndjson (или --rejects): номер строки, причина, сама строка.
+После импорта пересобирается история доски (board_snapshots).
+"""
+import asyncio
+import json
+import sys
+from datetime import datetime
+
+from app.core.db import AsyncSessionLocal, init_db, dispose_engines
+from app.core.write_queue import write_coordinator
+from app.services.analytics_service import AnalyticsService
+from app.services.import_service import IMPORT_FORMATS, TaskImporter, read_records
+
+
+def _option(name: str, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+async def _lines(file):
+    for line in file:
+        yield line
+
+
+async def run():
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
+        print(__doc__)
+        sys.exit(1)
+    path = sys.argv[1]
+    format = _option("--format", "csv" if path.lower().endswith(".csv") else "ndjson")
+    if format not in IMPORT_FORMATS:
+        print(f"❌ Unknown format {format!r}, expected one of: {', '.join(IMPORT_FORMATS)}")
+        sys.exit(1)
+    batch_size = int(_option("--batch-size", 0)) or None
+    rejects_path = _option("--rejects", f"{path}.rejected.ndjson")
+
+    rejects_file = None
+
+    def on_reject(line_no, raw, error):
+        nonlocal rejects_file
+        if rejects_file is None:
+            rejects_file = open(rejects_path, "w", encoding="utf-8")
+        rejects_file.write(json.dumps({"line": line_no, "error": error, "row": raw}, ensure_ascii=False) + "\n")
+
+    def on_progress(report):
+        print(f"  … read {report.read}, imported {report.imported}, rejected {report.rejected}")
+
+    await init_db()
+    try:
+        importer = TaskImporter(batch_size, on_reject=on_reject, on_progress=on_progress)
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            report = await importer.run(read_records(_lines(file), format))
+        if report.imported:
+            async with AsyncSessionLocal() as session:
+                await AnalyticsService(session).backfill_snapshots(datetime.utcnow().date())
+                await session.commit()
+        print(f"✅ Imported {report.imported} of {report.read} rows")
+        if report.rejected:
+            print(f"⚠️  Rejected {report.rejected} rows → {rejects_path}")
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+        await write_coordinator.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
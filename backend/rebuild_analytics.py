@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Rebuild the flow_daily analytics rollups from tasks and tasks_archive.
+
+Usage:
+    python rebuild_analytics.py
+"""
+import asyncio
+
+from app.core.db import AsyncSessionLocal, dispose_engines, init_db
+from app.repositories.flow_repository import FlowRepository
+
+
+async def run():
+    await init_db()
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await FlowRepository(session).rebuild()
+            await session.commit()
+        print(f"✅ Rebuilt flow_daily: {rows} rows")
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Rebuild the task_counters table from tasks and tasks_archive.
+
+Usage:
+    python rebuild_counters.py          # пересчитать счётчики
+    python rebuild_counters.py --check  # только сравнить с фактическими данными
+"""
+import asyncio
+import sys
+
+from app.core.db import AsyncSessionLocal, dispose_engines, init_db
+from app.repositories.counter_repository import CounterRepository
+
+
+async def check() -> bool:
+    """Сравнить счётчики с GROUP BY по tasks и архиву, вывести расхождения."""
+    async with AsyncSessionLocal() as session:
+        repo = CounterRepository(session)
+        actual = await repo.count_actual_by_project()
+        stored = await repo.count_by_project()
+
+    ok = True
+    for project_id in sorted(set(actual) | set(stored), key=lambda k: k or 0):
+        if actual.get(project_id) != stored.get(project_id):
+            ok = False
+            print(f"  ✗ project {project_id}: tasks={actual.get(project_id)} counters={stored.get(project_id)}")
+    print("✅ Counters are in sync" if ok else "❌ Counters are out of sync")
+    return ok
+
+
+async def rebuild():
+    async with AsyncSessionLocal() as session:
+        rows = await CounterRepository(session).rebuild()
+        await session.commit()
+    print(f"✅ Rebuilt task_counters: {rows} rows")
+
+
+async def run():
+    await init_db()
+    try:
+        if "--check" in sys.argv:
+            if not await check():
+                sys.exit(1)
+        else:
+            await rebuild()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
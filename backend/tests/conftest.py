@@ -0,0 +1,42 @@
+"""Общие настройки тестов.
+
+Настройки читаются при импорте app.config, поэтому окружение задаём
+до любых импортов приложения: временная SQLite-база и фиктивный токен бота.
+"""
+import glob
+import os
+import tempfile
+
+import httpx
+import pytest
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="taskflow-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123:test")
+
+
+@pytest.fixture
+async def db():
+    """Чистая база на тест; после теста соединения закрываются, файл удаляется."""
+    from app.core.cache import PROJECTS, STATS, TASKS, USERS, query_cache
+    from app.core.db import dispose_engines, engine, init_db
+    from app.core.write_queue import write_coordinator
+
+    await init_db()
+    yield engine
+    await write_coordinator.close()
+    await dispose_engines()
+    await query_cache.invalidate([TASKS, PROJECTS, USERS, STATS])
+    for path in glob.glob(f"{_DB_PATH}*"):
+        os.remove(path)
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP-клиент API с подписками startup (кэш, SSE)."""
+    from app.web.app import app
+
+    await app.router.startup()
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    await app.router.shutdown()
@@ -0,0 +1,69 @@
+"""POST /api/tasks/bulk: проверка операций и изоляция ошибок."""
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.services.task_service import TaskService
+
+
+async def _counters(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT project_id, assignee_id, status, count FROM task_counters"))
+        return sorted(tuple(row) for row in result.all())
+
+
+async def _add_project(engine, project_id: int):
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO projects (id, name, emoji, is_active, created_at) "
+            f"VALUES ({project_id}, 'P{project_id}', 'x', 1, '2026-01-01')"
+        ))
+
+
+async def test_create_rejects_unknown_project(client, db):
+    await _add_project(db, 1)
+    response = await client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "create", "tasks": [{"title": "ok", "project_id": 1}, {"title": "bad", "project_id": 777}]},
+        {"op": "create", "tasks": [{"title": "kept", "project_id": 1}]},
+    ]})
+
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [False, True]
+    assert results[0]["error"] == "Projects 777 not found"
+    assert await _counters(db) == [(1, 0, "TODO", 1)]
+
+
+async def test_database_error_fails_only_its_operation(client, db, monkeypatch):
+    created = (await client.post("/api/tasks", json={"title": "t"})).json()["id"]
+
+    async def broken(self, task_ids, new_status):
+        raise OperationalError("UPDATE tasks", {}, Exception("disk I/O error"))
+
+    monkeypatch.setattr(TaskService, "bulk_change_status", broken)
+    response = await client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "status", "task_ids": [created], "status": "DONE"},
+        {"op": "update", "task_ids": [created], "title": "renamed"},
+    ]})
+
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert (first["ok"], first["error"]) == (False, "Database error: disk I/O error")
+    assert second["ok"] and second["task_ids"] == [created]
+    assert (await client.get(f"/api/tasks/{created}")).json()["title"] == "renamed"
+
+
+async def test_update_items_set_own_values_per_task(client):
+    first, second = [(await client.post("/api/tasks", json={"title": f"t{i}"})).json()["id"] for i in range(2)]
+    response = await client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "update", "items": [
+            {"id": first, "title": "first"},
+            {"id": second, "description": "only description"},
+            {"id": 999, "title": "missing"},
+        ]},
+        {"op": "update", "items": [{"id": first, "title": "x"}], "title": "shared"},
+    ]})
+
+    updated, mixed = response.json()["results"]
+    assert (updated["ok"], updated["task_ids"], updated["missing_ids"]) == (False, [first, second], [999])
+    assert (mixed["ok"], mixed["error"]) == (False, "items cannot be combined with task_ids, title or description")
+    tasks = {task["id"]: task for task in (await client.get("/api/tasks")).json()}
+    assert (tasks[first]["title"], tasks[first]["description"]) == ("first", None)
+    assert (tasks[second]["title"], tasks[second]["description"]) == ("t1", "only description")
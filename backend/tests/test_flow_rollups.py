@@ -0,0 +1,139 @@
+"""flow_daily и task_counters совпадают с пересчётом с нуля после любых изменений задач."""
+from sqlalchemy import text
+from app.core.db import AsyncSessionLocal
+from app.core.write_queue import run_write
+from app.domain.enums import TaskStatus
+from app.repositories.flow_repository import FlowRepository
+from app.repositories.user_repository import UserRepository
+from app.services.task_service import TaskService
+
+_FLOW = (
+    "SELECT day, project_id, assignee_id, throughput, cycle_count, cycle_seconds, lead_seconds, "
+    "cycle_hist, lead_hist FROM flow_daily ORDER BY day, project_id, assignee_id"
+)
+_REAL_COUNTS = (
+    "SELECT coalesce(project_id, 0), coalesce(assignee_id, 0), status, count(*) "
+    "FROM tasks GROUP BY 1, 2, 3"
+)
+_COUNTERS = "SELECT project_id, assignee_id, status, count FROM task_counters WHERE count != 0"
+
+
+async def _seed(engine):
+    async with engine.begin() as conn:
+        for project_id in (1, 2):
+            await conn.execute(text(
+                "INSERT INTO projects (id, name, emoji, is_active, created_at) "
+                f"VALUES ({project_id}, 'P{project_id}', 'x', 1, '2026-01-01')"
+            ))
+        await conn.execute(text(
+            "INSERT INTO telegram_users (id, telegram_id, first_name, is_active, created_at, updated_at) "
+            "VALUES (1, 42, 'Ann', 1, '2026-01-01', '2026-01-01')"
+        ))
+
+
+async def _rollups(engine):
+    """(flow_daily, пересчитанный flow_daily, task_counters, подсчёт по tasks)."""
+    async with engine.connect() as conn:
+        live = (await conn.execute(text(_FLOW))).all()
+        counters = sorted((await conn.execute(text(_COUNTERS))).all())
+        real = sorted((await conn.execute(text(_REAL_COUNTS))).all())
+    async with AsyncSessionLocal() as session:
+        await FlowRepository(session).rebuild()
+        rebuilt = (await session.execute(text(_FLOW))).all()
+        await session.rollback()
+    return live, rebuilt, counters, real
+
+
+async def _assert_consistent(engine):
+    live, rebuilt, counters, real = await _rollups(engine)
+    assert live == rebuilt
+    assert counters == real
+    return [row[:4] for row in live]
+
+
+async def _create(title="t") -> int:
+    task = await run_write(lambda session: TaskService(session).create_task(title=title))
+    return task.id
+
+
+async def _status(task_id: int, status: TaskStatus):
+    await run_write(lambda session: TaskService(session).change_status(task_id, status))
+
+
+async def _assign(task_id: int, telegram_id):
+    async def assign(session):
+        service = TaskService(session)
+        if telegram_id is None:
+            return await service.unassign_task(task_id)
+        user = await UserRepository(session).get_by_telegram_id(telegram_id)
+        return await service.assign_task(task_id, user)
+
+    await run_write(assign)
+
+
+async def test_done_task_moved_reopened_and_deleted(db):
+    await _seed(db)
+    task_id = await _create()
+    await _status(task_id, TaskStatus.DONE)
+    assert [row[1:] for row in await _assert_consistent(db)] == [(0, 0, 1)]
+
+    await run_write(lambda session: TaskService(session).move_to_project(task_id, 1))
+    assert [row[1:] for row in await _assert_consistent(db)] == [(1, 0, 1)]
+
+    await _assign(task_id, 42)
+    assert [row[1:] for row in await _assert_consistent(db)] == [(1, 1, 1)]
+
+    await _status(task_id, TaskStatus.TODO)
+    assert await _assert_consistent(db) == []
+
+    await _status(task_id, TaskStatus.DONE)
+    await _assign(task_id, None)
+    assert [row[1:] for row in await _assert_consistent(db)] == [(1, 0, 1)]
+
+    await run_write(lambda session: TaskService(session).delete_task(task_id))
+    assert await _assert_consistent(db) == []
+
+
+async def test_blocking_done_task_removes_it(db):
+    task_id = await _create()
+    await _status(task_id, TaskStatus.DONE)
+    await run_write(lambda session: TaskService(session).block_task(task_id, "waiting"))
+    assert await _assert_consistent(db) == []
+
+
+async def test_changes_that_do_not_move_done_task(db):
+    await _seed(db)
+    task_id = await _create()
+    await _status(task_id, TaskStatus.DOING)
+    await _assign(task_id, 42)
+    await run_write(lambda session: TaskService(session).move_to_project(task_id, 2))
+    assert await _assert_consistent(db) == []
+
+    await _status(task_id, TaskStatus.DONE)
+    await run_write(lambda session: TaskService(session).update_task(task_id, title="renamed"))
+    await run_write(lambda session: TaskService(session).move_to_project(task_id, 2))
+    assert [row[1:] for row in await _assert_consistent(db)] == [(2, 1, 1)]
+
+
+async def test_bulk_operations(db):
+    await _seed(db)
+    ids = [await _create(f"t{i}") for i in range(6)]
+
+    async def bulk(session):
+        service = TaskService(session)
+        await service.bulk_change_status(ids, TaskStatus.DONE)
+        await service.bulk_move_to_project(ids[:3], 2)
+        user = await UserRepository(session).get_by_telegram_id(42)
+        await service.bulk_assign(ids[2:], user)
+        await service.bulk_assign(ids[4:], None)
+        await service.bulk_change_status(ids[:2], TaskStatus.DOING)
+        await service.bulk_update(ids, title="renamed")
+
+    await run_write(bulk)
+    assert [row[1:] for row in await _assert_consistent(db)] == [(0, 0, 2), (0, 1, 1), (2, 1, 1)]
+
+    async def reopen_all(session):
+        await TaskService(session).bulk_change_status(ids, TaskStatus.TODO)
+
+    await run_write(reopen_all)
+    assert await _assert_consistent(db) == []
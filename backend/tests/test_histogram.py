@@ -0,0 +1,68 @@
+"""Лог-гистограммы длительностей для flow_daily."""
+import random
+import pytest
+from app.core import histogram
+
+
+def test_bucket_bounds_contain_value():
+    assert histogram.bucket_of(0) == 0
+    assert histogram.bucket_of(59.9) == 0
+    assert histogram.bucket_of(60) == 1
+    for value in (61, 90, 3600, 86400 * 3.5, 86400 * 365):
+        low, high = histogram._bounds(histogram.bucket_of(value))
+        assert low <= value < high
+
+
+def test_buckets_grow_by_constant_ratio():
+    for bucket in range(2, 40):
+        low, high = histogram._bounds(bucket)
+        assert high / low == pytest.approx(histogram.BUCKET_GROWTH)
+
+
+def test_add_and_remove_leave_no_empty_buckets():
+    values = [30, 600, 601, 7200]
+    hist = histogram.add({}, values)
+    assert sum(hist.values()) == 4
+    assert histogram.add(hist, values, sign=-1) == {}
+    # Вычитание из пустой корзины не оставляет отрицательных счётчиков
+    assert histogram.add({}, [600], sign=-1) == {}
+
+
+def test_merge_equals_adding_all_values():
+    first, second = [60, 120, 5000], [120, 86400]
+    merged = histogram.merge(histogram.add({}, first), histogram.add({}, second))
+    assert merged == histogram.add({}, first + second)
+
+
+def test_percentile_empty_is_none():
+    assert histogram.percentile({}, 0.5) is None
+
+
+def test_percentile_within_bucket_error():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(9, 1.5) + 60 for _ in range(5000))
+    hist = histogram.add({}, values)
+    for q in (0.5, 0.85, 0.95):
+        exact = values[int(q * len(values)) - 1]
+        assert abs(histogram.percentile(hist, q) - exact) / exact < histogram.BUCKET_GROWTH - 1
+
+
+def test_percentile_of_merged_days_matches_whole_period():
+    days = [[100, 200, 300], [4000, 5000], [60, 86400]]
+    merged = {}
+    for day in days:
+        histogram.merge(merged, histogram.add({}, day))
+    whole = histogram.add({}, [value for day in days for value in day])
+    assert histogram.percentile(merged, 0.85) == histogram.percentile(whole, 0.85)
+
+
+def test_percentile_is_monotonic():
+    hist = histogram.add({}, [70, 700, 7000, 70000])
+    results = [histogram.percentile(hist, q / 10) for q in range(1, 11)]
+    assert results == sorted(results)
+
+
+def test_dumps_loads_round_trip():
+    hist = histogram.add({}, [30, 600, 601, 7200])
+    assert histogram.loads(histogram.dumps(hist)) == hist
+    assert histogram.loads(None) == {}
@@ -0,0 +1,135 @@
+"""Разбор входа импорта: CSV/NDJSON."""
+import csv
+import io
+import re
+from datetime import datetime
+import pytest
+from app.services.import_service import ImportLookups, RowRejected, parse_row, read_csv, read_ndjson
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+async def _lines(text: str):
+    for line in io.StringIO(text, newline=""):
+        yield line
+
+
+async def _read_csv(text: str):
+    return [record async for record in read_csv(_lines(text))]
+
+
+def _lookups() -> ImportLookups:
+    lookups = ImportLookups(project_ids={1, 2}, projects_by_name={"backend": 2})
+    ann = (10, 42, "Ann")
+    lookups.users_by_telegram_id[42] = ann
+    lookups.users_by_username["ann"] = ann
+    return lookups
+
+
+async def test_csv_literal_quote_in_unquoted_field():
+    text = 'title,description\nBuy 27" monitor,for desk\nA,a\nB,b\nC,c\n'
+    assert await _read_csv(text) == [
+        (2, {"title": 'Buy 27" monitor', "description": "for desk"}),
+        (3, {"title": "A", "description": "a"}),
+        (4, {"title": "B", "description": "b"}),
+        (5, {"title": "C", "description": "c"}),
+    ]
+
+
+async def test_csv_multiline_quoted_field():
+    text = 'title,description\n"Report","line one\nline ""two"", still\n\nend"\nNext,x\n'
+    assert await _read_csv(text) == [
+        (2, {"title": "Report", "description": 'line one\nline "two", still\n\nend'}),
+        (6, {"title": "Next", "description": "x"}),
+    ]
+
+
+async def test_csv_matches_csv_module():
+    text = (
+        'title,description\r\n'
+        'a "b" c,"x,y"\r\n'
+        '"q""uoted",tail"s\r\n'
+        '"closed"after,z\r\n'
+        '"multi\r\nline",,\r\n'
+    )
+    expected = list(csv.DictReader(io.StringIO(text, newline="")))
+    assert [values for _, values in await _read_csv(text)] == [
+        {key: row[key] for key in ("title", "description")} for row in expected
+    ]
+
+
+async def test_csv_skips_blank_lines_and_keeps_line_numbers():
+    text = "title\n\nA\n   \nB"
+    assert await _read_csv(text) == [(3, {"title": "A"}), (5, {"title": "B"})]
+
+
+async def test_csv_unterminated_quote_is_one_malformed_record():
+    text = 'title\nA\n"never closed\nB\nC\n'
+    assert await _read_csv(text) == [(2, {"title": "A"}), (3, '"never closed\nB\nC\n')]
+
+
+async def test_ndjson_records_and_malformed_lines():
+    text = '{"title": "A"}\n\n{broken\n{"title": "B"}'
+    records = [record async for record in read_ndjson(_lines(text))]
+    assert records == [(1, {"title": "A"}), (3, "{broken"), (4, {"title": "B"})]
+
+
+def test_parse_row_defaults():
+    row = parse_row({"title": "  Task  "}, _lookups(), NOW)
+    assert row["title"] == "Task"
+    assert row["status"] == "TODO"
+    assert row["source"] == "IMPORT"
+    assert row["created_at"] == row["updated_at"] == NOW
+    assert row["project_id"] is None and row["assignee_id"] is None
+
+
+def test_parse_row_lookups():
+    lookups = _lookups()
+    assert parse_row({"title": "t", "project_id": "1"}, lookups, NOW)["project_id"] == 1
+    assert parse_row({"title": "t", "project": "Backend"}, lookups, NOW)["project_id"] == 2
+    for assignee in ("42", "@Ann", "ann"):
+        row = parse_row({"title": "t", "assignee": assignee}, lookups, NOW)
+        assert (row["assignee_id"], row["assignee_telegram_id"], row["assignee_name"]) == (10, 42, "Ann")
+    row = parse_row({"title": "t", "assignee_name": "Bob"}, lookups, NOW)
+    assert (row["assignee_id"], row["assignee_name"]) == (None, "Bob")
+
+
+def test_parse_row_dates():
+    row = parse_row({
+        "title": "t", "status": "done",
+        "created_at": "2026-01-01T10:00:00+03:00",
+        "started_at": "2026-01-02T10:00:00",
+        "completed_at": "2026-01-03T10:00:00",
+    }, _lookups(), NOW)
+    assert row["status"] == "DONE"
+    assert row["created_at"] == datetime(2026, 1, 1, 7, 0)
+    assert row["completed_at"] == datetime(2026, 1, 3, 10, 0)
+
+    row = parse_row({"title": "t", "status": "TODO", "created_at": "2026-01-01",
+                     "started_at": "2026-01-02", "completed_at": "2026-01-03"}, _lookups(), NOW)
+    assert row["started_at"] is None and row["completed_at"] is None
+    row = parse_row({"title": "t", "status": "DOING", "created_at": "2026-01-01",
+                     "started_at": "2026-01-02", "completed_at": "2026-01-03"}, _lookups(), NOW)
+    assert row["started_at"] == datetime(2026, 1, 2) and row["completed_at"] is None
+
+
+@pytest.mark.parametrize("raw, error", [
+    ("{broken", "malformed row"),
+    ({"description": "no title"}, "title is required"),
+    ({"title": "x" * 256}, "title longer than 255 characters"),
+    ({"title": "t", "status": "LATER"}, "unknown status 'LATER'"),
+    ({"title": "t", "created_at": "yesterday"}, "created_at is not an ISO 8601 date: 'yesterday'"),
+    ({"title": "t", "created_at": "2026-01-02", "completed_at": "2026-01-01"}, "completed_at is before created_at"),
+    ({"title": "t", "project_id": "7"}, "unknown project_id 7"),
+    ({"title": "t", "project_id": "x"}, "unknown project_id x"),
+    ({"title": "t", "project": "Frontend"}, "unknown project 'Frontend'"),
+    ({"title": "t", "assignee": "@bob"}, "unknown assignee '@bob'"),
+])
+def test_parse_row_rejects(raw, error):
+    with pytest.raises(RowRejected, match=f"^{re.escape(error)}$"):
+        parse_row(raw, _lookups(), NOW)
+
+
+def test_parse_row_rejects_non_object():
+    with pytest.raises(RowRejected, match="row is not an object"):
+        parse_row(["title"], _lookups(), NOW)
@@ -0,0 +1,106 @@
+"""Keyset-пагинация ищет по индексу: глубокий курсор не проходит таблицу с начала."""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import encode_cursor
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.change_repository import ChangeRepository
+from app.repositories.task_repository import TaskRepository
+
+START = datetime(2026, 1, 1)
+
+
+async def _seed_tasks(engine, count=300):
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO tasks (id, title, status, source, created_at, updated_at) "
+                "VALUES (:id, 't', 'TODO', 'WEB', :ts, :ts)"
+            ),
+            # Формат хранения DateTime в SQLAlchemy — с микросекундами
+            [{"id": i, "ts": f"{START + timedelta(minutes=i // 2):%Y-%m-%d %H:%M:%S.%f}"}
+             for i in range(1, count + 1)],
+        )
+
+
+@contextmanager
+def _captured(engine, marker: str):
+    """Запросы с marker в тексте, выполненные на engine: [(sql, параметры)]."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if marker in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def _plan(engine, statement, parameters) -> str:
+    async with engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+async def _assert_searches(engine, statements, table):
+    assert statements
+    for statement, parameters in statements:
+        plan = await _plan(engine, statement, parameters)
+        assert f"SEARCH {table}" in plan, plan
+        assert f"SCAN {table}" not in plan, plan
+        # Порядок даёт индекс — LIMIT останавливает чтение, ничего не сортируется
+        assert "TEMP B-TREE" not in plan, plan
+
+
+async def test_task_pages_search_index(db):
+    await _seed_tasks(db)
+    cursor = encode_cursor(START + timedelta(minutes=20), 41)
+    async with AsyncSession(db) as session:
+        repo = TaskRepository(session)
+        with _captured(db, "ORDER BY tasks.created_at") as statements:
+            tasks, _ = await repo.get_page(limit=10, cursor=cursor)
+            rows, _ = await repo.get_list_rows(limit=10, cursor=cursor)
+            back, _ = await repo.get_list_rows(limit=10, cursor=cursor, backward=True)
+    assert [task.id for task in tasks] == list(range(40, 30, -1))
+    assert [row.id for row in rows] == list(range(40, 30, -1))
+    assert [row.id for row in back] == list(range(51, 41, -1))
+    await _assert_searches(db, statements, "tasks")
+
+
+async def test_archive_page_searches_index(db):
+    await _seed_tasks(db)
+    async with db.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO tasks_archive (id, title, status, source, created_at, updated_at, archived_at) "
+            "SELECT id, title, status, source, created_at, updated_at, updated_at FROM tasks"
+        ))
+    cursor = encode_cursor(START + timedelta(minutes=20), 41)
+    async with AsyncSession(db) as session:
+        with _captured(db, "ORDER BY tasks_archive.created_at") as statements:
+            tasks, _ = await ArchiveRepository(session).get_page(limit=10, cursor=cursor)
+    assert [task.id for task in tasks] == list(range(40, 30, -1))
+    await _assert_searches(db, statements, "tasks_archive")
+
+
+async def test_change_feed_searches_indexes(db):
+    await _seed_tasks(db)
+    async with db.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO task_tombstones (task_id, deleted_at, reason) "
+            "SELECT id + 1000, updated_at, 'deleted' FROM tasks"
+        ))
+    position = (START + timedelta(minutes=100), 201)
+    until = START + timedelta(days=1)
+    async with AsyncSession(db) as session:
+        with _captured(db, "ORDER BY tasks.updated_at") as tasks_sql:
+            with _captured(db, "ORDER BY task_tombstones.deleted_at") as tombstones_sql:
+                batch = await ChangeRepository(session).get_changes(position, until, limit=10)
+    # Лента сливается по (время, id задачи): tombstone 1201 того же времени идёт после задачи 201
+    assert [task.id for task in batch.tasks] == [202, 203, 204, 205]
+    assert batch.deleted == [1200, 1201, 1202, 1203, 1204, 1205]
+    await _assert_searches(db, tasks_sql, "tasks")
+    await _assert_searches(db, tombstones_sql, "task_tombstones")
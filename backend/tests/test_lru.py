@@ -0,0 +1,84 @@
+"""TTLCache: вытеснение по размеру и срок жизни записей."""
+import pytest
+from app.core.lru import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(2, 10, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # «a» теперь свежее «b»
+    cache.set("c", 3)
+    assert list(cache.items()) == [("a", 1), ("c", 3)]
+    assert "b" not in cache
+    assert cache.evicted == 1
+
+
+def test_overwrite_does_not_evict():
+    cache = TTLCache(2, 10, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    assert dict(cache.items()) == {"a": 3, "b": 2}
+    assert cache.evicted == 0
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+    clock.now = 5
+    assert cache.get("a") is None
+    assert cache.get("a", "missing") == "missing"
+    assert "a" not in cache
+    assert cache.get("b") == 2
+
+
+def test_set_restarts_ttl():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4
+    cache.set("a", 2)
+    clock.now = 8
+    assert cache.get("a") == 2
+
+
+def test_pop_expired_returns_default():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    clock.now = 5
+    assert cache.pop("b", "gone") == "gone"
+    assert len(cache) == 0
+
+
+def test_purge_removes_only_expired():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("old", 1)
+    clock.now = 3
+    cache.set("new", 2)
+    clock.now = 6
+    assert len(cache) == 2
+    assert list(cache.items()) == [("new", 2)]
+    assert cache.purge() == 1
+    assert len(cache) == 1
+    assert cache.purge() == 0
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(0, 10)
@@ -0,0 +1,63 @@
+"""OutboxRelay: события, закоммиченные не по порядку id, не теряются."""
+from datetime import datetime
+from sqlalchemy import text
+from app.core.outbox import OutboxRelay
+from app.domain.events import TaskDeleted, event_to_payload
+
+
+class RecordingBus:
+    def __init__(self):
+        self.task_ids = []
+
+    def publish(self, events, foreign=False):
+        assert foreign
+        self.task_ids += [event.task_id for event in events]
+
+
+async def _commit_event(engine, outbox_id: int):
+    payload = event_to_payload(TaskDeleted(occurred_at=datetime(2026, 1, 1), task_id=outbox_id))
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO event_outbox (id, origin, event_type, payload, created_at) "
+                "VALUES (:id, 'other:1', 'TaskDeleted', :payload, '2026-01-01')"
+            ),
+            {"id": outbox_id, "payload": payload},
+        )
+
+
+async def _saved_offset(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(text("SELECT last_id FROM outbox_offsets WHERE consumer = 'test'"))).scalar()
+
+
+async def test_late_commit_below_last_id_is_delivered(db):
+    bus = RecordingBus()
+    relay = OutboxRelay(consumer="test", bus=bus, _last_id=0)
+    for outbox_id in (1, 2, 4, 5):
+        await _commit_event(db, outbox_id)
+    assert await relay.poll() == 4
+    # 3 ещё не закоммичен: позиция не уходит дальше пропуска
+    assert await _saved_offset(db) == 2
+
+    await _commit_event(db, 3)
+    await _commit_event(db, 6)
+    assert await relay.poll() == 2
+    assert bus.task_ids == [1, 2, 4, 5, 3, 6]
+    assert await _saved_offset(db) == 6
+    assert await relay.poll() == 0
+
+
+async def test_gap_is_forgotten_after_timeout(db):
+    bus = RecordingBus()
+    relay = OutboxRelay(consumer="test", bus=bus, gap_timeout=0, _last_id=0)
+    await _commit_event(db, 2)
+    await relay.poll()
+    assert await _saved_offset(db) == 0
+
+    # Откатанная транзакция: id 1 так и не появится
+    await relay.poll()
+    assert await _saved_offset(db) == 2
+    await _commit_event(db, 1)
+    assert await relay.poll() == 0
+    assert bus.task_ids == [2]
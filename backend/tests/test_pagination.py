@@ -0,0 +1,53 @@
+"""Курсоры keyset-пагинации."""
+from datetime import datetime
+import pytest
+from app.core.pagination import decode_cursor, decode_short_cursor, encode_cursor, encode_short_cursor
+
+
+@pytest.mark.parametrize("created_at, item_id", [
+    (datetime(1970, 1, 1), 0),
+    (datetime(2026, 3, 1, 12, 0, 0, 123456), 1),
+    (datetime(2026, 12, 31, 23, 59, 59, 999999), 2 ** 40),
+    (datetime(9999, 12, 31, 23, 59, 59, 999999), 35),
+])
+def test_short_cursor_round_trip(created_at, item_id):
+    cursor = encode_short_cursor(created_at, item_id)
+    assert decode_short_cursor(cursor) == (created_at, item_id)
+
+
+def test_short_cursor_fits_callback_data():
+    cursor = encode_short_cursor(datetime(2026, 3, 1, 12, 0, 0, 123456), 10 ** 9)
+    # tasks_page:{filter}:{page}:{n|p}:{cursor} — не больше 64 байт вместе с префиксом
+    assert len(cursor) <= 20
+    assert set(cursor) <= set("0123456789abcdefghijklmnopqrstuvwxyz.")
+
+
+def test_short_cursor_keeps_microseconds_apart():
+    first = encode_short_cursor(datetime(2026, 3, 1, 12, 0, 0, 1), 5)
+    second = encode_short_cursor(datetime(2026, 3, 1, 12, 0, 0, 2), 5)
+    assert first != second
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "a.b.c", "!!.1", "zz.", "1e" * 40 + ".1"])
+def test_short_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError):
+        decode_short_cursor(cursor)
+
+
+def test_cursor_round_trip_and_garbage():
+    created_at = datetime(2026, 3, 1, 12, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+async def test_task_list_is_paged_by_default(client):
+    await client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "create", "tasks": [{"title": f"t{i}"} for i in range(101)]},
+    ]})
+
+    first = await client.get("/api/tasks")
+    assert len(first.json()) == 100
+    rest = await client.get("/api/tasks", params={"cursor": first.headers["X-Next-Cursor"]})
+    assert [task["title"] for task in rest.json()] == ["t0"]
+    assert "X-Next-Cursor" not in rest.headers
@@ -0,0 +1,75 @@
+"""Сброс кэша запросов: свои записи — сразу после COMMIT, чужие — через шину."""
+import asyncio
+from datetime import datetime
+import pytest
+from app.core.cache import STATS, TASKS, query_cache
+from app.core.db import AsyncSessionLocal, WriterSessionLocal
+from app.core.event_bus import event_bus
+from app.domain.events import TaskCreated
+from app.repositories.counter_repository import CounterRepository
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+def subscribed(db):
+    subscription = query_cache.subscribe(event_bus)
+    yield
+    event_bus.unsubscribe(subscription)
+
+
+async def _total() -> int:
+    async with AsyncSessionLocal() as session:
+        return (await CounterRepository(session).get_counts())["total"]
+
+
+async def _titles() -> list:
+    async with AsyncSessionLocal() as session:
+        tasks, _ = await TaskService(session).get_tasks_page(limit=100)
+        return [task.title for task in tasks]
+
+
+async def test_own_write_is_visible_to_next_read(subscribed):
+    assert await _total() == 0
+    assert await _titles() == []
+
+    generations = {namespace: query_cache._generations.get(namespace, 0) for namespace in (TASKS, STATS)}
+    async with WriterSessionLocal() as session:
+        await TaskService(session).create_task(title="fresh")
+        await session.commit()
+        # Ни одного await после COMMIT — кэш уже сброшен, а не ждёт воркер шины
+        assert all(query_cache._generations.get(namespace, 0) > before for namespace, before in generations.items())
+    assert await _total() == 1
+    assert await _titles() == ["fresh"]
+
+
+async def test_foreign_events_invalidate_through_bus(subscribed):
+    await _total()
+    generation = query_cache._generations.get(STATS, 0)
+    event = TaskCreated(
+        occurred_at=datetime.utcnow(), task_id=1, title="t", assignee_name=None, source="WEB",
+    )
+    event_bus.publish([event], foreign=True)
+    assert query_cache._generations.get(STATS, 0) == generation
+    await asyncio.sleep(0.05)
+    assert query_cache._generations.get(STATS, 0) == generation + 1
+    assert query_cache._generations.get(TASKS, 0) > 0
+
+
+async def test_load_started_before_invalidation_is_not_stored(db):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    loading = asyncio.create_task(query_cache.get_or_load(TASKS, ("k",), slow_load))
+    await started.wait()
+    query_cache.invalidate_now([TASKS])
+    release.set()
+    assert await loading == "stale"
+
+    async def fresh_load():
+        return "fresh"
+
+    assert await query_cache.get_or_load(TASKS, ("k",), fresh_load) == "fresh"
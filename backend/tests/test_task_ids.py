@@ -0,0 +1,93 @@
+"""id задач не переиспользуются после архивации и удаления."""
+from sqlalchemy import MetaData, text
+from sqlalchemy.schema import CreateTable
+from app.core import migrations
+from app.core.write_queue import run_write
+from app.domain.enums import TaskStatus
+from app.domain.models import Task
+from app.services.archive_service import archive_closed_tasks
+from app.services.task_service import TaskService
+
+
+async def _create(title="t") -> int:
+    task = await run_write(lambda session: TaskService(session).create_task(title=title))
+    return task.id
+
+
+async def _archive_done(task_id: int) -> int:
+    await run_write(lambda session: TaskService(session).change_status(task_id, TaskStatus.DONE))
+    # Отрицательный срок — в архив уходят все закрытые задачи
+    return await archive_closed_tasks(older_than_days=-1)
+
+
+async def test_archived_newest_id_is_not_reused(db):
+    await _create()
+    newest = await _create()
+    assert await _archive_done(newest) == 1
+
+    task_id = await _create()
+    assert task_id == newest + 1
+    # Повторная архивация не упирается в занятый tasks_archive.id
+    assert await _archive_done(task_id) == 1
+
+
+async def test_deleted_newest_id_is_not_reused(db):
+    newest = await _create()
+    await run_write(lambda session: TaskService(session).delete_task(newest))
+    assert await _create() == newest + 1
+
+
+async def _make_legacy_tasks_table(conn):
+    """Таблица tasks как в базах до миграции 11 — без AUTOINCREMENT."""
+    metadata = MetaData()
+    for table in Task.metadata.sorted_tables:
+        if table is not Task.__table__:
+            table.to_metadata(metadata)
+    legacy = Task.__table__.to_metadata(metadata, name="tasks_legacy")
+    legacy.dialect_options["sqlite"]["autoincrement"] = False
+    await conn.execute(CreateTable(legacy))
+    await conn.execute(text("DROP TABLE tasks"))
+    await conn.execute(text("ALTER TABLE tasks_legacy RENAME TO tasks"))
+    # Индексы и триггеры поиска — как их создали прежние миграции
+    await migrations._v2_task_indexes(conn)
+    await migrations._v4_search_index(conn)
+    await migrations._v5_task_updated_at_index(conn)
+    await conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+
+
+async def test_migration_rebuilds_legacy_table(db):
+    async with db.begin() as conn:
+        await _make_legacy_tasks_table(conn)
+        await conn.execute(text(
+            "INSERT INTO tasks (id, title, status, source, created_at, updated_at) "
+            "VALUES (3, 'kept', 'TODO', 'WEB', '2026-01-01', '2026-01-01')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO tasks_archive (id, title, status, source, created_at, updated_at, archived_at) "
+            "VALUES (7, 'old', 'DONE', 'WEB', '2026-01-01', '2026-01-01', '2026-01-02')"
+        ))
+        indexes_before = set((await conn.execute(text(
+            "SELECT type, name FROM sqlite_master WHERE tbl_name = 'tasks' AND sql IS NOT NULL"
+        ))).all())
+
+        await migrations._v11_task_id_autoincrement(conn)
+
+        table_sql = (await conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+        ))).scalar()
+        indexes_after = set((await conn.execute(text(
+            "SELECT type, name FROM sqlite_master WHERE tbl_name = 'tasks' AND sql IS NOT NULL"
+        ))).all())
+        assert "AUTOINCREMENT" in table_sql
+        assert indexes_after == indexes_before
+        assert ("trigger", "trg_tasks_search_ai") in indexes_after
+
+    task_id = await _create("found by search")
+    assert task_id == 8
+    async with db.connect() as conn:
+        titles = (await conn.execute(text("SELECT title FROM tasks ORDER BY id"))).scalars().all()
+        found = (await conn.execute(text(
+            "SELECT ref_id FROM search_index WHERE search_index MATCH 'search'"
+        ))).scalars().all()
+    assert titles == ["kept", "found by search"]
+    assert found == [task_id]
@@ -2,8 +2,8 @@ import { apiClient } from './client';
 import { Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority } from '../types/task';
 
 export interface GetTasksParams {
-  skip?: number;
   limit?: number;
+  cursor?: string;
   status?: TaskStatus;
   priority?: TaskPriority;
   assignee_id?: string;
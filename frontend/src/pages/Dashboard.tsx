@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import axios from 'axios';
 import ReactMarkdown from 'react-markdown';
@@ -152,18 +152,25 @@ export default function Dashboard() {
   const { data: tasks = [] } = useQuery<Task[]>({
     queryKey: ['tasks', statusFilter],
     queryFn: async () => {
-      const params: any = {};
+      // Список отдаётся страницами — идём по X-Next-Cursor до последней
+      const params: any = { limit: 500 };
       if (statusFilter) params.status = statusFilter;
-      const res = await axios.get(`${API_URL}/api/tasks`, { params });
-      return res.data;
+      const all: Task[] = [];
+      for (;;) {
+        const res = await axios.get(`${API_URL}/api/tasks`, { params });
+        all.push(...res.data);
+        const next = res.headers['x-next-cursor'];
+        if (!next) return all;
+        params.cursor = next;
+      }
     },
-    refetchInterval: 5000,
+    refetchInterval: 60000,  // запасной вариант — обновления приходят через SSE
   });
 
   const { data: stats } = useQuery<Stats>({
     queryKey: ['stats'],
     queryFn: async () => (await axios.get(`${API_URL}/api/stats`)).data,
-    refetchInterval: 5000,
+    refetchInterval: 60000,  // запасной вариант — обновления приходят через SSE
   });
 
   const { data: users = [] } = useQuery<TelegramUser[]>({
@@ -188,6 +195,25 @@ export default function Dashboard() {
     queryClient.invalidateQueries({ queryKey: ['meetings'] });
   };
 
+  // Живые обновления: изменения из Telegram приходят через /api/events
+  useEffect(() => {
+    const source = new EventSource(`${API_URL}/api/events`);
+    const refreshTasks = () => {
+      queryClient.invalidateQueries({ queryKey: ['tasks'] });
+      queryClient.invalidateQueries({ queryKey: ['stats'] });
+    };
+    ['task.created', 'task.updated', 'task.status_changed', 'task.blocked',
+     'task.unblocked', 'task.assigned', 'task.moved', 'task.deleted',
+     'tasks.bulk_changed', 'tasks.archived'].forEach((type) =>
+      source.addEventListener(type, refreshTasks));
+    ['meeting.recorded', 'meeting.updated', 'meeting.deleted'].forEach((type) =>
+      source.addEventListener(type, () =>
+        queryClient.invalidateQueries({ queryKey: ['meetings'] })));
+    // Сервер отключил нас за отставание — перечитываем всё
+    source.addEventListener('overflow', invalidate);
+    return () => source.close();
+  }, [queryClient]);
+
   const changeStatusMutation = useMutation({
     mutationFn: async ({ taskId, status }: { taskId: number; status: string }) => {
       await axios.post(`${API_URL}/api/tasks/${taskId}/status`, { status });